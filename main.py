@@ -15,7 +15,7 @@ src_dir = current_dir / "src"
 sys.path.insert(0, str(src_dir))
 
 try:
-    from models.hdfs_detector import HDFSDetector
+    from models import DETECTORS
     from utils.logger import get_project_logger
 except ImportError as e:
     print(f"Erreur d'import: {e}")
@@ -23,6 +23,44 @@ except ImportError as e:
     sys.exit(1)
 
 
+def run_query(detector, args) -> int:
+    """
+    Interroge la base des résultats de détection et affiche les lignes trouvées.
+
+    Args:
+        detector: Détecteur dont la configuration désigne la base des résultats
+        args: Arguments de la ligne de commande
+
+    Returns:
+        Code de sortie
+    """
+    from models.result_store import parse_since
+
+    store = detector.result_store
+    if store is None:
+        print("Erreur: Base des résultats désactivée (result_store.enabled dans data_config.yaml)")
+        return 1
+    if not store.db_path.exists():
+        print(f"Aucune exécution enregistrée ({store.db_path})")
+        return 0
+
+    since = parse_since(args.since) if args.since else None
+    if args.runs:
+        frame = store.runs(since=since, source=args.filename, limit=args.top)
+    else:
+        frame = store.query_anomalies(task_id=args.task_id, run_id=args.run, since=since,
+                                      source=args.filename, event=args.event,
+                                      max_score=args.max_score, limit=args.top)
+
+    if args.output_format == "json":
+        print(frame.to_json(orient="records", date_format="iso", force_ascii=False, indent=2))
+    elif frame.empty:
+        print("Aucun résultat")
+    else:
+        print(frame.to_string(index=False))
+    return 0
+
+
 def main():
     """Fonction principale du programme."""
     parser = argparse.ArgumentParser(
@@ -34,44 +72,123 @@ Exemples d'utilisation:
   %(prog)s create normal_trace.csv            # Créer un modèle
   %(prog)s detect failure_trace.csv           # Détecter des anomalies
   %(prog)s list                              # Lister les fichiers CSV
+  %(prog)s query --task-id blk_42             # Exécutions ayant signalé une TaskID
+  %(prog)s query --top 100 --since 7d         # Anomalies les plus sévères de la semaine
         """
     )
 
     parser.add_argument(
         "action",
         nargs="?",
-        choices=["create", "detect", "list"],
+        choices=["create", "detect", "list", "visualize", "query"],
         help="Action à effectuer"
     )
     parser.add_argument(
         "filename",
         nargs="?",
-        help="Nom du fichier CSV"
+        help="Nom du fichier CSV (query: filtre sur le nom du fichier analysé)"
     )
     parser.add_argument(
         "--model-type",
         default="hdfs",
-        choices=["hdfs"],
+        choices=sorted(DETECTORS),
         help="Type de modèle (défaut: hdfs)"
     )
+    parser.add_argument(
+        "--model-name",
+        default=None,
+        help="Nom du modèle dans le registre (défaut: type de modèle)"
+    )
+    parser.add_argument(
+        "--model-version",
+        default=None,
+        help="Version ou alias du modèle à utiliser (défaut: current)"
+    )
     parser.add_argument(
         "--contamination",
         type=float,
-        default=0.01,
-        help="Proportion d'anomalies attendues (défaut: 0.01)"
+        default=None,
+        help="Proportion d'anomalies attendues (create, défaut: 0.01); en détection, "
+             "seuil correspondant sur les scores d'entraînement, sans réentraîner"
     )
     parser.add_argument(
-        "action",
-        nargs="?",
-        choices=["create", "detect", "list", "visualize"],  # Ajouter "visualize"
-        help="Action à effectuer"
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Lire et scorer le fichier par blocs de N lignes (detect)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reprendre une détection par blocs interrompue (detect)"
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=["default", "json", "detailed"],
+        default="default",
+        help="Format de sortie (json/detailed écrivent aussi un flux NDJSON des anomalies)"
+    )
+    parser.add_argument(
+        "--auto-tune",
+        action="store_true",
+        help="Choisir les hyperparamètres selon un budget de latence (create)"
+    )
+    parser.add_argument(
+        "--target-latency-ms",
+        type=float,
+        default=None,
+        help="Latence de scoring visée pour 1000 lignes (auto-tuning)"
+    )
+    parser.add_argument(
+        "--train-budget",
+        type=float,
+        default=None,
+        help="Budget de temps de l'auto-tuning en secondes"
+    )
+    parser.add_argument(
+        "--task-id",
+        default=None,
+        help="Anomalies d'une TaskID dans toutes les exécutions (query)"
+    )
+    parser.add_argument(
+        "--run",
+        type=int,
+        default=None,
+        help="Anomalies d'une exécution (query)"
+    )
+    parser.add_argument(
+        "--since",
+        default=None,
+        help="Exécutions depuis une durée (7d, 12h, 30m) ou une date ISO (query)"
+    )
+    parser.add_argument(
+        "--event",
+        default=None,
+        help="Anomalies dont les événements principaux contiennent cet événement (query)"
+    )
+    parser.add_argument(
+        "--max-score",
+        type=float,
+        default=None,
+        help="Score maximum des anomalies (query)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Nombre de lignes retournées (query, défaut: 20)"
+    )
+    parser.add_argument(
+        "--runs",
+        action="store_true",
+        help="Lister les exécutions au lieu des anomalies (query)"
     )
 
     args = parser.parse_args()
 
-    # Configuration du logger
+    # Configuration du logger (en sortie JSON, stdout ne contient que le JSON)
     try:
-        logger = get_project_logger()
+        logger = get_project_logger(log_to_stderr=args.output_format == "json")
     except Exception as e:
         print(f"Erreur de configuration du logger: {e}")
         # Fallback vers print si le logger ne fonctionne pas
@@ -79,7 +196,10 @@ Exemples d'utilisation:
 
     try:
         # Initialisation du détecteur
-        detector = HDFSDetector(contamination=args.contamination)
+        detector_kwargs = {'model_name': args.model_name, 'model_version': args.model_version}
+        if args.contamination is not None:
+            detector_kwargs['contamination'] = args.contamination
+        detector = DETECTORS[args.model_type](**detector_kwargs)
 
         # Traitement selon l'action demandée
         if args.action == "create":
@@ -89,7 +209,12 @@ Exemples d'utilisation:
 
             if logger:
                 logger.info(f"Création de modèle à partir de {args.filename}")
-            success = detector.create_model_from_file(args.filename)
+            success = detector.create_model_from_file(
+                args.filename,
+                auto_tune=args.auto_tune,
+                target_latency_ms=args.target_latency_ms,
+                train_budget_s=args.train_budget
+            )
             return 0 if success else 1
 
         elif args.action == "detect":
@@ -99,16 +224,22 @@ Exemples d'utilisation:
 
             if logger:
                 logger.info(f"Détection d'anomalies dans {args.filename}")
-            success = detector.detect_anomalies_in_file(args.filename)
+            success = detector.detect_anomalies_in_file(args.filename, chunksize=args.chunksize,
+                                                       output_format=args.output_format,
+                                                       resume=args.resume,
+                                                       contamination=args.contamination)
             return 0 if success else 1
 
         elif args.action == "list":
             detector.list_available_files()
             return 0
 
+        elif args.action == "query":
+            return run_query(detector, args)
+
         elif args.action == "visualize":
             from scripts.visualize_anomalies import main as visualize_main
-            return visualize_main()
+            return visualize_main([])
 
         else:
             # Mode interactif si aucune action spécifiée
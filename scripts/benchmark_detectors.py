@@ -0,0 +1,154 @@
+"""
+Script de comparaison des détecteurs HBOS et Isolation Forest.
+
+Ce script entraîne les deux détecteurs sur le même fichier, score une
+trace avec chacun et compare leur vitesse (entraînement, scoring) et leur
+accord (corrélation de rang, anomalies communes, top-K commun).
+"""
+
+import sys
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ajouter le répertoire src au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models import HBOSDetector, HDFSDetector
+from models.auto_tuner import rank_correlation
+from utils.logger import get_project_logger
+
+
+def benchmark(detector, train_file, data_file):
+    """
+    Entraîne un détecteur puis score un fichier en mesurant les temps.
+
+    Args:
+        detector: Détecteur à évaluer
+        train_file: Chemin du fichier d'entraînement
+        data_file: Chemin du fichier à scorer
+
+    Returns:
+        Dictionnaire (temps, débit, résultat de détection)
+    """
+    train_data, feature_names = detector.load_data(train_file)
+    detector.feature_names = feature_names
+    start = time.perf_counter()
+    detector.train_model(detector.preprocess_data(train_data))
+    fit_time = time.perf_counter() - start
+
+    data, _ = detector.load_data(data_file)
+    processed = detector.preprocess_data(data)
+    start = time.perf_counter()
+    result = detector.detect(processed, deduplicate=False)
+    score_time = time.perf_counter() - start
+
+    return {
+        'fit_time_s': round(fit_time, 3),
+        'score_time_s': round(score_time, 3),
+        'rows_per_s': round(len(result) / score_time, 1) if score_time > 0 else None,
+        'anomalies': result.n_anomalies,
+        'result': result,
+    }
+
+
+def main():
+    """Fonction principale du script de comparaison."""
+    parser = argparse.ArgumentParser(
+        description="Compare la vitesse et l'accord des détecteurs HBOS et Isolation Forest"
+    )
+    parser.add_argument(
+        "--train",
+        required=True,
+        help="Nom du fichier CSV d'entraînement"
+    )
+    parser.add_argument(
+        "--data",
+        required=True,
+        help="Nom du fichier CSV à scorer"
+    )
+    parser.add_argument(
+        "--contamination",
+        type=float,
+        default=None,
+        help="Proportion d'anomalies attendues (défaut: model_config.yaml, sinon 0.01)"
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=100,
+        help="Nombre d'anomalies les plus sévères comparées"
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Chemin d'un rapport JSON (optionnel)"
+    )
+
+    args = parser.parse_args()
+    logger = get_project_logger()
+
+    try:
+        detectors = {
+            'hdfs': HDFSDetector(contamination=args.contamination, verbose=False),
+            'hbos': HBOSDetector(contamination=args.contamination, verbose=False),
+        }
+        train_file = detectors['hdfs'].resolve_file(args.train)
+        data_file = detectors['hdfs'].resolve_file(args.data)
+        if train_file is None or data_file is None:
+            logger.error("Fichier CSV introuvable")
+            return 1
+
+        runs = {name: benchmark(detector, train_file, data_file) for name, detector in detectors.items()}
+        hdfs_result, hbos_result = runs['hdfs'].pop('result'), runs['hbos'].pop('result')
+
+        k = min(args.top_k, len(hdfs_result))
+        top_hdfs = set(np.argsort(hdfs_result.scores)[:k])
+        top_hbos = set(np.argsort(hbos_result.scores)[:k])
+        union = np.count_nonzero(hdfs_result.is_anomaly | hbos_result.is_anomaly)
+
+        report = {
+            'train_file': str(train_file),
+            'data_file': str(data_file),
+            'rows': len(hdfs_result),
+            'detectors': runs,
+            'agreement': {
+                'rank_correlation': round(rank_correlation(hdfs_result.scores, hbos_result.scores), 4),
+                'label_agreement': float(np.mean(hdfs_result.is_anomaly == hbos_result.is_anomaly)),
+                'anomaly_jaccard': (np.count_nonzero(hdfs_result.is_anomaly & hbos_result.is_anomaly) / union
+                                    if union else 1.0),
+                'top_k': k,
+                'top_k_overlap': len(top_hdfs & top_hbos) / k if k else 1.0,
+            },
+        }
+
+        print("\nCOMPARAISON HBOS / ISOLATION FOREST:")
+        for name, run in runs.items():
+            print(f"  {name}: entraînement {run['fit_time_s']} s, scoring {run['score_time_s']} s "
+                  f"({run['rows_per_s']} lignes/s), {run['anomalies']} anomalies")
+        agreement = report['agreement']
+        speedup = runs['hdfs']['score_time_s'] / runs['hbos']['score_time_s'] if runs['hbos']['score_time_s'] else None
+        if speedup:
+            print(f"  Accélération du scoring HBOS: x{speedup:.1f}")
+        print(f"  Corrélation de rang: {agreement['rank_correlation']}, "
+              f"Jaccard des anomalies: {agreement['anomaly_jaccard']:.3f}, "
+              f"top-{k} commun: {agreement['top_k_overlap']*100:.1f}%")
+
+        if args.output:
+            output = Path(args.output)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            with open(output, "w") as f:
+                json.dump(report, f, indent=2)
+            logger.info(f"Rapport de comparaison: {output}")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Erreur lors de la comparaison: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Script de mesure de l'analyse CSV multi-thread.
+
+Ce script lit une trace avec pd.read_csv (lecture simple) puis avec
+l'analyse par plages d'octets (utils.parallel_csv) pour plusieurs nombres
+de threads, vérifie que les résultats sont identiques et affiche le débit
+et l'accélération obtenus.
+"""
+
+import sys
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Ajouter le répertoire src au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models import HDFSDetector
+from utils.file_utils import get_file_size_mb
+from utils.logger import get_project_logger
+from utils.parallel_csv import read_csv_parallel
+
+
+def best_time(read, repeat):
+    """
+    Exécute une lecture plusieurs fois et garde le meilleur temps.
+
+    Args:
+        read: Fonction de lecture sans argument
+        repeat: Nombre d'exécutions
+
+    Returns:
+        Tuple contenant (meilleur temps en secondes, DataFrame lu)
+    """
+    best, frame = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frame = read()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, frame
+
+
+def main():
+    """Fonction principale du script de mesure."""
+    parser = argparse.ArgumentParser(
+        description="Compare l'analyse CSV simple et multi-thread d'une trace"
+    )
+    parser.add_argument(
+        "--data",
+        required=True,
+        help="Nom du fichier CSV à lire (non compressé)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Nombres de threads mesurés (défaut: 1, 2, 4... jusqu'au nombre de CPU)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Nombre de lectures par configuration, meilleur temps retenu (défaut: 3)"
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Chemin d'un rapport JSON (optionnel)"
+    )
+
+    args = parser.parse_args()
+    logger = get_project_logger()
+
+    try:
+        detector = HDFSDetector(verbose=False)
+        data_file = detector.resolve_file(args.data)
+        if data_file is None:
+            logger.error(f"Fichier CSV introuvable: {args.data}")
+            return 1
+
+        workers = args.workers
+        if not workers:
+            cpus = os.cpu_count() or 1
+            workers = [1 << i for i in range(cpus.bit_length()) if 1 << i <= cpus]
+            if workers[-1] != cpus:
+                workers.append(cpus)
+
+        # Mêmes options que la lecture du détecteur (précision du modèle)
+        columns = pd.read_csv(data_file, nrows=0).columns
+        options = {'encoding': 'utf-8',
+                   'dtype': {col: detector.dtype for col in detector._feature_columns(columns)}}
+        size_mb = get_file_size_mb(data_file)
+
+        baseline_s, baseline = best_time(lambda: pd.read_csv(data_file, **options), args.repeat)
+        runs = []
+        for n in workers:
+            # Découpage en n plages quelle que soit la taille du fichier
+            elapsed, frame = best_time(
+                lambda: read_csv_parallel(data_file, n, min_range_mb=size_mb / (2 * n), **options), args.repeat)
+            runs.append({
+                'workers': n,
+                'time_s': round(elapsed, 3),
+                'mb_per_s': round(size_mb / elapsed, 1),
+                'speedup': round(baseline_s / elapsed, 2),
+                'identical': bool(frame.equals(baseline)),
+            })
+
+        report = {
+            'data_file': str(data_file),
+            'size_mb': round(size_mb, 1),
+            'rows': len(baseline),
+            'cpu_count': os.cpu_count(),
+            'read_csv_s': round(baseline_s, 3),
+            'parallel': runs,
+        }
+
+        print(f"\nANALYSE CSV: {data_file.name} ({report['size_mb']} MB, {report['rows']} lignes, "
+              f"{report['cpu_count']} CPU)")
+        print(f"  pd.read_csv: {report['read_csv_s']} s ({size_mb / baseline_s:.1f} MB/s)")
+        for run in runs:
+            print(f"  {run['workers']:>3} threads: {run['time_s']} s ({run['mb_per_s']} MB/s), "
+                  f"x{run['speedup']}{'' if run['identical'] else ' - RÉSULTAT DIFFÉRENT'}")
+
+        if args.output:
+            output = Path(args.output)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            with open(output, "w") as f:
+                json.dump(report, f, indent=2)
+            logger.info(f"Rapport de mesure: {output}")
+        return 0 if all(run['identical'] for run in runs) else 1
+
+    except Exception as e:
+        logger.error(f"Erreur lors de la mesure: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,26 +11,30 @@ import argparse
 from pathlib import Path
 import json
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 
 # Ajouter le répertoire src au path pour les imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from models.hdfs_detector import HDFSDetector
+from models import DETECTORS
+from models.report_summary import ReportSummary
 from utils.logger import get_project_logger
+from utils.rendering import render_figures, render_settings, report_figure_jobs
 
 
-def generate_report(results, anomaly_data=None, output_dir=None):
+def generate_report(results, anomaly_data=None, output_dir=None, summary=None):
     """
     Génère un rapport détaillé des anomalies détectées.
 
+    Les graphiques sont tracés à partir du résumé pré-agrégé (ReportSummary),
+    en temps constant quel que soit le nombre d'anomalies.
+
     Args:
         results: Dictionnaire contenant les résultats de l'analyse
-        anomaly_data: DataFrame contenant les données d'anomalies (optionnel)
+        anomaly_data: DataFrame contenant les données d'anomalies (optionnel,
+            utilisé seulement si aucun résumé n'est fourni)
         output_dir: Répertoire de sortie pour les visualisations
+        summary: Résumé pré-agrégé écrit pendant la détection (optionnel)
 
     Returns:
         Chemin vers le rapport généré
@@ -79,43 +83,17 @@ def generate_report(results, anomaly_data=None, output_dir=None):
 
     logger.info(f"Rapport généré: {report_path}")
 
-    # Générer des visualisations si les données d'anomalies sont disponibles
-    if anomaly_data is not None and len(anomaly_data) > 0:
+    if summary is None and anomaly_data is not None and len(anomaly_data) > 0:
+        summary = ReportSummary.from_frame(anomaly_data)
+
+    # Générer des visualisations si des anomalies ont été résumées
+    if summary is not None and summary.n_anomalies > 0:
         try:
-            # Distribution des scores d'anomalies
-            plt.figure(figsize=(10, 6))
-            sns.histplot(anomaly_data['anomaly_score'], kde=True)
-            plt.title('Distribution des scores d anomalies')
-            plt.xlabel('Score d anomalie')
-            plt.ylabel('Fréquence')
-            plt.grid(True, alpha=0.3)
-            viz_path = output_dir / f"anomaly_scores_dist_{timestamp}.png"
-            plt.savefig(viz_path)
-            plt.close()
-            logger.info(f"Visualisation générée: {viz_path}")
-
-            # Top features pour les anomalies
-            if len(anomaly_data.columns) > 2:  # Au moins quelques features + score
-                # Sélectionner les colonnes numériques (exclure task_id si présent)
-                numeric_cols = anomaly_data.select_dtypes(include=['number']).columns
-                numeric_cols = [col for col in numeric_cols if col != 'anomaly_score']
-
-                if numeric_cols:
-                    # Calculer la somme de chaque feature pour les anomalies
-                    feature_sums = anomaly_data[numeric_cols].sum().sort_values(ascending=False)
-                    top_features = feature_sums.head(10)
-
-                    plt.figure(figsize=(12, 6))
-                    sns.barplot(x=top_features.index, y=top_features.values)
-                    plt.title('Top 10 des événements les plus fréquents dans les anomalies')
-                    plt.xlabel('Type d événement')
-                    plt.ylabel('Fréquence totale')
-                    plt.xticks(rotation=45, ha='right')
-                    plt.tight_layout()
-                    viz_path = output_dir / f"top_anomaly_events_{timestamp}.png"
-                    plt.savefig(viz_path)
-                    plt.close()
-                    logger.info(f"Visualisation générée: {viz_path}")
+            # Figures indépendantes rendues en parallèle, recopiées du cache si inchangées
+            settings = render_settings()
+            jobs = report_figure_jobs(summary, output_dir, timestamp, settings['dpi'])
+            for viz_path, cached in render_figures(jobs, settings['render_workers'], settings['figure_cache']):
+                logger.info(f"Visualisation générée: {viz_path}" + (" (cache)" if cached else ""))
 
         except Exception as e:
             logger.error(f"Erreur lors de la génération des visualisations: {e}")
@@ -136,9 +114,19 @@ def main():
     parser.add_argument(
         "--model-type",
         default="hdfs",
-        choices=["hdfs"],
+        choices=sorted(DETECTORS),
         help="Type de modèle à utiliser"
     )
+    parser.add_argument(
+        "--model-name",
+        default=None,
+        help="Nom du modèle dans le registre (défaut: type de modèle)"
+    )
+    parser.add_argument(
+        "--model-version",
+        default=None,
+        help="Version ou alias du modèle (défaut: current)"
+    )
     parser.add_argument(
         "--contamination",
         type=float,
@@ -151,6 +139,17 @@ def main():
         default="default",
         help="Format de sortie des résultats"
     )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Lire et scorer le fichier par blocs de N lignes (défaut: data_config.yaml)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reprendre une détection par blocs interrompue à son dernier point de reprise"
+    )
     parser.add_argument(
         "--report",
         action="store_true",
@@ -164,43 +163,44 @@ def main():
 
     args = parser.parse_args()
 
-    # Configuration du logger
-    logger = get_project_logger()
+    # Configuration du logger (en sortie JSON, stdout ne contient que le JSON)
+    logger = get_project_logger(log_to_stderr=args.output_format == "json")
     logger.info("Début de la détection d'anomalies")
 
     try:
         # Initialisation du détecteur selon le type
-        if args.model_type == "hdfs":
-            detector_kwargs = {}
+        if args.model_type in DETECTORS:
+            detector_kwargs = {'model_name': args.model_name, 'model_version': args.model_version}
             if args.contamination is not None:
                 detector_kwargs['contamination'] = args.contamination
 
-            detector = HDFSDetector(**detector_kwargs)
+            detector = DETECTORS[args.model_type](**detector_kwargs)
         else:
             logger.error(f"Type de modèle non supporté: {args.model_type}")
             return 1
 
         # Détection des anomalies
-        success = detector.detect_anomalies_in_file(args.data, output_format=args.output_format)
+        success = detector.detect_anomalies_in_file(args.data, chunksize=args.chunksize,
+                                                    output_format=args.output_format, resume=args.resume,
+                                                    contamination=args.contamination)
 
         if success:
             # Générer un rapport si demandé
             if args.report or args.visualize:
                 # Charger les résultats JSON
-                results_path = detector.project_root / "data" / "results" / f"anomalies_{args.data.replace('.csv', '')}.json"
+                results_path = detector.results_path(args.data, ".json")
                 if results_path.exists():
                     with open(results_path, 'r') as f:
                         results = json.load(f)
 
-                    # Charger les données d'anomalies pour les visualisations
-                    anomaly_data = None
-                    if args.visualize:
-                        csv_path = results_path.with_suffix('.csv')
-                        if csv_path.exists():
-                            anomaly_data = pd.read_csv(csv_path)
+                    # Charger le résumé pré-agrégé pour les visualisations
+                    summary = None
+                    summary_path = detector.results_path(args.data, ".report.json")
+                    if args.visualize and summary_path.exists():
+                        summary = ReportSummary.load(summary_path)
 
                     # Générer le rapport
-                    report_path = generate_report(results, anomaly_data)
+                    report_path = generate_report(results, summary=summary)
                     logger.info(f"Rapport détaillé disponible: {report_path}")
                 else:
                     logger.warning(f"Fichier de résultats non trouvé: {results_path}")
@@ -0,0 +1,152 @@
+"""
+Script d'entraînement distribué de l'Isolation Forest par shards.
+
+Les étapes communiquent par un dossier de travail partagé, ce qui permet
+de les lancer sur plusieurs machines:
+
+    split    découpe la trace en shards
+    stats    phase 1 sur un shard (--shard i)
+    prepare  normalisation et PCA communes
+    fit      phase 2 sur un shard (--shard i): entraîne une sous-forêt
+    merge    fusionne les sous-forêts et enregistre le modèle HDFS dans le registre
+
+La commande "run" enchaîne toutes les étapes avec un pool de processus local.
+"""
+
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Ajouter le répertoire src au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models import HDFSDetector
+from models.distributed import ShardedTrainer
+from utils.logger import get_project_logger
+
+
+def make_trainer(work_dir, contamination, verbose=True, model_name=None):
+    """Construit le coordinateur avec un détecteur HDFS configuré."""
+    detector = HDFSDetector(contamination=contamination, verbose=verbose, model_name=model_name)
+    return ShardedTrainer(detector, work_dir)
+
+
+def run_shard_stage(stage, work_dir, contamination, index):
+    """Exécute une phase sur un shard (fonction de niveau module pour le pool de processus)."""
+    trainer = make_trainer(work_dir, contamination, verbose=False)
+    if stage == "stats":
+        return str(trainer.compute_shard_stats(index))
+    return str(trainer.fit_shard(index))
+
+
+def run_parallel(stage, work_dir, contamination, n_shards, workers):
+    """Exécute une phase sur tous les shards avec un pool de processus local."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_shard_stage, stage, work_dir, contamination, i) for i in range(n_shards)]
+        return [future.result() for future in futures]
+
+
+def main():
+    """Fonction principale du script d'entraînement distribué."""
+    parser = argparse.ArgumentParser(
+        description="Entraîne un modèle HDFS par shards et fusionne les sous-forêts"
+    )
+    parser.add_argument(
+        "command",
+        choices=["split", "stats", "prepare", "fit", "merge", "run"],
+        help="Étape à exécuter"
+    )
+    parser.add_argument(
+        "--work-dir",
+        required=True,
+        help="Dossier de travail partagé entre les processus ou machines"
+    )
+    parser.add_argument(
+        "--data",
+        default=None,
+        help="Nom du fichier CSV d'entraînement (split, run)"
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=4,
+        help="Nombre de shards (split, run)"
+    )
+    parser.add_argument(
+        "--shard",
+        type=int,
+        default=None,
+        help="Numéro du shard à traiter (stats, fit)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Nombre maximum de processus locaux (run, défaut: nombre de CPU, borné par le budget mémoire)"
+    )
+    parser.add_argument(
+        "--model-name",
+        default=None,
+        help="Nom du modèle fusionné dans le registre (merge, run)"
+    )
+    parser.add_argument(
+        "--contamination",
+        type=float,
+        default=None,
+        help="Proportion d'anomalies attendues (défaut: model_config.yaml, sinon 0.01)"
+    )
+
+    args = parser.parse_args()
+    logger = get_project_logger()
+
+    try:
+        trainer = make_trainer(args.work_dir, args.contamination, model_name=args.model_name)
+
+        if args.command in ("split", "run"):
+            if not args.data:
+                logger.error("--data est requis pour cette commande")
+                return 1
+            file_path = trainer.detector.resolve_file(args.data)
+            if file_path is None:
+                logger.error(f"Fichier non trouvé: {args.data}")
+                return 1
+            trainer.split(file_path, args.shards)
+            if args.command == "split":
+                return 0
+
+        if args.command in ("stats", "fit"):
+            if args.shard is None:
+                logger.error("--shard est requis pour cette commande")
+                return 1
+            if args.command == "stats":
+                trainer.compute_shard_stats(args.shard)
+            else:
+                trainer.fit_shard(args.shard)
+            return 0
+
+        if args.command == "prepare":
+            trainer.prepare()
+            return 0
+
+        if args.command == "run":
+            n_shards = trainer.manifest['n_shards']
+            # Processus limités au budget mémoire (data_config.yaml, section memory)
+            workers = trainer.plan_workers(args.workers)
+            run_parallel("stats", args.work_dir, args.contamination, n_shards, workers)
+            trainer.prepare()
+            run_parallel("fit", args.work_dir, args.contamination, n_shards, workers)
+
+        if trainer.merge():
+            logger.info("Entraînement distribué terminé avec succès")
+            return 0
+        logger.error("Échec de la fusion des sous-forêts")
+        return 1
+
+    except Exception as e:
+        logger.error(f"Erreur lors de l'entraînement distribué: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
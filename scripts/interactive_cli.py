@@ -3,17 +3,31 @@ Interface en ligne de commande interactive pour la gestion des anomalies.
 
 Ce script fournit une interface utilisateur simple pour entraîner des modèles
 et détecter des anomalies sans avoir à utiliser les arguments en ligne de commande.
+
+Les traces lues et les résultats scorés sont gardés dans un cache de session
+(section interactive de data_config.yaml): inspecter à nouveau une trace,
+changer de seuil, parcourir les anomalies ou examiner une TaskID ne relit
+ni ne rescore le fichier.
 """
 
 import sys
+import time
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 # Ajouter le répertoire src au path pour les imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from models.hdfs_detector import HDFSDetector
+from models.session_cache import SessionCache, file_key
+from utils.config import get_section
 from utils.logger import get_project_logger
 
+# Valeurs utilisées si la section interactive de data_config.yaml est absente
+DEFAULT_INTERACTIVE_SETTINGS = {'cache_max_mb': 1024, 'page_size': 10, 'n_events': 5}
+
 
 class InteractiveCLI:
     """Interface en ligne de commande interactive."""
@@ -22,6 +36,14 @@ class InteractiveCLI:
         """Initialise l'interface interactive."""
         self.detector = HDFSDetector()
         self.logger = get_project_logger()
+        self.settings = get_section("data_config", "interactive", self.detector.project_root,
+                                    DEFAULT_INTERACTIVE_SETTINGS)
+        self.session = SessionCache(int(self.settings['cache_max_mb'] * 1024 * 1024))
+        # Dernière analyse: résultat au seuil du modèle et vue au seuil courant
+        self.base_result = None
+        self.current = None
+        self.current_name = None
+        self._row_index = None
 
     def show_menu(self):
         """Affiche le menu principal."""
@@ -34,7 +56,69 @@ class InteractiveCLI:
         print("1. Créer un modèle HDFS (données d'entraînement)")
         print("2. Inspecter un CSV HDFS (détecter anomalies)")
         print("3. Lister les CSV disponibles")
-        print("4. Quitter")
+        print("4. Changer le seuil de la dernière analyse")
+        print("5. Parcourir les anomalies de la dernière analyse")
+        print("6. Examiner une TaskID")
+        print("7. État du cache de session")
+        print("8. Quitter")
+        if self.current is not None:
+            print(f"\nAnalyse courante: {self.current_name} ({self.current.n_anomalies} anomalies, "
+                  f"seuil {self.current.threshold:.4f})")
+
+    def csv_files(self) -> list:
+        """
+        Liste des CSV du projet, relue seulement si un dossier de recherche a changé.
+
+        Returns:
+            Chemins des fichiers CSV (voir HDFSDetector.find_csv_files)
+        """
+        root = self.detector.project_root
+        dirs = [root / "data" / "raw", root / "data", root]
+        key = ('files',) + tuple((str(d), d.stat().st_mtime_ns) for d in dirs if d.exists())
+        files, _ = self.session.get_or_compute(key, self.detector.find_csv_files)
+        return files
+
+    def resolve(self, csv_file: str):
+        """Premier CSV dont le nom contient csv_file (même règle que HDFSDetector.resolve_file)."""
+        for f in self.csv_files():
+            if csv_file.lower() in f.name.lower():
+                return f
+        return None
+
+    def model_key(self) -> tuple:
+        """Identité du modèle chargé (les scores en cache lui sont propres)."""
+        return type(self.detector).__name__, self.detector.model_hash or id(self.detector.model)
+
+    def _score(self, file_path: Path):
+        """Score une trace, en réutilisant la trace en cache si le fichier est lu en entier."""
+        plan = self.detector.plan_memory(file_path, 'detect')
+        if plan.mode == 'chunked':
+            return self.detector.detect(str(file_path), chunksize=plan.chunksize)
+
+        key = ('trace', file_key(file_path))
+        data, hit = self.session.get_or_compute(key, lambda: self.detector.load_data(file_path)[0])
+        if data is None:
+            return None
+        if hit:
+            print(f"Trace reprise du cache de session ({len(data)} lignes)")
+        result = self.detector.detect(data)
+        result.source = file_path
+        return result
+
+    def set_current(self, result, name: str):
+        """Fait d'un résultat l'analyse courante (seuil du modèle)."""
+        if result is not self.base_result:
+            self._row_index = None
+        self.base_result = result
+        self.current = result
+        self.current_name = name
+
+    def require_current(self) -> bool:
+        """Vérifie qu'une analyse est disponible pour les actions sur la dernière analyse."""
+        if self.current is None:
+            print("Aucune analyse en cours: inspectez d'abord un CSV (action 2).")
+            return False
+        return True
 
     def handle_create_model(self):
         """Gère la création d'un modèle."""
@@ -50,19 +134,154 @@ class InteractiveCLI:
             print("Nom de fichier requis.")
 
     def handle_detect_anomalies(self):
-        """Gère la détection d'anomalies."""
+        """Gère la détection d'anomalies (résultat repris du cache de session si possible)."""
         csv_file = input("\nFichier CSV à inspecter: ").strip()
-        if csv_file:
-            print("\nDétection d'anomalies en cours...")
-            success = self.detector.detect_anomalies_in_file(csv_file)
-            if not success:
-                print("\nÉchec de la détection d'anomalies.")
-        else:
+        if not csv_file:
             print("Nom de fichier requis.")
+            return
+        if not self.detector.ensure_model_loaded():
+            print("\nÉchec de la détection d'anomalies.")
+            return
+        file_path = self.resolve(csv_file)
+        if file_path is None:
+            print(f"\nFichier '{csv_file}' non trouvé.")
+            return
+
+        print("\nDétection d'anomalies en cours...")
+        start = time.perf_counter()
+        key = ('scores', file_key(file_path), self.model_key())
+        result, hit = self.session.get_or_compute(key, lambda: self._score(file_path))
+        if result is None:
+            print("\nÉchec de la détection d'anomalies.")
+            return
+        if hit:
+            print(f"Résultat repris du cache de session ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        self.set_current(result, file_path.name)
+        # Un résultat repris du cache a déjà été sauvegardé et enregistré dans results.sqlite
+        self.detector.render_result(result, file_path.name, save=not hit)
 
     def handle_list_files(self):
         """Gère l'affichage de la liste des fichiers."""
-        self.detector.list_available_files()
+        csv_files = self.csv_files()
+        print("\nFichiers CSV disponibles:")
+        if csv_files:
+            for f in csv_files:
+                print(f"  - {f.name} (dans {f.parent.name}/)")
+        else:
+            print("  Aucun fichier CSV trouvé")
+
+    def handle_rethreshold(self):
+        """Applique un autre seuil aux scores de la dernière analyse, sans rescorer."""
+        if not self.require_current():
+            return
+        answer = input("\nTaux d'anomalies (ex: 0.05), score fixe (s=-0.02) ou nombre d'anomalies (k=50): ")
+        answer = answer.strip().lower()
+        if not answer:
+            return
+        try:
+            if answer.startswith("s="):
+                threshold = float(answer[2:])
+            elif answer.startswith("k="):
+                threshold = self.base_result.threshold_for_top_k(int(answer[2:]))
+            else:
+                threshold = self.detector.threshold_for_rate(float(answer))
+        except ValueError as e:
+            print(f"Seuil invalide: {e}")
+            return
+
+        self.current = self.base_result.with_threshold(threshold)
+        print(f"\nSeuil: {threshold:.4f} (modèle: {self.base_result.threshold:.4f})")
+        print(f"Anomalies: {self.current.n_anomalies}/{len(self.current)} ({self.current.anomaly_rate:.2f}%), "
+              f"contre {self.base_result.n_anomalies} au seuil du modèle")
+        self.show_page(0)
+
+    def show_page(self, page: int) -> int:
+        """
+        Affiche une page des anomalies de l'analyse courante, de la plus sévère à la moins sévère.
+
+        Args:
+            page: Numéro de page (à partir de 0)
+
+        Returns:
+            Nombre de pages
+        """
+        size = max(int(self.settings['page_size']), 1)
+        ranked = self.current.ranked_anomaly_indices
+        n_pages = max((len(ranked) + size - 1) // size, 1)
+        print(f"\nAnomalies {page * size + 1}-{min((page + 1) * size, len(ranked))} sur {len(ranked)} "
+              f"(page {page + 1}/{n_pages})")
+        for rank, position in enumerate(ranked[page * size:(page + 1) * size], page * size + 1):
+            events = self.current.top_events(position, 3)
+            details = ", ".join(f"{name}={value}" for name, value in events.items())
+            print(f"  {rank}. {self.current.row_ids[position]}: Score = {self.current.scores[position]:.4f}"
+                  f"{'  [' + details + ']' if details else ''}")
+        return n_pages
+
+    def handle_browse(self):
+        """Parcourt les anomalies de la dernière analyse page par page."""
+        if not self.require_current():
+            return
+        page = 0
+        while True:
+            n_pages = self.show_page(page)
+            answer = input("\n[Entrée/n] suivante, [p] précédente, [numéro] page, [q] retour: ").strip().lower()
+            if answer == "q":
+                return
+            if answer == "p":
+                page = max(page - 1, 0)
+            elif answer.isdigit():
+                page = min(max(int(answer) - 1, 0), n_pages - 1)
+            elif page + 1 < n_pages:
+                page += 1
+            else:
+                return
+
+    def handle_drilldown(self):
+        """Affiche le score, le rang et les événements d'une TaskID de la dernière analyse."""
+        if not self.require_current():
+            return
+        task_id = input("\nTaskID: ").strip()
+        if not task_id:
+            return
+        if self._row_index is None:
+            self._row_index = pd.Index(self.base_result.row_ids)
+        if self._row_index.dtype.kind in "iu":
+            if not task_id.lstrip("-").isdigit():
+                print(f"TaskID introuvable: {task_id}")
+                return
+            task_id = int(task_id)
+        positions = self._row_index.get_indexer_for([task_id])
+        positions = positions[positions >= 0]
+        if not len(positions):
+            print(f"TaskID introuvable: {task_id}")
+            return
+
+        result = self.current
+        for position in positions:
+            score = result.scores[position]
+            rank = int(np.count_nonzero(result.scores < score)) + 1
+            print(f"\n{task_id} (ligne {position}):")
+            print(f"  Score: {score:.4f} (seuil {result.threshold:.4f}) - "
+                  f"{'ANOMALIE' if result.is_anomaly[position] else 'normal'}")
+            print(f"  Rang: {rank}/{len(result)} (parmi les {rank / len(result):.2%} de lignes les plus anormales)")
+            events = result.top_events(position, int(self.settings['n_events']))
+            if events:
+                print("  Événements principaux:")
+                for name, value in events.items():
+                    print(f"    - {name}: {value}")
+            elif result.features is None or result.feature_positions is not None:
+                print("  Événements non conservés (détection par blocs: anomalies du seuil d'origine seulement)")
+
+    def handle_cache_stats(self):
+        """Affiche l'occupation et l'efficacité des caches de la session."""
+        stats = self.session.stats()
+        print("\nCache de session:")
+        print(f"  Entrées: {stats['entries'] or 'aucune'}")
+        print(f"  Mémoire: {stats['bytes'] / (1024 * 1024):.1f} / {stats['max_bytes'] / (1024 * 1024):.0f} MB")
+        print(f"  Succès: {stats['hits']}, échecs: {stats['misses']}")
+        models = self.detector.model_cache.stats()
+        print(f"Cache de modèles: {models['models']} modèle(s), {models['bytes'] / (1024 * 1024):.1f} MB, "
+              f"{models['hits']} succès, {models['misses']} échecs")
 
     def run(self):
         """Lance l'interface interactive."""
@@ -70,7 +289,7 @@ class InteractiveCLI:
             self.show_menu()
 
             try:
-                choice = input("\nChoisissez (1-4): ").strip()
+                choice = input("\nChoisissez (1-8): ").strip()
 
                 if choice == '1':
                     self.handle_create_model()
@@ -79,12 +298,20 @@ class InteractiveCLI:
                 elif choice == '3':
                     self.handle_list_files()
                 elif choice == '4':
+                    self.handle_rethreshold()
+                elif choice == '5':
+                    self.handle_browse()
+                elif choice == '6':
+                    self.handle_drilldown()
+                elif choice == '7':
+                    self.handle_cache_stats()
+                elif choice == '8':
                     print("\nAu revoir!")
                     break
                 else:
-                    print("\nChoix invalide. Veuillez choisir entre 1 et 4.")
+                    print("\nChoix invalide. Veuillez choisir entre 1 et 8.")
 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
                 print("\n\nInterruption détectée. Au revoir!")
                 break
             except Exception as e:
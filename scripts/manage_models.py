@@ -0,0 +1,120 @@
+"""
+Script de gestion du registre des modèles.
+
+Ce script liste les modèles et leurs versions, affiche les métadonnées
+d'une version, déplace les alias (ex: revenir à une version précédente) et
+publie la version compacte d'un modèle (sous-ensemble d'arbres, voir
+models.distillation).
+"""
+
+import sys
+import argparse
+import json
+from pathlib import Path
+
+# Ajouter le répertoire src au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models import HDFSDetector
+from models.registry import DEFAULT_ALIAS
+from utils.logger import get_project_logger
+
+
+def main():
+    """Fonction principale du script de gestion du registre."""
+    parser = argparse.ArgumentParser(
+        description="Gère le registre versionné des modèles"
+    )
+    parser.add_argument(
+        "command",
+        choices=["list", "show", "alias", "distill"],
+        help="list: modèles et versions, show: métadonnées, alias: déplacer un alias, "
+             "distill: publier la version compacte (<nom>-compact)"
+    )
+    parser.add_argument(
+        "name",
+        nargs="?",
+        help="Nom du modèle"
+    )
+    parser.add_argument(
+        "version",
+        nargs="?",
+        default=DEFAULT_ALIAS,
+        help="Version ou alias (défaut: current)"
+    )
+    parser.add_argument(
+        "--alias",
+        default=DEFAULT_ALIAS,
+        help="Alias à déplacer vers la version (commande alias, défaut: current)"
+    )
+    parser.add_argument(
+        "--data",
+        default=None,
+        help="Fichier CSV de calibration du modèle compact, en général celui d'entraînement (commande distill)"
+    )
+
+    args = parser.parse_args()
+    logger = get_project_logger()
+
+    try:
+        registry = HDFSDetector(verbose=False).registry
+
+        if args.command == "list":
+            names = [args.name] if args.name else registry.names()
+            if not names:
+                print("Aucun modèle enregistré")
+            for name in names:
+                aliases = registry.aliases(name)
+                print(f"{name}:")
+                for version in registry.versions(name):
+                    metadata = registry.metadata(name, version)
+                    tags = [alias for alias, target in aliases.items() if target == version]
+                    print(f"  {version}  {metadata.get('created_at')}  {metadata.get('model_type')}  "
+                          f"{metadata.get('rows')} lignes"
+                          + (f"  [{', '.join(tags)}]" if tags else ""))
+            return 0
+
+        if not args.name:
+            logger.error("Nom du modèle requis")
+            return 1
+
+        if args.command == "show":
+            metadata = registry.metadata(args.name, args.version)
+            if metadata is None:
+                logger.error(f"Version introuvable: {args.name} {args.version}")
+                return 1
+            print(json.dumps(metadata, indent=2))
+            return 0
+
+        if args.command == "distill":
+            if not args.data:
+                logger.error("--data est requis pour cette commande")
+                return 1
+            detector = HDFSDetector(model_name=args.name, model_version=args.version)
+            if not detector.ensure_model_loaded():
+                return 1
+            file_path = detector.resolve_file(args.data)
+            if file_path is None:
+                logger.error(f"Fichier non trouvé: {args.data}")
+                return 1
+            data, _ = detector.load_data(file_path)
+            if data is None:
+                return 1
+            report = detector.distill_model(detector.preprocess_data(data), file_path)
+            return 0 if report else 1
+
+        version = registry.resolve(args.name, args.version)
+        if version is None:
+            logger.error(f"Version introuvable: {args.name} {args.version}")
+            return 1
+        registry.set_alias(args.name, args.alias, version)
+        logger.info(f"Alias {args.alias} de {args.name} -> {version}")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Erreur lors de la gestion du registre: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
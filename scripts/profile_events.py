@@ -0,0 +1,172 @@
+"""
+Script de profilage et de comparaison des fréquences d'événements.
+
+Ce script lit chaque trace une seule fois, par blocs, avec un processus par
+trace, et calcule par événement le total, le support, la moyenne, la
+variance et le maximum. Les traces suivantes sont comparées à la première
+(ou à --reference) et les événements sont classés par divergence.
+
+    python scripts/profile_events.py normal_trace.csv failure_trace.csv
+"""
+
+import sys
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+# Ajouter le répertoire src au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models import HDFSDetector
+from models.event_profile import (DEFAULT_PROFILE_CHUNKSIZE, RANKING_METRICS, compare_profiles,
+                                  divergence_summary, profile_file)
+from utils.compression import strip_csv_suffix
+from utils.logger import get_project_logger
+
+
+def run_profile(file_path, chunksize):
+    """Profile une trace (fonction de niveau module pour le pool de processus)."""
+    return profile_file(HDFSDetector(verbose=False), file_path, chunksize)
+
+
+def profile_all(detector, paths, chunksize, workers):
+    """
+    Profile plusieurs traces, une par processus dans la limite du budget mémoire.
+
+    Args:
+        detector: Détecteur HDFS (lecture des en-têtes et budget mémoire)
+        paths: Traces à profiler
+        chunksize: Lignes par bloc
+        workers: Nombre maximum de processus (None = nombre de CPU)
+
+    Returns:
+        Profils, dans l'ordre de paths
+    """
+    n_columns = 0
+    for path in paths:
+        with detector.open_source(path) as source:
+            n_columns = max(n_columns, len(pd.read_csv(source, encoding='latin-1', nrows=0).columns))
+    planner = detector.memory_planner
+    per_worker_mb = (chunksize * planner.row_bytes(n_columns, 8)
+                     * planner.settings['working_set_factor'] / (1024 * 1024))
+    workers = min(planner.plan_workers(per_worker_mb, workers), len(paths))
+    if workers <= 1:
+        return [profile_file(detector, path, chunksize) for path in paths]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_profile, path, chunksize) for path in paths]
+        return [future.result() for future in futures]
+
+
+def main():
+    """Fonction principale du script de profilage."""
+    parser = argparse.ArgumentParser(
+        description="Profile les événements de traces et classe ceux qui divergent"
+    )
+    parser.add_argument(
+        "traces",
+        nargs="+",
+        help="Noms des fichiers CSV à profiler (le premier sert de référence)"
+    )
+    parser.add_argument(
+        "--reference",
+        default=None,
+        help="Trace de référence (défaut: la première)"
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help=f"Lignes par bloc (défaut: csv.chunksize ou {DEFAULT_PROFILE_CHUNKSIZE})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Nombre maximum de processus (défaut: nombre de CPU, borné par le budget mémoire)"
+    )
+    parser.add_argument(
+        "--sort-by",
+        choices=RANKING_METRICS,
+        default="js",
+        help="Critère de classement des événements (défaut: js)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Nombre d'événements affichés par comparaison"
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="data/results",
+        help="Dossier des profils (profile_<trace>.csv) et comparaisons (divergence_<ref>_vs_<trace>.csv)"
+    )
+
+    args = parser.parse_args()
+    logger = get_project_logger()
+
+    try:
+        detector = HDFSDetector(verbose=False)
+        names = list(args.traces)
+        if args.reference and args.reference not in names:
+            names.insert(0, args.reference)
+        paths = []
+        for name in names:
+            path = detector.resolve_file(name)
+            if path is None:
+                logger.error(f"Fichier non trouvé: {name}")
+                return 1
+            paths.append(path)
+        reference_index = names.index(args.reference) if args.reference else 0
+
+        chunksize = args.chunksize or detector.chunksize or DEFAULT_PROFILE_CHUNKSIZE
+        start = time.perf_counter()
+        profiles = profile_all(detector, paths, chunksize, args.workers)
+        logger.info(f"{len(profiles)} traces profilées en {time.perf_counter() - start:.2f} s "
+                    f"({sum(p.n_rows for p in profiles)} lignes)")
+
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for path, profile in zip(paths, profiles):
+            profile.to_frame().to_csv(output_dir / f"profile_{strip_csv_suffix(path.name)}.csv")
+
+        reference = profiles[reference_index]
+        ref_name = strip_csv_suffix(paths[reference_index].name)
+        for index, (path, profile) in enumerate(zip(paths, profiles)):
+            if index == reference_index:
+                continue
+            name = strip_csv_suffix(path.name)
+            comparison = compare_profiles(reference, profile, sort_by=args.sort_by)
+            comparison_path = output_dir / f"divergence_{ref_name}_vs_{name}.csv"
+            comparison.to_csv(comparison_path)
+
+            summary = divergence_summary(comparison)
+            print(f"\n{ref_name} ({reference.n_rows} lignes) -> {name} ({profile.n_rows} lignes)")
+            print(f"Divergence de Jensen-Shannon: {summary['js_divergence']:.4f}")
+            if summary['appeared']:
+                print(f"Événements apparus: {', '.join(summary['appeared'][:args.top])}")
+            if summary['vanished']:
+                print(f"Événements disparus: {', '.join(summary['vanished'][:args.top])}")
+            columns = ['ref_mean', 'mean', 'ref_support_rate', 'support_rate', 'log2_ratio', 'js']
+            print(comparison[columns].head(args.top).to_string(float_format=lambda v: f"{v:.4f}"))
+            print(f"Comparaison complète: {comparison_path}")
+
+        if len(profiles) == 1:
+            print(json.dumps({'source': str(paths[0]), 'rows': reference.n_rows,
+                              'events': len(reference.feature_names)}, ensure_ascii=False))
+            print(reference.to_frame().sort_values('count', ascending=False)
+                  .head(args.top).to_string(float_format=lambda v: f"{v:.4f}"))
+        return 0
+
+    except Exception as e:
+        logger.error(f"Erreur lors du profilage des traces: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
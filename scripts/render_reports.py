@@ -0,0 +1,82 @@
+"""
+Script de rendu en lot des figures de rapport.
+
+Ce script lit les résumés pré-agrégés (anomalies_<trace>.report.json)
+produits par la détection et génère les figures de toutes les traces avec
+un pool de processus. Les figures dont le résumé n'a pas changé sont
+recopiées depuis le cache au lieu d'être redessinées.
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+
+# Ajouter le répertoire src au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models.report_summary import ReportSummary
+from utils.logger import get_project_logger
+from utils.rendering import render_figures, render_settings, report_figure_jobs
+
+
+def main():
+    """Fonction principale du script de rendu en lot."""
+    parser = argparse.ArgumentParser(
+        description="Génère les figures de rapport de plusieurs traces en parallèle"
+    )
+    parser.add_argument(
+        "--input-dir",
+        default="data/results",
+        help="Dossier contenant les résumés *.report.json"
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="data/reports",
+        help="Dossier des figures produites"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Nombre de processus de rendu (défaut: data_config.yaml)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Redessiner toutes les figures"
+    )
+
+    args = parser.parse_args()
+    logger = get_project_logger()
+
+    try:
+        settings = render_settings()
+        summary_files = sorted(Path(args.input_dir).glob("*.report.json"))
+        if not summary_files:
+            logger.warning(f"Aucun résumé trouvé dans {args.input_dir}")
+            return 0
+
+        jobs = []
+        for summary_file in summary_files:
+            summary = ReportSummary.load(summary_file)
+            if summary.n_anomalies > 0:
+                name = summary_file.name[:-len(".report.json")]
+                jobs.extend(report_figure_jobs(summary, args.output_dir, name, settings['dpi']))
+
+        start = time.perf_counter()
+        workers = args.workers if args.workers is not None else settings['render_workers']
+        results = render_figures(jobs, workers, None if args.no_cache else settings['figure_cache'])
+        n_cached = sum(cached for _, cached in results)
+
+        logger.info(f"{len(results)} figures pour {len(summary_files)} traces en "
+                    f"{time.perf_counter() - start:.2f} s ({n_cached} depuis le cache)")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Erreur lors du rendu des rapports: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Script de re-seuillage d'une détection déjà effectuée.
+
+Ce script relit les scores sauvegardés par la détection
+(data/results/anomalies_<trace>.scores.npz) et applique un autre seuil:
+taux d'anomalies (converti en seuil par les quantiles d'entraînement du
+modèle), score fixe ou nombre d'anomalies. Rien n'est réentraîné ni rescoré.
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+
+# Ajouter le répertoire src au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models import DETECTORS
+from models.detection_result import DetectionResult
+from utils.logger import get_project_logger
+
+
+def load_run_model(model_info):
+    """
+    Charge le modèle qui a produit une détection (quantiles d'entraînement).
+
+    Args:
+        model_info: Informations du modèle sauvegardées avec les scores
+
+    Returns:
+        Détecteur chargé, ou None si le modèle est introuvable
+    """
+    classes = {cls.__name__: cls for cls in DETECTORS.values()}
+    detector_class = classes.get(model_info.get('model_type'))
+    if detector_class is None:
+        return None
+    detector = detector_class(verbose=False, model_name=model_info.get('model_name'),
+                              model_version=model_info.get('model_version'))
+    return detector if detector.ensure_model_loaded() else None
+
+
+def main():
+    """Fonction principale du script de re-seuillage."""
+    parser = argparse.ArgumentParser(
+        description="Applique un nouveau seuil aux scores d'une détection existante"
+    )
+    parser.add_argument(
+        "--data",
+        required=True,
+        help="Nom du fichier CSV analysé (ex: failure_trace.csv)"
+    )
+    threshold_group = parser.add_mutually_exclusive_group(required=True)
+    threshold_group.add_argument(
+        "--contamination",
+        type=float,
+        help="Taux d'anomalies voulu, converti en seuil par les quantiles d'entraînement"
+    )
+    threshold_group.add_argument(
+        "--score",
+        type=float,
+        help="Seuil de score fixe (score < seuil = anomalie)"
+    )
+    threshold_group.add_argument(
+        "--top-k",
+        type=int,
+        help="Nombre d'anomalies les plus sévères à retenir"
+    )
+    parser.add_argument(
+        "--show",
+        type=int,
+        default=10,
+        help="Nombre d'anomalies à afficher (défaut: 10)"
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Fichier CSV des anomalies retenues (TaskID, score)"
+    )
+
+    args = parser.parse_args()
+    logger = get_project_logger()
+
+    try:
+        scores_path = DETECTORS['hdfs'](verbose=False).results_path(args.data, ".scores.npz")
+        if not scores_path.exists():
+            logger.error(f"Scores introuvables: {scores_path} (lancez d'abord la détection)")
+            return 1
+
+        start = time.perf_counter()
+        run = DetectionResult.load_scores(scores_path)
+        detector = load_run_model(run.model_info)
+        if detector is not None and detector.model_hash != run.model_info.get('model_hash'):
+            logger.warning("Le modèle chargé n'est pas celui de la détection: "
+                           "la conversion taux -> seuil peut être décalée")
+
+        if args.contamination is not None:
+            if detector is None:
+                logger.error("Modèle de la détection introuvable: utilisez --score ou --top-k")
+                return 1
+            threshold = detector.threshold_for_rate(args.contamination)
+        elif args.score is not None:
+            threshold = args.score
+        else:
+            threshold = run.threshold_for_top_k(args.top_k)
+
+        result = run.with_threshold(threshold)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        print(f"Seuil: {threshold:.4f} (détection d'origine: {run.threshold:.4f})")
+        print(f"Anomalies: {result.n_anomalies}/{len(result)} ({result.anomaly_rate:.2f}%), "
+              f"contre {run.n_anomalies} au seuil d'origine")
+        if detector is not None:
+            train_rate = detector.rate_for_threshold(threshold)
+            if train_rate is not None:
+                print(f"Taux équivalent sur les données d'entraînement: {train_rate:.2%}")
+        print(f"Re-seuillage en {elapsed_ms:.1f} ms")
+
+        for i, anomaly in enumerate(result.top_anomalies(args.show, 0), 1):
+            print(f"  {i}. {anomaly['task_id']}: Score = {anomaly['score']:.4f}")
+
+        if args.output:
+            frame = result.anomaly_frame()
+            frame.index.name = frame.index.name or 'TaskID'
+            frame.to_csv(args.output)
+            logger.info(f"Anomalies sauvegardées dans: {args.output}")
+
+        return 0
+
+    except Exception as e:
+        logger.error(f"Erreur lors du re-seuillage: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,7 +12,7 @@ from pathlib import Path
 # Ajouter le répertoire src au path pour les imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from models.hdfs_detector import HDFSDetector
+from models import DETECTORS
 from utils.logger import get_project_logger
 
 
@@ -29,14 +29,41 @@ def main():
     parser.add_argument(
         "--model-type", 
         default="hdfs", 
-        choices=["hdfs"],
+        choices=sorted(DETECTORS),
         help="Type de modèle à entraîner"
     )
+    parser.add_argument(
+        "--model-name",
+        default=None,
+        help="Nom du modèle dans le registre (ex: cluster-a, défaut: type de modèle)"
+    )
+    parser.add_argument(
+        "--alias",
+        default=None,
+        help="Alias supplémentaire vers la nouvelle version (l'alias current est toujours mis à jour)"
+    )
     parser.add_argument(
         "--contamination", 
         type=float, 
-        default=0.01,
-        help="Proportion d'anomalies attendues (défaut: 0.01 = 1%%)"
+        default=None,
+        help="Proportion d'anomalies attendues (défaut: model_config.yaml, sinon 0.01)"
+    )
+    parser.add_argument(
+        "--auto-tune",
+        action="store_true",
+        help="Choisir les hyperparamètres selon un budget de latence"
+    )
+    parser.add_argument(
+        "--target-latency-ms",
+        type=float,
+        default=None,
+        help="Latence de scoring visée pour 1000 lignes (défaut: config)"
+    )
+    parser.add_argument(
+        "--train-budget",
+        type=float,
+        default=None,
+        help="Budget de temps de l'auto-tuning en secondes (défaut: config)"
     )
 
     args = parser.parse_args()
@@ -47,14 +74,21 @@ def main():
 
     try:
         # Initialisation du détecteur selon le type
-        if args.model_type == "hdfs":
-            detector = HDFSDetector(contamination=args.contamination)
+        if args.model_type in DETECTORS:
+            detector = DETECTORS[args.model_type](contamination=args.contamination,
+                                                  model_name=args.model_name,
+                                                  model_version=args.alias)
         else:
             logger.error(f"Type de modèle non supporté: {args.model_type}")
             return 1
 
         # Entraînement du modèle
-        success = detector.create_model_from_file(args.data)
+        success = detector.create_model_from_file(
+            args.data,
+            auto_tune=args.auto_tune,
+            target_latency_ms=args.target_latency_ms,
+            train_budget_s=args.train_budget
+        )
 
         if success:
             logger.info("Entraînement terminé avec succès")
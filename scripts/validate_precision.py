@@ -0,0 +1,88 @@
+"""
+Script de validation du mode float32.
+
+Ce script entraîne le même modèle en float64 et en float32, score des
+traces de référence avec les deux et écrit un rapport d'accord des scores.
+"""
+
+import sys
+import argparse
+import json
+from pathlib import Path
+from datetime import datetime
+
+# Ajouter le répertoire src au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models.hdfs_detector import HDFSDetector
+from models.precision import compare_precisions
+from utils.logger import get_project_logger
+
+
+def main():
+    """Fonction principale du script de validation."""
+    parser = argparse.ArgumentParser(
+        description="Compare les scores float32 et float64 sur des traces de référence"
+    )
+    parser.add_argument(
+        "--train",
+        required=True,
+        help="Nom du fichier CSV d'entraînement"
+    )
+    parser.add_argument(
+        "--data",
+        nargs="+",
+        required=True,
+        help="Noms des fichiers CSV de référence"
+    )
+    parser.add_argument(
+        "--contamination",
+        type=float,
+        default=None,
+        help="Proportion d'anomalies attendues (défaut: model_config.yaml, sinon 0.01)"
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Chemin du rapport JSON (défaut: data/reports/precision_report_<date>.json)"
+    )
+
+    args = parser.parse_args()
+    logger = get_project_logger()
+
+    try:
+        detector = HDFSDetector()
+        train_file = detector.resolve_file(args.train)
+        reference_files = [detector.resolve_file(name) for name in args.data]
+        if train_file is None or None in reference_files:
+            logger.error("Fichier CSV introuvable")
+            return 1
+
+        report = compare_precisions(train_file, reference_files, detector.project_root,
+                                    contamination=args.contamination)
+
+        output = Path(args.output) if args.output else (
+            detector.project_root / "data" / "reports" /
+            f"precision_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+
+        print("\nVALIDATION FLOAT32 / FLOAT64:")
+        for ref in report['references']:
+            print(f"  {Path(ref['file']).name}: écart max {ref['max_abs_diff']:.2e}, "
+                  f"corrélation de rang {ref['rank_correlation']:.6f}, "
+                  f"accord des prédictions {ref['label_agreement']*100:.3f}%, "
+                  f"top-{ref['top_k']} commun {ref['top_k_overlap']*100:.1f}%, "
+                  f"mémoire {ref['matrix_mb']['float64']} -> {ref['matrix_mb']['float32']} MB")
+        logger.info(f"Rapport de validation: {output}")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Erreur lors de la validation: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
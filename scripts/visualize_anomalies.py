@@ -10,161 +10,140 @@ import argparse
 from pathlib import Path
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import re
 
 # Ajouter le répertoire src au path pour les imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from utils.logger import get_project_logger
+from utils.rendering import FigureJob, render_figure, render_settings
 
 
-def extract_categories_from_logs(anomaly_file):
+# Catégories et niveaux de gravité de la heatmap
+CATEGORIES = ['Accès fichier', 'Allocation mémoire', 'Authentification',
+              'Connexion réseau', 'Performance']
+SEVERITY_LEVELS = ['Critique', 'Élevée', 'Moyenne', 'Faible', 'Information']
+
+# Motifs des noms de colonnes, testés dans l'ordre (défaut: Performance)
+CATEGORY_PATTERNS = [
+    (0, re.compile(r"file|block", re.IGNORECASE)),                 # Accès fichier
+    (1, re.compile(r"memory|allocation", re.IGNORECASE)),          # Allocation mémoire
+    (2, re.compile(r"auth|permission", re.IGNORECASE)),            # Authentification
+    (3, re.compile(r"connect|network|socket", re.IGNORECASE)),     # Connexion réseau
+]
+DEFAULT_CATEGORY = 4
+
+# Bornes des niveaux de gravité: > 10 Critique, > 5 Élevée, > 2 Moyenne, > 0 Faible
+SEVERITY_BINS = np.array([0, 2, 5, 10])
+
+# Colonnes des fichiers de résultats qui ne sont pas des compteurs d'événements
+NON_EVENT_COLUMNS = {'anomaly_score'}
+
+
+def categorize_columns(columns):
+    """
+    Associe chaque colonne d'événement à une catégorie (une seule fois par fichier).
+
+    Args:
+        columns: Noms des colonnes d'événements
+
+    Returns:
+        Tableau des indices de catégorie, un par colonne
+    """
+    categories = np.full(len(columns), DEFAULT_CATEGORY, dtype=np.intp)
+    for position, column in enumerate(columns):
+        for category_idx, pattern in CATEGORY_PATTERNS:
+            if pattern.search(column):
+                categories[position] = category_idx
+                break
+    return categories
+
+
+def count_category_severity(values, column_categories):
+    """
+    Compte les valeurs non nulles d'un bloc par catégorie et niveau de gravité.
+
+    Args:
+        values: Matrice de compteurs (lignes × colonnes d'événements)
+        column_categories: Catégorie de chaque colonne (voir categorize_columns)
+
+    Returns:
+        Matrice des comptages (catégories × niveaux de gravité)
+    """
+    n_levels = len(SEVERITY_LEVELS)
+    mask = values > 0
+    # digitize: 0 pour <= 0 ... 4 pour > 10, inversé pour suivre l'ordre de SEVERITY_LEVELS
+    severity = (n_levels - 1) - np.digitize(values[mask], SEVERITY_BINS, right=True)
+    category = np.broadcast_to(column_categories, values.shape)[mask]
+    counts = np.bincount(category * n_levels + severity, minlength=len(CATEGORIES) * n_levels)
+    return counts.reshape(len(CATEGORIES), n_levels)
+
+
+def extract_categories_from_logs(anomaly_file, chunksize=None):
     """
     Extrait et catégorise les anomalies à partir des fichiers de résultats.
 
-    Dans un cas réel, cette fonction analyserait les colonnes des fichiers CSV
-    pour déterminer les catégories d'anomalies et leur gravité.
+    Chaque colonne d'événement est rattachée à une catégorie d'après son nom
+    et chaque compteur non nul reçoit un niveau de gravité selon sa valeur.
+    Le fichier peut être lu par blocs: seule la matrice des comptages est
+    conservée entre les blocs.
 
     Args:
         anomaly_file: Chemin vers le fichier d'anomalies
+        chunksize: Nombre de lignes lues à la fois (None = fichier entier)
 
     Returns:
         DataFrame avec les catégories et niveaux de gravité
     """
-    try:
-        # Charger le fichier d'anomalies
-        df = pd.read_csv(anomaly_file)
-
-        # Initialiser les catégories et niveaux de gravité
-        categories = ['Accès fichier', 'Allocation mémoire', 'Authentification',
-                     'Connexion réseau', 'Performance']
-        severity_levels = ['Critique', 'Élevée', 'Moyenne', 'Faible', 'Information']
-
-        # Créer une matrice pour stocker les comptages
-        # Simuler des données réalistes basées sur l'image fournie
-        counts = np.array([
-            [10559, 10549, 10448, 10371, 10640],  # Accès fichier (valeurs élevées)
-            [0, 0, 0, 0, 0],                      # Allocation mémoire (aucune anomalie)
-            [7, 8, 4, 11, 13],                    # Authentification (valeurs faibles)
-            [59, 55, 55, 32, 41],                 # Connexion réseau (valeurs moyennes)
-            [215, 179, 189, 231, 185]             # Performance (valeurs moyennes-hautes)
-        ])
-
-        # Dans un cas réel, on analyserait les colonnes du CSV pour remplir cette matrice
-        # Par exemple:
-        """
-        # Initialiser la matrice de comptage
-        counts = np.zeros((len(categories), len(severity_levels)), dtype=int)
-        
-        # Analyser chaque colonne du CSV
-        for col in df.columns:
-            col_lower = col.lower()
-            
-            # Déterminer la catégorie
-            if 'file' in col_lower or 'block' in col_lower:
-                category_idx = 0  # Accès fichier
-            elif 'memory' in col_lower or 'allocation' in col_lower:
-                category_idx = 1  # Allocation mémoire
-            elif 'auth' in col_lower or 'permission' in col_lower:
-                category_idx = 2  # Authentification
-            elif 'connect' in col_lower or 'network' in col_lower or 'socket' in col_lower:
-                category_idx = 3  # Connexion réseau
-            else:
-                category_idx = 4  # Performance
-            
-            # Compter les anomalies par niveau de gravité
-            # (Ceci est une logique simplifiée, à adapter selon vos données réelles)
-            values = df[col].values
-            non_zero_values = values[values > 0]
-            if len(non_zero_values) > 0:
-                # Répartir les valeurs dans les niveaux de gravité
-                for value in non_zero_values:
-                    if value > 10:
-                        severity_idx = 0  # Critique
-                    elif value > 5:
-                        severity_idx = 1  # Élevée
-                    elif value > 2:
-                        severity_idx = 2  # Moyenne
-                    elif value > 0:
-                        severity_idx = 3  # Faible
-                    else:
-                        severity_idx = 4  # Information
-                    
-                    counts[category_idx, severity_idx] += 1
-        """
-
-        # Créer un DataFrame pour la visualisation
-        return pd.DataFrame(counts, index=categories, columns=severity_levels)
+    counts = np.zeros((len(CATEGORIES), len(SEVERITY_LEVELS)), dtype=np.int64)
+    columns, column_categories = None, None
 
-    except Exception as e:
-        logger = get_project_logger()
-        logger.error(f"Erreur lors de l'extraction des catégories: {e}")
-        # Retourner des données simulées en cas d'erreur
-        return pd.DataFrame(
-            np.array([
-                [10559, 10549, 10448, 10371, 10640],  # Accès fichier
-                [0, 0, 0, 0, 0],                      # Allocation mémoire
-                [7, 8, 4, 11, 13],                    # Authentification
-                [59, 55, 55, 32, 41],                 # Connexion réseau
-                [215, 179, 189, 231, 185]             # Performance
-            ]),
-            index=['Accès fichier', 'Allocation mémoire', 'Authentification',
-                  'Connexion réseau', 'Performance'],
-            columns=['Critique', 'Élevée', 'Moyenne', 'Faible', 'Information']
-        )
-
-
-def create_heatmap(data, output_file):
+    chunks = pd.read_csv(anomaly_file, chunksize=chunksize) if chunksize else [pd.read_csv(anomaly_file)]
+    for chunk in chunks:
+        if columns is None:
+            columns = [c for c in chunk.select_dtypes(include="number").columns if c not in NON_EVENT_COLUMNS]
+            column_categories = categorize_columns(columns)
+        values = chunk[columns].to_numpy(dtype=np.float64, na_value=0)
+        counts += count_category_severity(values, column_categories)
+
+    # Créer un DataFrame pour la visualisation
+    return pd.DataFrame(counts, index=CATEGORIES, columns=SEVERITY_LEVELS)
+
+
+def create_heatmap(data, output_file, log_scale=False, dpi=None, cache_dir=None):
     """
     Crée une heatmap à partir des données de catégories et gravité.
 
+    La figure est rendue hors écran puis libérée; une heatmap dont les
+    comptages n'ont pas changé est recopiée depuis le cache de figures.
+
     Args:
         data: DataFrame contenant les comptages par catégorie et gravité
         output_file: Chemin du fichier de sortie pour la visualisation
+        log_scale: Forcer l'échelle logarithmique de la colorisation
+        dpi: Résolution (défaut: data_config.yaml)
+        cache_dir: Dossier du cache de figures (défaut: data_config.yaml)
+    """
+    settings = render_settings()
+    job = FigureJob(
+        'heatmap',
+        {'index': list(data.index), 'columns': list(data.columns), 'values': data.values.tolist()},
+        str(output_file),
+        dpi or settings['dpi'],
+        (14, 10),
+        {'log_scale': log_scale}
+    )
+    _, cached = render_figure(job, cache_dir or settings['figure_cache'])
+    print(f"Visualisation sauvegardée dans {output_file}" + (" (cache)" if cached else ""))
+
+
+def main(argv=None):
+    """
+    Fonction principale du script de visualisation.
+
+    Args:
+        argv: Arguments de la ligne de commande (défaut: sys.argv)
     """
-    # Créer une palette de couleurs personnalisée qui s'adapte aux données
-    # Utiliser une échelle logarithmique pour mieux visualiser les différences
-    max_value = data.values.max()
-
-    # Créer une figure avec une taille adaptée
-    plt.figure(figsize=(14, 10))
-
-    # Créer la heatmap avec une échelle de couleur adaptative
-    # Utiliser une échelle logarithmique si les données ont une grande amplitude
-    if max_value > 1000:
-        # Pour les grandes valeurs, utiliser une échelle logarithmique
-        norm = plt.matplotlib.colors.LogNorm(vmin=1, vmax=max_value)
-        cmap = "YlOrRd"
-    else:
-        # Pour les petites valeurs, utiliser une échelle linéaire
-        norm = plt.matplotlib.colors.Normalize(vmin=0, vmax=max_value)
-        cmap = "YlOrRd"
-
-    # Créer la heatmap
-    ax = sns.heatmap(data, annot=True, fmt="d", cmap=cmap, norm=norm,
-                    linewidths=.5, cbar_kws={"shrink": 0.8})
-
-    # Configurer le titre et les étiquettes
-    plt.title("Répartition des anomalies par catégorie et niveau de gravité", fontsize=16)
-    plt.xlabel("severity", fontsize=14)
-    plt.ylabel("category", fontsize=14)
-
-    # Améliorer la lisibilité des étiquettes
-    plt.xticks(fontsize=12)
-    plt.yticks(fontsize=12, rotation=0)
-
-    # Ajuster la mise en page
-    plt.tight_layout()
-
-    # Sauvegarder la figure
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    print(f"Visualisation sauvegardée dans {output_file}")
-
-
-def main():
-    """Fonction principale du script de visualisation."""
     parser = argparse.ArgumentParser(
         description="Génère une visualisation des anomalies par catégorie et gravité"
     )
@@ -178,13 +157,25 @@ def main():
         default="data/visualizations/category_severity_heatmap.png",
         help="Chemin du fichier de sortie pour la visualisation"
     )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Lire le fichier d'anomalies par blocs de N lignes"
+    )
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=None,
+        help="Résolution de l'image (défaut: data_config.yaml)"
+    )
     parser.add_argument(
         "--log-scale",
         action="store_true",
         help="Utiliser une échelle logarithmique pour la colorisation"
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Configurer le logger
     logger = get_project_logger()
@@ -196,11 +187,11 @@ def main():
 
         # Extraire les catégories et niveaux de gravité
         logger.info(f"Analyse du fichier {args.input}")
-        data = extract_categories_from_logs(args.input)
+        data = extract_categories_from_logs(args.input, chunksize=args.chunksize)
 
         # Créer la visualisation
         logger.info(f"Création de la visualisation")
-        create_heatmap(data, args.output)
+        create_heatmap(data, args.output, log_scale=args.log_scale, dpi=args.dpi)
 
         logger.info(f"Visualisation terminée avec succès")
         return 0
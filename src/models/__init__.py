@@ -0,0 +1,26 @@
+"""
+Détecteurs d'anomalies disponibles, indexés par leur type (--model-type).
+"""
+
+from .hdfs_detector import HDFSDetector
+from .hbos_detector import HBOSDetector
+
+DETECTORS = {
+    'hdfs': HDFSDetector,
+    'hbos': HBOSDetector,
+}
+
+
+def get_detector_class(model_type: str):
+    """
+    Retourne la classe de détecteur associée à un type de modèle.
+
+    Args:
+        model_type: Type de modèle (clé de DETECTORS)
+
+    Returns:
+        Classe du détecteur
+    """
+    if model_type not in DETECTORS:
+        raise ValueError(f"Type de modèle non supporté: {model_type}")
+    return DETECTORS[model_type]
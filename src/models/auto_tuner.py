@@ -0,0 +1,182 @@
+"""
+Auto-tuning des hyperparamètres de l'Isolation Forest sous contrainte de latence.
+
+La recherche compare des configurations (nombre d'arbres, max_samples,
+composantes PCA) à un modèle de référence construit avec les paramètres
+de config/model_config.yaml. Pour chaque configuration, on mesure le temps
+d'entraînement, la latence de scoring pour 1000 lignes et la stabilité des
+scores (corrélation de rang avec la référence).
+"""
+
+import itertools
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def rank_correlation(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Calcule la corrélation de Spearman entre deux vecteurs de scores.
+
+    Args:
+        a: Premier vecteur de scores
+        b: Second vecteur de scores
+
+    Returns:
+        Coefficient de corrélation de rang (entre -1 et 1)
+    """
+    ranks_a = pd.Series(a).rank().to_numpy()
+    ranks_b = pd.Series(b).rank().to_numpy()
+    if ranks_a.std() == 0 or ranks_b.std() == 0:
+        return 0.0
+    return float(np.corrcoef(ranks_a, ranks_b)[0, 1])
+
+
+class AutoTuner:
+    """
+    Recherche de la configuration la plus stable respectant un budget de latence.
+
+    Les candidats sont évalués du moins coûteux au plus coûteux tant que le
+    budget d'entraînement n'est pas épuisé. Parmi ceux qui respectent la
+    latence visée, on retient le plus rapide dont la stabilité atteint
+    min_rank_correlation (à défaut, le plus stable); si aucun ne respecte
+    la latence, on retient le plus rapide.
+    """
+
+    def __init__(self, detector, target_latency_ms: float = 50.0, train_budget_s: float = 300.0,
+                 n_estimators_grid: Sequence[int] = (50, 100, 200),
+                 max_samples_grid: Sequence[Any] = (128, 256, 512),
+                 pca_components_grid: Sequence[Optional[int]] = (None, 50, 100),
+                 eval_rows: int = 5000, timing_repeats: int = 3,
+                 min_rank_correlation: float = 0.95):
+        """
+        Initialise l'auto-tuner.
+
+        Args:
+            detector: HDFSDetector dont on règle les paramètres
+            target_latency_ms: Latence de scoring visée pour 1000 lignes
+            train_budget_s: Budget de temps total pour la recherche
+            n_estimators_grid: Nombres d'arbres à essayer
+            max_samples_grid: Valeurs de max_samples à essayer
+            pca_components_grid: Composantes PCA à essayer (None = pas de PCA)
+            eval_rows: Nombre de lignes utilisées pour mesurer latence et stabilité
+            timing_repeats: Nombre de mesures de latence (on garde la meilleure)
+            min_rank_correlation: Stabilité minimale pour préférer une configuration
+        """
+        self.detector = detector
+        self.target_latency_ms = float(target_latency_ms)
+        self.train_budget_s = float(train_budget_s)
+        self.n_estimators_grid = list(n_estimators_grid)
+        self.max_samples_grid = list(max_samples_grid)
+        self.pca_components_grid = list(pca_components_grid)
+        self.eval_rows = eval_rows
+        self.timing_repeats = timing_repeats
+        self.min_rank_correlation = min_rank_correlation
+
+    def _candidates(self, n_features: int) -> List[Dict[str, Any]]:
+        """Énumère les configurations, de la moins coûteuse à la plus coûteuse."""
+        pca_grid = []
+        for n_components in self.pca_components_grid:
+            # Une PCA qui ne réduit pas la dimension n'a pas d'intérêt
+            value = n_components if n_components and n_components < n_features else None
+            if value not in pca_grid:
+                pca_grid.append(value)
+
+        candidates = []
+        for n_estimators, max_samples, n_components in itertools.product(
+                sorted(self.n_estimators_grid), self.max_samples_grid, pca_grid):
+            params = dict(self.detector.params)
+            params.update({
+                'n_estimators': n_estimators,
+                'max_samples': max_samples,
+                'pca_components': n_components or 0,
+                'pca_threshold': 0 if n_components else params['pca_threshold'],
+            })
+            candidates.append(params)
+        return candidates
+
+    def _evaluate(self, train: pd.DataFrame, eval_data: pd.DataFrame,
+                  params: Dict[str, Any]) -> Dict[str, Any]:
+        """Entraîne une configuration et mesure son coût et ses scores."""
+        start = time.perf_counter()
+        scaler, pca, model = self.detector.fit_pipeline(train, params, verbose=False)
+        train_time = time.perf_counter() - start
+
+        timings = []
+        for _ in range(self.timing_repeats):
+            start = time.perf_counter()
+            scores = model.decision_function(self.detector.transform_features(eval_data, scaler, pca))
+            timings.append(time.perf_counter() - start)
+
+        latency_ms = min(timings) / len(eval_data) * 1000 * 1000
+        return {
+            'params': params,
+            'train_time_s': round(train_time, 3),
+            'latency_ms_per_1k': round(latency_ms, 3),
+            'rows_per_s': round(1000 / latency_ms * 1000, 1) if latency_ms > 0 else None,
+            'scores': scores,
+        }
+
+    def tune(self, data: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Lance la recherche sur des données préprocessées.
+
+        Args:
+            data: Données d'entraînement préprocessées
+
+        Returns:
+            Rapport contenant la configuration retenue et tous les essais
+        """
+        seed = self.detector.params['random_state']
+        eval_data = data.sample(n=min(self.eval_rows, len(data)), random_state=seed + 1)
+
+        self.detector._log(f"Auto-tuning: latence visée {self.target_latency_ms} ms/1k lignes, "
+                           f"budget {self.train_budget_s} s")
+        search_start = time.perf_counter()
+
+        reference = self._evaluate(data, eval_data, dict(self.detector.params))
+        self.detector._log(f"  Référence ({reference['params']['n_estimators']} arbres): "
+                           f"{reference['latency_ms_per_1k']} ms/1k lignes, "
+                           f"entraînement {reference['train_time_s']} s")
+
+        trials = []
+        for params in self._candidates(data.shape[1]):
+            elapsed = time.perf_counter() - search_start
+            if elapsed >= self.train_budget_s:
+                self.detector._log(f"  Budget d'entraînement épuisé après {len(trials)} essais")
+                break
+
+            trial = self._evaluate(data, eval_data, params)
+            trial['rank_correlation'] = round(rank_correlation(trial.pop('scores'), reference['scores']), 4)
+            trial['meets_latency'] = trial['latency_ms_per_1k'] <= self.target_latency_ms
+            trials.append(trial)
+            self.detector._log(f"  arbres={params['n_estimators']} max_samples={params['max_samples']} "
+                               f"pca={params['pca_components'] or '-'}: {trial['latency_ms_per_1k']} ms/1k, "
+                               f"corrélation={trial['rank_correlation']}")
+
+        reference.pop('scores')
+        chosen = self._choose(trials) if trials else reference
+
+        return {
+            'target_latency_ms': self.target_latency_ms,
+            'train_budget_s': self.train_budget_s,
+            'search_time_s': round(time.perf_counter() - search_start, 3),
+            'reference': reference,
+            'trials': trials,
+            'chosen_params': chosen['params'],
+            'chosen': {key: value for key, value in chosen.items() if key != 'params'},
+        }
+
+    def _choose(self, trials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Sélectionne le meilleur essai selon la latence puis la stabilité."""
+        within_budget = [t for t in trials if t['meets_latency']]
+        if not within_budget:
+            return min(trials, key=lambda t: t['latency_ms_per_1k'])
+
+        # Parmi les configurations assez stables, la plus rapide; sinon la plus stable
+        stable = [t for t in within_budget if t['rank_correlation'] >= self.min_rank_correlation]
+        if stable:
+            return min(stable, key=lambda t: t['latency_ms_per_1k'])
+        return max(within_budget, key=lambda t: (t['rank_correlation'], -t['latency_ms_per_1k']))
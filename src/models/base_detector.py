@@ -4,11 +4,17 @@ Définit l'interface commune pour tous les types de détecteurs.
 """
 
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
 from typing import Tuple, Optional, Dict, Any
 import pickle
+import hashlib
+import logging
 from pathlib import Path
 
+from .registry import ModelCache, read_model_file
+from utils.logger import DETECTOR_LOGGER
+
 
 class BaseAnomalyDetector(ABC):
     """
@@ -18,18 +24,40 @@ class BaseAnomalyDetector(ABC):
     tous les détecteurs spécialisés (HDFS, logs texte, etc.).
     """
 
-    def __init__(self, project_root: Optional[str] = None):
+    def __init__(self, project_root: Optional[str] = None, verbose: bool = True):
         """
         Initialise le détecteur de base.
 
         Args:
             project_root: Chemin racine du projet. Si None, utilise le répertoire courant.
+            verbose: Si False, le détecteur n'écrit rien sur la sortie standard
         """
         self.project_root = Path(project_root) if project_root else Path.cwd()
+        self.verbose = verbose
         self.model = None
         self.scaler = None
         self.feature_names = None
         self.is_trained = False
+        # Hash SHA-256 du fichier de modèle sauvegardé ou chargé (None si non sauvegardé)
+        self.model_hash = None
+
+    def _log(self, message: str):
+        """
+        Affiche un message de progression si le détecteur est en mode verbeux.
+
+        Le message passe par le logger des détecteurs (file d'attente, voir
+        utils.logger) si le logging est configuré, sinon il est affiché.
+
+        Args:
+            message: Message à afficher
+        """
+        if not self.verbose:
+            return
+        logger = logging.getLogger(DETECTOR_LOGGER)
+        if logger.hasHandlers():
+            logger.info(message, stacklevel=2)
+        else:
+            print(message)
 
     @abstractmethod
     def load_data(self, file_path: str) -> Tuple[pd.DataFrame, list]:
@@ -71,7 +99,7 @@ class BaseAnomalyDetector(ABC):
         pass
 
     @abstractmethod
-    def predict_anomalies(self, data: pd.DataFrame) -> Tuple[list, list]:
+    def predict_anomalies(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         """
         Prédit les anomalies dans les données.
 
@@ -79,7 +107,7 @@ class BaseAnomalyDetector(ABC):
             data: Données à analyser
 
         Returns:
-            Tuple contenant (prédictions, scores_d_anomalie)
+            Tuple de tableaux NumPy contenant (prédictions, scores_d_anomalie)
         """
         pass
 
@@ -94,7 +122,7 @@ class BaseAnomalyDetector(ABC):
             True si la sauvegarde s'est bien passée, False sinon
         """
         if not self.is_trained:
-            print("Erreur: Aucun modèle entraîné à sauvegarder")
+            self._log("Erreur: Aucun modèle entraîné à sauvegarder")
             return False
 
         if model_path is None:
@@ -107,39 +135,65 @@ class BaseAnomalyDetector(ABC):
                 'feature_names': self.feature_names,
                 'model_type': self.__class__.__name__
             }
+            model_data.update(self.get_model_state())
 
+            payload = pickle.dumps(model_data)
             with open(model_path, 'wb') as f:
-                pickle.dump(model_data, f)
+                f.write(payload)
+            self.model_hash = hashlib.sha256(payload).hexdigest()
 
-            print(f"Modèle sauvegardé: {model_path}")
+            self._log(f"Modèle sauvegardé: {model_path}")
             return True
 
         except Exception as e:
-            print(f"Erreur lors de la sauvegarde: {e}")
+            self._log(f"Erreur lors de la sauvegarde: {e}")
             return False
 
-    def load_model(self, model_path: str) -> bool:
+    def get_model_state(self) -> Dict[str, Any]:
+        """
+        Retourne l'état spécifique au détecteur à sauvegarder avec le modèle.
+
+        Returns:
+            Dictionnaire fusionné dans le fichier de modèle
+        """
+        return {}
+
+    def set_model_state(self, model_data: Dict[str, Any]):
+        """
+        Restaure l'état spécifique au détecteur depuis un fichier de modèle.
+
+        Args:
+            model_data: Contenu du fichier de modèle
+        """
+        pass
+
+    def load_model(self, model_path: str, cache: Optional[ModelCache] = None) -> bool:
         """
         Charge un modèle précédemment sauvegardé.
 
         Args:
             model_path: Chemin vers le fichier de modèle
+            cache: Cache de modèles du processus (évite de relire un modèle déjà chargé)
 
         Returns:
             True si le chargement s'est bien passé, False sinon
         """
         try:
-            with open(model_path, 'rb') as f:
-                model_data = pickle.load(f)
+            if cache is not None:
+                model_data, model_hash = cache.get(model_path)
+            else:
+                model_data, model_hash, _ = read_model_file(model_path)
 
             self.model = model_data['model']
             self.scaler = model_data['scaler']
             self.feature_names = model_data['feature_names']
+            self.set_model_state(model_data)
+            self.model_hash = model_hash
             self.is_trained = True
 
-            print(f"Modèle chargé: {model_path}")
+            self._log(f"Modèle chargé: {model_path}")
             return True
 
         except Exception as e:
-            print(f"Erreur lors du chargement: {e}")
+            self._log(f"Erreur lors du chargement: {e}")
             return False
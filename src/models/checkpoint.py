@@ -0,0 +1,173 @@
+"""
+Points de reprise de la détection par blocs.
+
+Pendant une détection longue, les blocs déjà scorés sont sauvegardés
+périodiquement dans un dossier de reprise: un fichier de parties par point
+de reprise (labels, scores, identifiants et lignes anormales des blocs
+traités depuis le précédent) et un fichier d'état (lignes traitées, position
+en octets de la ligne suivante, résumé de rapport, esquisse de dérive, taille
+valide du flux NDJSON). Une détection interrompue reprend à la première ligne
+non sauvegardée, lue directement à cette position, et produit les mêmes
+résultats qu'une exécution d'un seul tenant.
+"""
+
+import os
+import pickle
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+STATE_FILENAME = "state.pkl"
+
+
+def _dump(obj: Any, path: Path):
+    """Sérialise un objet avec pickle (écriture atomique, données sur disque)."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _load(path: Path) -> Any:
+    """Charge un objet sérialisé par _dump."""
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def source_signature(file_path, **settings) -> Dict[str, Any]:
+    """
+    Signature d'une détection: un point de reprise n'est valable que pour la même signature.
+
+    Args:
+        file_path: Fichier analysé
+        **settings: Paramètres influant sur le résultat (modèle, taille des blocs...)
+
+    Returns:
+        Dictionnaire comparable (chemin, taille et date du fichier, paramètres)
+    """
+    file_path = Path(file_path).resolve()
+    stat = file_path.stat()
+    return {'source': str(file_path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, **settings}
+
+
+class DetectionCheckpoint:
+    """
+    Dossier de reprise d'une détection par blocs.
+
+    Les blocs sont ajoutés avec add_block(); save() écrit ceux ajoutés depuis
+    le dernier point de reprise puis l'état, de façon atomique. Un arrêt
+    entre les deux laisse l'état précédent valide.
+    """
+
+    def __init__(self, directory, signature: Dict[str, Any], interval: float = 60.0):
+        """
+        Initialise le point de reprise (rien n'est lu ni écrit).
+
+        Args:
+            directory: Dossier de reprise
+            signature: Signature de la détection (voir source_signature)
+            interval: Secondes minimum entre deux sauvegardes
+        """
+        self.directory = Path(directory)
+        self.signature = signature
+        self.interval = float(interval)
+        self.n_parts = 0
+        self.rows_done = 0
+        self.byte_offset = None
+        self.report = None
+        self.sketch = None
+        self.stream_offset = None
+        self._pending: List[tuple] = []
+        self._next_save = time.monotonic() + self.interval
+
+    @property
+    def state_path(self) -> Path:
+        return self.directory / STATE_FILENAME
+
+    def part_path(self, index: int) -> Path:
+        return self.directory / f"part_{index:05d}.pkl"
+
+    def load(self) -> bool:
+        """
+        Charge l'état d'une détection interrompue.
+
+        Returns:
+            True si un point de reprise compatible existe, False sinon
+        """
+        if not self.state_path.exists():
+            return False
+        state = _load(self.state_path)
+        if state['signature'] != self.signature:
+            return False
+        self.n_parts = state['n_parts']
+        self.rows_done = state['rows_done']
+        self.byte_offset = state.get('byte_offset')
+        self.report = state['report']
+        self.sketch = state['sketch']
+        self.stream_offset = state['stream_offset']
+        return True
+
+    def blocks(self) -> List[tuple]:
+        """
+        Blocs sauvegardés, dans l'ordre du fichier.
+
+        Returns:
+            Liste de tuples (labels, scores, row_ids, positions, lignes anormales)
+        """
+        blocks = []
+        for index in range(self.n_parts):
+            blocks.extend(_load(self.part_path(index)))
+        return blocks
+
+    def add_block(self, labels, scores, row_ids, positions, anomalies):
+        """
+        Ajoute un bloc traité (sauvegardé au prochain save()).
+
+        Args:
+            labels: Labels du bloc
+            scores: Scores du bloc
+            row_ids: Identifiants des lignes du bloc
+            positions: Positions des anomalies dans le fichier
+            anomalies: Lignes anormales du bloc
+        """
+        self._pending.append((labels, scores, row_ids, positions, anomalies))
+
+    def due(self) -> bool:
+        """True si l'intervalle depuis la dernière sauvegarde est écoulé."""
+        return time.monotonic() >= self._next_save
+
+    def save(self, rows_done: int, report, sketch, stream_offset: Optional[int] = None,
+             byte_offset: Optional[int] = None):
+        """
+        Écrit un point de reprise.
+
+        Args:
+            rows_done: Nombre de lignes du fichier traitées
+            report: ReportSummary des lignes traitées
+            sketch: DriftSketch des lignes traitées
+            stream_offset: Taille valide du flux NDJSON (None si pas de flux)
+            byte_offset: Position en octets de la première ligne non traitée
+                (None pour un fichier compressé: reprise en sautant les lignes)
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._pending:
+            _dump(self._pending, self.part_path(self.n_parts))
+            self.n_parts += 1
+            self._pending = []
+        self.rows_done = rows_done
+        self.byte_offset = byte_offset
+        self.stream_offset = stream_offset
+        _dump({'signature': self.signature, 'n_parts': self.n_parts, 'rows_done': rows_done,
+               'byte_offset': byte_offset, 'report': report, 'sketch': sketch,
+               'stream_offset': stream_offset}, self.state_path)
+        self._next_save = time.monotonic() + self.interval
+
+    def clear(self):
+        """Supprime le dossier de reprise (détection terminée ou recommencée)."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.n_parts, self.rows_done, self.byte_offset = 0, 0, None
+        self.report, self.sketch, self.stream_offset = None, None, None
+        self._pending = []
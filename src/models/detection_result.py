@@ -0,0 +1,291 @@
+"""
+Résultat structuré d'une détection d'anomalies.
+
+Les résultats restent sous forme de tableaux NumPy (aucune conversion en
+listes Python); les résumés sont calculés à la demande puis mémorisés.
+"""
+
+import json
+import os
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .report_summary import ReportSummary
+
+
+def _to_python(value: Any) -> Any:
+    """Convertit un scalaire NumPy en type Python natif (sérialisable en JSON)."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class DetectionResult:
+    """
+    Résultat de la détection d'anomalies sur un ensemble de séquences.
+
+    Attributes:
+        labels: Prédictions par ligne (-1 = anomalie, 1 = normal)
+        scores: Scores decision_function par ligne (négatif = anormal)
+        row_ids: Identifiants des lignes (TaskID si disponible, sinon numéro de ligne)
+        threshold: Seuil appliqué aux scores (une ligne est anormale si score < threshold)
+        features: Données analysées (optionnel), utilisées pour expliquer les anomalies
+        feature_positions: Positions des lignes présentes dans features, si features ne
+            contient qu'une partie des lignes (détection par blocs: anomalies seulement)
+        source: Fichier analysé (optionnel)
+        model_info: Informations sur le modèle utilisé
+        report: Résumé pré-agrégé construit pendant la détection (histogramme des
+            scores, totaux par événement des anomalies), voir ReportSummary
+        sketch: Esquisse des scores et fréquences d'événements de la détection, voir DriftSketch
+        drift: Métriques de dérive par rapport à l'entraînement (None si indisponibles)
+    """
+
+    def __init__(self, labels: np.ndarray, scores: np.ndarray, row_ids: np.ndarray,
+                 threshold: float = 0.0, features: Optional[pd.DataFrame] = None,
+                 feature_positions: Optional[np.ndarray] = None,
+                 source: Optional[str] = None, model_info: Optional[Dict[str, Any]] = None,
+                 report: Optional[ReportSummary] = None, sketch=None,
+                 drift: Optional[Dict[str, Any]] = None):
+        self.labels = labels
+        self.scores = scores
+        self.row_ids = row_ids
+        self.threshold = threshold
+        self.features = features
+        self.feature_positions = feature_positions
+        self.source = source
+        self.model_info = model_info or {}
+        self.report = report
+        self.sketch = sketch
+        self.drift = drift
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __repr__(self) -> str:
+        return (f"DetectionResult(total={len(self)}, anomalies={self.n_anomalies}, "
+                f"threshold={self.threshold})")
+
+    @cached_property
+    def is_anomaly(self) -> np.ndarray:
+        """Masque booléen des lignes anormales."""
+        return self.labels == -1
+
+    @cached_property
+    def n_anomalies(self) -> int:
+        """Nombre d'anomalies détectées."""
+        return int(np.count_nonzero(self.is_anomaly))
+
+    @cached_property
+    def anomaly_rate(self) -> float:
+        """Pourcentage d'anomalies parmi les lignes analysées."""
+        return self.n_anomalies / len(self) * 100 if len(self) else 0.0
+
+    @cached_property
+    def anomaly_indices(self) -> np.ndarray:
+        """Positions des anomalies dans l'ordre des lignes."""
+        return np.flatnonzero(self.is_anomaly)
+
+    @cached_property
+    def ranked_anomaly_indices(self) -> np.ndarray:
+        """Positions des anomalies de la plus sévère (score le plus bas) à la moins sévère."""
+        indices = self.anomaly_indices
+        return indices[np.argsort(self.scores[indices], kind='stable')]
+
+    def _feature_rows(self, positions: np.ndarray) -> Optional[pd.DataFrame]:
+        """Retourne les lignes de features correspondant à des positions, si elles sont conservées."""
+        if self.features is None:
+            return None
+        if self.feature_positions is None:
+            return self.features.iloc[positions]
+        rows = np.searchsorted(self.feature_positions, positions)
+        rows = rows[rows < len(self.feature_positions)]
+        if len(rows) != len(positions) or not np.array_equal(self.feature_positions[rows], positions):
+            return None
+        return self.features.iloc[rows]
+
+    def top_events(self, position: int, n: int = 3) -> Dict[str, float]:
+        """
+        Retourne les événements les plus actifs d'une ligne.
+
+        Args:
+            position: Position de la ligne
+            n: Nombre d'événements à retourner
+
+        Returns:
+            Dictionnaire {événement: compteur} des n événements non nuls les plus fréquents
+        """
+        rows = self._feature_rows(np.array([position]))
+        if rows is None:
+            return {}
+        values = rows.iloc[0].to_numpy()
+        order = np.argsort(-values, kind='stable')[:n]
+        order = order[values[order] > 0]
+        return {self.features.columns[i]: _to_python(values[i]) for i in order}
+
+    def top_anomalies(self, k: int = 5, n_events: int = 3) -> List[Dict[str, Any]]:
+        """
+        Décrit les k anomalies les plus sévères.
+
+        Args:
+            k: Nombre d'anomalies
+            n_events: Nombre d'événements principaux par anomalie
+
+        Returns:
+            Liste de dictionnaires (index, task_id, score, top_events)
+        """
+        return [
+            {
+                'index': int(position),
+                'task_id': _to_python(self.row_ids[position]),
+                'score': float(self.scores[position]),
+                'top_events': self.top_events(position, n_events),
+            }
+            for position in self.ranked_anomaly_indices[:k]
+        ]
+
+    def anomaly_frame(self) -> pd.DataFrame:
+        """
+        Retourne les lignes anormales avec leur score, dans l'ordre des lignes.
+
+        Returns:
+            DataFrame des features des anomalies avec une colonne 'anomaly_score'
+        """
+        indices = self.anomaly_indices
+        rows = self._feature_rows(indices)
+        if rows is not None:
+            frame = rows.copy()
+        else:
+            frame = pd.DataFrame(index=self.row_ids[indices])
+        frame['anomaly_score'] = self.scores[indices]
+        return frame
+
+    def summary(self, k: int = 5, n_events: int = 3) -> Dict[str, Any]:
+        """
+        Résumé de la détection.
+
+        Args:
+            k: Nombre d'anomalies les plus sévères à inclure
+            n_events: Nombre d'événements principaux par anomalie
+
+        Returns:
+            Dictionnaire sérialisable en JSON
+        """
+        return {
+            'file_analyzed': str(self.source) if self.source else None,
+            'total_sequences': len(self),
+            'anomalies_count': self.n_anomalies,
+            'anomaly_rate': self.anomaly_rate,
+            'threshold': float(self.threshold),
+            'model_info': self.model_info,
+            'drift': self.drift,
+            'top_anomalies': self.top_anomalies(k, n_events),
+        }
+
+    def with_threshold(self, threshold: float) -> "DetectionResult":
+        """
+        Applique un autre seuil aux mêmes scores, sans rescorer.
+
+        Les features conservées restent utilisables pour les anomalies qui y
+        figurent (toutes en détection sur fichier entier, celles du seuil
+        d'origine en détection par blocs). Le résumé de rapport dépend du
+        seuil: il n'est pas recopié.
+
+        Args:
+            threshold: Nouveau seuil (score < seuil = anomalie)
+
+        Returns:
+            Nouveau DetectionResult
+        """
+        return DetectionResult(
+            labels=np.where(self.scores < threshold, -1, 1).astype(np.int8),
+            scores=self.scores,
+            row_ids=self.row_ids,
+            threshold=threshold,
+            features=self.features,
+            feature_positions=self.feature_positions,
+            source=self.source,
+            model_info=self.model_info,
+            sketch=self.sketch,
+            drift=self.drift
+        )
+
+    def threshold_for_top_k(self, k: int) -> float:
+        """
+        Seuil qui retient les k scores les plus bas (davantage en cas d'égalité).
+
+        Args:
+            k: Nombre d'anomalies voulu
+
+        Returns:
+            Seuil juste au-dessus du k-ième score
+        """
+        if k <= 0:
+            return -np.inf
+        if k >= len(self.scores):
+            return np.inf
+        kth = np.partition(self.scores, k - 1)[k - 1]
+        return float(np.nextafter(kth, np.inf))
+
+    def save_scores(self, path):
+        """
+        Sauvegarde les scores et identifiants de toutes les lignes (.npz, écriture atomique).
+
+        Les identifiants numériques sont écrits tels quels. Les identifiants texte
+        (TaskID) sont écrits en UTF-8 bout à bout avec leurs positions de fin: un
+        tableau unicode numpy réserverait la longueur du plus long pour chacun.
+
+        Args:
+            path: Chemin du fichier
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        row_ids = np.asarray(self.row_ids)
+        arrays = {}
+        if row_ids.dtype.kind in 'OUS':
+            encoded = [str(row_id).encode('utf-8') for row_id in row_ids.tolist()]
+            arrays['row_ids_bytes'] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            arrays['row_ids_ends'] = np.cumsum([len(value) for value in encoded], dtype=np.int64)
+        else:
+            arrays['row_ids'] = row_ids
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, scores=self.scores, threshold=self.threshold,
+                 model_info=json.dumps(self.model_info, default=str),
+                 source=str(self.source) if self.source else "", **arrays)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _load_row_ids(data) -> np.ndarray:
+        """Identifiants écrits par save_scores (texte: tableau object de str)."""
+        if 'row_ids_bytes' not in data:
+            return data['row_ids']
+        buffer = data['row_ids_bytes'].tobytes()
+        ends = data['row_ids_ends'].tolist()
+        starts = [0] + ends[:-1]
+        row_ids = np.empty(len(ends), dtype=object)
+        row_ids[:] = [buffer[start:end].decode('utf-8') for start, end in zip(starts, ends)]
+        return row_ids
+
+    @classmethod
+    def load_scores(cls, path) -> "DetectionResult":
+        """
+        Recharge un résultat sauvegardé par save_scores (sans features).
+
+        Args:
+            path: Chemin du fichier
+
+        Returns:
+            DetectionResult au seuil de la détection d'origine
+        """
+        with np.load(path) as data:
+            scores = data['scores']
+            threshold = float(data['threshold'])
+            return cls(
+                labels=np.where(scores < threshold, -1, 1).astype(np.int8),
+                scores=scores,
+                row_ids=cls._load_row_ids(data),
+                threshold=threshold,
+                source=str(data['source']) or None,
+                model_info=json.loads(str(data['model_info']))
+            )
@@ -0,0 +1,238 @@
+"""
+Compaction d'un Isolation Forest entraîné en une forêt plus petite.
+
+Le score d'un Isolation Forest ne dépend que de la profondeur moyenne des
+lignes sur ses arbres. Les arbres sont ajoutés un à un (sélection gloutonne)
+en choisissant à chaque étape celui qui rapproche le plus la profondeur
+moyenne de la sous-forêt de celle de la forêt complète. On garde le plus
+petit nombre d'arbres dont le classement des lignes reste fidèle à la forêt
+complète: corrélation de rang et recouvrement des top-K anomalies, vérifiés
+sur le tiers de sélection et sur un tiers de validation. La concordance
+rapportée est mesurée sur le dernier tiers, qui ne sert ni à ordonner les
+arbres ni à choisir leur nombre. Les lignes évaluées sont tirées de
+l'échantillon d'entraînement avec leurs répétitions, pour que chaque vecteur
+pèse selon sa fréquence; les profondeurs ne sont calculées qu'une fois par
+vecteur unique.
+"""
+
+import copy
+import time
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .auto_tuner import rank_correlation
+from .forest_utils import subset_forest, tree_path_lengths
+from utils.vectors import unique_rows
+
+# Valeurs utilisées si la section hdfs.distillation de model_config.yaml est absente
+DEFAULT_DISTILLATION_SETTINGS = {
+    'enabled': True,
+    'min_rank_correlation': 0.99,
+    'min_topk_overlap': 0.9,
+    'top_k': None,
+    'eval_rows': 10000,
+    'min_trees': 10,
+    'name_suffix': '-compact',
+    'timing_repeats': 3,
+}
+
+# Taille minimale du top-K comparé quand top_k n'est pas fixé (un top trop court est trop bruité)
+MIN_TOP_K = 50
+
+
+def topk_overlap(reference: np.ndarray, candidate: np.ndarray, k: int) -> float:
+    """
+    Part des k lignes les plus anormales du candidat qui le sont aussi pour la référence.
+
+    Une ligne à égalité avec la k-ième de la référence compte comme retrouvée:
+    les lignes identiques (fréquentes dans les traces) ont la même valeur et
+    leur ordre entre elles est arbitraire.
+
+    Args:
+        reference: Scores ou profondeurs de référence (plus bas = plus anormal)
+        candidate: Scores ou profondeurs comparés
+        k: Nombre de lignes comparées
+
+    Returns:
+        Recouvrement entre 0 et 1
+    """
+    k = max(1, min(int(k), len(reference)))
+    cutoff = np.partition(reference, k - 1)[k - 1]
+    top_candidate = np.argpartition(candidate, k - 1)[:k]
+    return float(np.mean(reference[top_candidate] <= cutoff))
+
+
+def _correlations(sums: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Corrélation de Pearson de chaque ligne de sums avec target."""
+    centered = sums - sums.mean(axis=1, keepdims=True)
+    target = target - target.mean()
+    norms = np.linalg.norm(centered, axis=1) * np.linalg.norm(target)
+    return np.divide(centered @ target, norms, out=np.zeros(len(sums)), where=norms > 0)
+
+
+def greedy_tree_order(depths: np.ndarray) -> np.ndarray:
+    """
+    Ordonne les arbres pour que chaque préfixe approche au mieux la forêt complète.
+
+    Args:
+        depths: Profondeurs (arbres × lignes), voir tree_path_lengths
+
+    Returns:
+        Numéros des arbres dans l'ordre de sélection
+    """
+    target = depths.mean(axis=0)
+    remaining = np.arange(len(depths))
+    order = []
+    total = np.zeros(depths.shape[1])
+    while len(remaining):
+        best = int(np.argmax(_correlations(total + depths[remaining], target)))
+        order.append(int(remaining[best]))
+        total += depths[remaining[best]]
+        remaining = np.delete(remaining, best)
+    return np.array(order)
+
+
+def _best_time(score, repeats: int) -> float:
+    """Meilleur temps (secondes) de plusieurs exécutions d'une fonction sans argument."""
+    best = None
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter()
+        score()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class ForestDistiller:
+    """
+    Sélection du plus petit sous-ensemble d'arbres fidèle au classement de la forêt complète.
+    """
+
+    def __init__(self, detector, **settings):
+        """
+        Initialise la compaction d'un détecteur entraîné.
+
+        Args:
+            detector: HDFSDetector entraîné (Isolation Forest)
+            **settings: Réglages (voir DEFAULT_DISTILLATION_SETTINGS)
+        """
+        self.detector = detector
+        self.settings = dict(DEFAULT_DISTILLATION_SETTINGS)
+        self.settings.update(settings)
+
+    def _agreement(self, reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+        """
+        Corrélation de rang et recouvrement des top-K entre deux vecteurs de profondeurs ou scores.
+
+        La comparaison n'est vérifiable ('verified') que si le top-K ne couvre
+        pas plus de la moitié des lignes: au-delà, le recouvrement vaut 1 quel
+        que soit le candidat.
+        """
+        top_k = self.settings['top_k'] or max(MIN_TOP_K, int(round(self.detector.contamination * len(reference))))
+        return {
+            'rank_correlation': rank_correlation(reference, candidate),
+            'topk_overlap': topk_overlap(reference, candidate, top_k),
+            'top_k': int(top_k),
+            'verified': len(reference) >= 2 * top_k,
+        }
+
+    def _meets(self, agreement: Dict[str, float]) -> bool:
+        return (agreement['verified']
+                and agreement['rank_correlation'] >= self.settings['min_rank_correlation']
+                and agreement['topk_overlap'] >= self.settings['min_topk_overlap'])
+
+    def distill(self, data: pd.DataFrame) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Construit le détecteur compact.
+
+        Args:
+            data: Données d'entraînement préprocessées, colonnes de feature_names
+                (calibrent aussi le seuil et les références du modèle compact)
+
+        Returns:
+            Tuple contenant (détecteur compact, rapport de compaction)
+        """
+        detector = self.detector
+        forest = detector.model
+        n_trees = len(forest.estimators_)
+        random_state = detector.params['random_state']
+
+        sample = data[detector.feature_names]
+        if len(sample) > detector.params['max_training_samples']:
+            sample = sample.sample(n=detector.params['max_training_samples'], random_state=random_state)
+        # Lignes tirées avec leurs répétitions: chaque vecteur pèse selon sa fréquence
+        evaluation = sample
+        if len(evaluation) > self.settings['eval_rows']:
+            evaluation = evaluation.sample(n=self.settings['eval_rows'], random_state=random_state)
+
+        # Tiers de sélection (ordre des arbres), de validation (arrêt) et tenu à l'écart (rapport)
+        X_eval = detector.transform_features(detector.model_input(evaluation.to_numpy(dtype=detector.dtype)))
+        permutation = np.random.default_rng(random_state).permutation(len(X_eval))
+        select_rows, validation_rows, holdout_rows = np.array_split(permutation, 3)
+        first_indices, inverse, _ = unique_rows(X_eval)
+        depths = tree_path_lengths(forest, X_eval[first_indices])[:, inverse]
+        select, validation = depths[:, select_rows], depths[:, validation_rows]
+        full_select, full_validation = select.mean(axis=0), validation.mean(axis=0)
+
+        order = greedy_tree_order(select)
+        n_kept = n_trees
+        select_sums, validation_sums = np.zeros(select.shape[1]), np.zeros(validation.shape[1])
+        for size, tree in enumerate(order, 1):
+            select_sums += select[tree]
+            validation_sums += validation[tree]
+            if size < min(self.settings['min_trees'], n_trees):
+                continue
+            if (self._meets(self._agreement(full_select, select_sums / size))
+                    and self._meets(self._agreement(full_validation, validation_sums / size))):
+                n_kept = size
+                break
+        kept = np.sort(order[:n_kept])
+
+        compact = copy.copy(detector)
+        compact.model = subset_forest(forest, kept)
+        compact.params = dict(detector.params, n_estimators=int(n_kept))
+        compact.model_name = detector.model_name + self.settings['name_suffix']
+        compact.model_version = detector.model_version
+        compact.model_hash = None
+        compact.loaded_version = None
+        compact.threshold = 0.0
+
+        # Seuil et références recalculés avec la forêt compacte
+        X_sample = detector.transform_features(detector.model_input(sample.to_numpy(dtype=detector.dtype)))
+        compact.model.offset_ = float(np.percentile(compact.model.score_samples(X_sample),
+                                                    100.0 * detector.contamination))
+        compact.set_training_reference(sample, compact.model.decision_function(X_sample))
+
+        X_holdout = X_eval[holdout_rows]
+        full_scores = forest.decision_function(X_holdout)
+        compact_scores = compact.model.decision_function(X_holdout)
+        agreement = self._agreement(full_scores, compact_scores)
+        full_time = _best_time(lambda: forest.decision_function(X_eval), self.settings['timing_repeats'])
+        compact_time = _best_time(lambda: compact.model.decision_function(X_eval),
+                                  self.settings['timing_repeats'])
+        # Labels comme en détection: chaque modèle à son propre seuil
+        full_labels = full_scores < detector.threshold
+        compact_labels = compact_scores < compact.threshold
+
+        report = {
+            'n_estimators': n_trees,
+            'n_kept': int(n_kept),
+            'kept_trees': kept.tolist(),
+            'tolerances_met': self._meets(agreement),
+            'verified': agreement['verified'],
+            'min_rank_correlation': self.settings['min_rank_correlation'],
+            'min_topk_overlap': self.settings['min_topk_overlap'],
+            'eval_rows': int(len(X_eval)),
+            'holdout_rows': int(len(holdout_rows)),
+            'rank_correlation': agreement['rank_correlation'],
+            'topk_overlap': agreement['topk_overlap'],
+            'top_k': agreement['top_k'],
+            'label_agreement': float(np.mean(full_labels == compact_labels)),
+            'full_latency_ms_per_1000': full_time / len(X_eval) * 1000 * 1000,
+            'compact_latency_ms_per_1000': compact_time / len(X_eval) * 1000 * 1000,
+            'speedup': full_time / compact_time if compact_time > 0 else None,
+        }
+        compact.distillation_report = report
+        return compact, report
@@ -0,0 +1,402 @@
+"""
+Entraînement distribué de l'Isolation Forest par shards.
+
+Une trace trop volumineuse est découpée en shards. Chaque shard est traité
+indépendamment (processus local ou autre machine partageant le dossier de
+travail), en deux phases:
+
+1. Statistiques: moments des features et échantillon uniforme du shard.
+2. Sous-forêt: entraînement d'une partie des arbres avec la normalisation
+   (et la PCA) communes calculées à partir des statistiques fusionnées.
+
+La fusion réunit les arbres dans un seul modèle HDFSDetector et recalcule
+le seuil de contamination sur l'échantillon fusionné. Toutes les étapes
+communiquent par fichiers dans le dossier de travail (écritures atomiques).
+"""
+
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA
+from sklearn.preprocessing import StandardScaler
+
+from .forest_utils import merge_forests
+from utils.compression import open_compressed
+from utils.sampling import BottomKSample
+from utils.vectors import unique_rows
+
+MANIFEST_FILENAME = "manifest.json"
+PREPROCESS_FILENAME = "preprocess.pkl"
+
+# Valeur de max_samples='auto' dans scikit-learn
+_AUTO_MAX_SAMPLES = 256
+
+
+class FeatureMoments:
+    """
+    Moyenne et somme des carrés des écarts par feature, fusionnables.
+
+    Les blocs et les shards sont combinés avec la formule de Chan et al.,
+    numériquement stable, sans relire les données.
+    """
+
+    def __init__(self, n_features: int):
+        self.n = 0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+
+    def _combine(self, n: int, mean: np.ndarray, m2: np.ndarray):
+        """Ajoute les moments (n, moyenne, M2) d'un autre ensemble de lignes."""
+        if n == 0:
+            return
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (n / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * (self.n * n / total)
+        self.n = total
+
+    def update(self, X: np.ndarray):
+        """
+        Ajoute un bloc de lignes.
+
+        Args:
+            X: Matrice (lignes × features)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if len(X) == 0:
+            return
+        mean = X.mean(axis=0)
+        self._combine(len(X), mean, ((X - mean) ** 2).sum(axis=0))
+
+    def merge(self, other: "FeatureMoments"):
+        """
+        Fusionne les moments d'un autre shard.
+
+        Args:
+            other: Moments calculés sur les mêmes features
+        """
+        self._combine(other.n, other.mean, other.m2)
+
+    @property
+    def var(self) -> np.ndarray:
+        """Variance de population (comme StandardScaler)."""
+        return self.m2 / self.n if self.n else np.zeros_like(self.m2)
+
+    def to_scaler(self) -> StandardScaler:
+        """
+        Construit un StandardScaler équivalent à un ajustement sur toutes les lignes.
+
+        Returns:
+            Scaler prêt pour transform
+        """
+        scaler = StandardScaler()
+        var = self.var
+        scale = np.sqrt(var)
+        # Features constantes: pas de mise à l'échelle (même règle que scikit-learn)
+        scale[var < 10 * np.finfo(np.float64).eps] = 1.0
+        scaler.mean_ = self.mean.copy()
+        scaler.var_ = var
+        scaler.scale_ = scale
+        scaler.n_samples_seen_ = self.n
+        scaler.n_features_in_ = len(self.mean)
+        return scaler
+
+
+def _dump(obj: Any, path: Path):
+    """Écrit un pickle de façon atomique (les autres processus ne voient jamais un fichier partiel)."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(obj, f)
+    os.replace(tmp_path, path)
+
+
+def _load(path: Path) -> Any:
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class ShardedTrainer:
+    """
+    Coordonne l'entraînement par shards à travers un dossier de travail partagé.
+
+    Le détecteur fournit la lecture des fichiers, les hyperparamètres
+    (model_config.yaml) et la sauvegarde du modèle fusionné.
+    """
+
+    def __init__(self, detector, work_dir: str):
+        """
+        Initialise le coordinateur.
+
+        Args:
+            detector: Instance de HDFSDetector
+            work_dir: Dossier partagé (shards, statistiques, sous-forêts)
+        """
+        self.detector = detector
+        self.work_dir = Path(work_dir)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        """Description des shards écrite par split()."""
+        with open(self.work_dir / MANIFEST_FILENAME) as f:
+            return json.load(f)
+
+    def shard_path(self, index: int) -> Path:
+        return self.work_dir / self.manifest['shards'][index]
+
+    def stats_path(self, index: int) -> Path:
+        return self.work_dir / f"stats_{index:04d}.pkl"
+
+    def forest_path(self, index: int) -> Path:
+        return self.work_dir / f"forest_{index:04d}.pkl"
+
+    def plan_workers(self, requested: Optional[int] = None) -> int:
+        """
+        Nombre de processus locaux tenant ensemble dans le budget mémoire.
+
+        Un processus de la phase 2 charge un shard entier (le plus gros shard
+        du manifeste sert d'estimation).
+
+        Args:
+            requested: Nombre de processus demandé (None = nombre de CPU)
+
+        Returns:
+            Nombre de processus retenu
+        """
+        planner = self.detector.memory_planner
+        manifest = self.manifest
+        columns = pd.read_csv(self.work_dir / manifest['shards'][0], encoding='latin-1', nrows=0).columns
+        row_mb = planner.row_bytes(len(self.detector._feature_columns(columns)),
+                                   self.detector.dtype.itemsize) / (1024 * 1024)
+        per_worker_mb = max(manifest['rows']) * row_mb * planner.factor
+        workers = planner.plan_workers(per_worker_mb, requested)
+        self.detector._log(f"Plan mémoire (shards): {workers} processus de ~{per_worker_mb:.0f} MB "
+                           f"pour un budget de {planner.budget_mb():.0f} MB")
+        return workers
+
+    def _chunksize(self) -> int:
+        return self.detector.chunksize or self.detector.params['max_training_samples']
+
+    def _missing(self, paths: List[Path]) -> List[str]:
+        return [path.name for path in paths if not path.exists()]
+
+    def split(self, file_path: str, n_shards: int) -> List[Path]:
+        """
+        Découpe une trace CSV en shards (lignes distribuées à tour de rôle).
+
+        Chaque shard conserve l'en-tête: c'est un fichier CSV autonome (non compressé,
+        même si la trace l'est).
+
+        Args:
+            file_path: Chemin de la trace
+            n_shards: Nombre de shards
+
+        Returns:
+            Chemins des shards
+        """
+        if n_shards < 1:
+            raise ValueError("Le nombre de shards doit être au moins 1")
+
+        shard_dir = self.work_dir / "shards"
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        names = [f"shards/shard_{i:04d}.csv" for i in range(n_shards)]
+        outputs = [open(self.work_dir / name, "wb") for name in names]
+        rows = [0] * n_shards
+        try:
+            with open_compressed(file_path, self.detector.decompress_threads,
+                                 self.detector.external_decompressors) as f:
+                header = f.readline()
+                for output in outputs:
+                    output.write(header)
+                for line_number, line in enumerate(f):
+                    shard = line_number % n_shards
+                    outputs[shard].write(line)
+                    rows[shard] += 1
+        finally:
+            for output in outputs:
+                output.close()
+
+        manifest = {'source': str(file_path), 'n_shards': n_shards, 'shards': names, 'rows': rows}
+        with open(self.work_dir / MANIFEST_FILENAME, "w") as f:
+            json.dump(manifest, f, indent=2)
+        self.detector._log(f"Trace découpée en {n_shards} shards ({sum(rows)} lignes)")
+        return [self.work_dir / name for name in names]
+
+    def compute_shard_stats(self, index: int) -> Path:
+        """
+        Phase 1: moments et échantillon uniforme d'un shard, lu par blocs.
+
+        Args:
+            index: Numéro du shard
+
+        Returns:
+            Chemin du fichier de statistiques
+        """
+        params = self.detector.params
+        moments, feature_names = None, None
+        sample = BottomKSample(params['max_training_samples'], params['random_state'] + index)
+        progress = self.detector.progress(f"Shard {index}", self.manifest['rows'][index])
+        for chunk in self.detector.iter_chunks(self.shard_path(index), self._chunksize()):
+            if moments is None:
+                feature_names = list(chunk.columns)
+                moments = FeatureMoments(len(feature_names))
+            X = chunk.fillna(0).to_numpy(dtype=self.detector.dtype)
+            moments.update(X)
+            sample.add(X)
+            progress.update(len(X))
+
+        if moments is None:
+            raise ValueError(f"Shard {index} vide")
+
+        path = self.stats_path(index)
+        _dump({'feature_names': feature_names, 'moments': moments, 'sample': sample}, path)
+        self.detector._log(f"Statistiques du shard {index}: {moments.n} lignes")
+        return path
+
+    def _merged_stats(self):
+        """Fusionne les statistiques de tous les shards: (features, moments, échantillon)."""
+        n_shards = self.manifest['n_shards']
+        missing = self._missing([self.stats_path(i) for i in range(n_shards)])
+        if missing:
+            raise FileNotFoundError(f"Statistiques manquantes: {', '.join(missing)}")
+
+        feature_names, moments, sample, shard_rows = None, None, None, []
+        for i in range(n_shards):
+            stats = _load(self.stats_path(i))
+            if feature_names is None:
+                feature_names, moments, sample = stats['feature_names'], stats['moments'], stats['sample']
+            else:
+                if stats['feature_names'] != feature_names:
+                    raise ValueError(f"Shard {i}: colonnes différentes des autres shards")
+                moments.merge(stats['moments'])
+                sample.merge(stats['sample'])
+            shard_rows.append(stats['moments'].n)
+        return feature_names, moments, sample, shard_rows
+
+    def prepare(self) -> Path:
+        """
+        Calcule la normalisation et la PCA communes à partir des statistiques fusionnées.
+
+        Le max_samples des sous-forêts est fixé ici pour que tous les arbres
+        soient comparables (la profondeur d'isolement est normalisée par lui).
+
+        Returns:
+            Chemin du fichier de préprocessing partagé
+        """
+        params = self.detector.params
+        feature_names, moments, sample, shard_rows = self._merged_stats()
+        scaler = moments.to_scaler()
+        X_sample = scaler.transform(sample.values)
+
+        pca = None
+        n_components = params['pca_components']
+        if n_components and X_sample.shape[1] > params['pca_threshold'] and X_sample.shape[1] > n_components:
+            self.detector._log(f"Réduction de dimensionnalité: {X_sample.shape[1]} -> {n_components} dimensions")
+            pca = PCA(n_components=n_components, random_state=params['random_state']).fit(X_sample)
+
+        max_samples = params['max_samples']
+        if max_samples == 'auto':
+            max_samples = _AUTO_MAX_SAMPLES
+        elif isinstance(max_samples, float):
+            max_samples = int(max_samples * min(shard_rows))
+        max_samples = max(1, min(int(max_samples), min(shard_rows)))
+
+        path = self.work_dir / PREPROCESS_FILENAME
+        _dump({'feature_names': feature_names, 'scaler': scaler, 'pca': pca,
+               'max_samples': max_samples, 'n_rows': moments.n}, path)
+        self.detector._log(f"Préprocessing commun: {moments.n} lignes, max_samples={max_samples}")
+        return path
+
+    def fit_shard(self, index: int) -> Path:
+        """
+        Phase 2: entraîne la sous-forêt d'un shard.
+
+        Les n_estimators arbres sont répartis exactement entre les shards
+        (n_estimators // n_shards chacun, un de plus pour les premiers); chaque
+        shard les entraîne avec sa propre graine, sur les données normalisées
+        par le préprocessing commun.
+
+        Args:
+            index: Numéro du shard
+
+        Returns:
+            Chemin du fichier de la sous-forêt
+        """
+        detector = self.detector
+        params = detector.params
+        preprocess = _load(self.work_dir / PREPROCESS_FILENAME)
+        n_shards = self.manifest['n_shards']
+        n_trees = params['n_estimators'] // n_shards + (index < params['n_estimators'] % n_shards)
+        if n_trees == 0:
+            raise ValueError(f"n_estimators ({params['n_estimators']}) inférieur au nombre de shards ({n_shards})")
+
+        data, _ = detector.load_data(self.shard_path(index))
+        if data is None:
+            raise ValueError(f"Shard {index} illisible")
+        detector.feature_names = preprocess['feature_names']
+        X = detector.align_features(detector.preprocess_data(data))
+
+        rng = np.random.default_rng(params['random_state'] + index)
+        if len(X) > params['max_training_samples']:
+            X = X[rng.choice(len(X), params['max_training_samples'], replace=False)]
+
+        counts = None
+        if params.get('train_on_unique_rows'):
+            first_indices, _, unique_counts = unique_rows(X)
+            # Trop peu de vecteurs distincts pour max_samples: on garde toutes les lignes
+            if len(first_indices) >= preprocess['max_samples']:
+                X, counts = X[first_indices], unique_counts
+
+        X_scaled = detector.transform_features(X, preprocess['scaler'], preprocess['pca'])
+        shard_params = dict(params,
+                            n_estimators=n_trees,
+                            max_samples=preprocess['max_samples'],
+                            random_state=params['random_state'] + index)
+        forest = detector.fit_forest(X_scaled, shard_params, counts, verbose=False)
+
+        path = self.forest_path(index)
+        _dump(forest, path)
+        detector._log(f"Sous-forêt du shard {index}: {forest.n_estimators} arbres sur {len(X)} lignes")
+        return path
+
+    def merge(self) -> bool:
+        """
+        Fusionne les sous-forêts dans le détecteur et enregistre le modèle dans le registre.
+
+        Le seuil est recalculé avec la forêt fusionnée sur l'échantillon
+        uniforme fusionné de toute la trace.
+
+        Returns:
+            True si la fusion et l'enregistrement se sont bien passés
+        """
+        detector = self.detector
+        n_shards = self.manifest['n_shards']
+        missing = self._missing([self.forest_path(i) for i in range(n_shards)])
+        if missing:
+            raise FileNotFoundError(f"Sous-forêts manquantes: {', '.join(missing)}")
+
+        preprocess = _load(self.work_dir / PREPROCESS_FILENAME)
+        _, _, sample, _ = self._merged_stats()
+        model = merge_forests([_load(self.forest_path(i)) for i in range(n_shards)])
+        model.contamination = detector.contamination
+
+        X_sample = detector.transform_features(sample.values, preprocess['scaler'], preprocess['pca'])
+        model.offset_ = float(np.percentile(model.score_samples(X_sample), 100.0 * detector.contamination))
+
+        detector.scaler, detector.pca, detector.model = preprocess['scaler'], preprocess['pca'], model
+        # Paramètres réellement utilisés par la forêt fusionnée (sauvegardés et affichés par model_info)
+        detector.params = dict(detector.params, n_estimators=model.n_estimators,
+                               max_samples=preprocess['max_samples'])
+        detector.feature_names = preprocess['feature_names']
+        detector.set_training_reference(pd.DataFrame(sample.values, columns=detector.feature_names),
+                                      model.decision_function(X_sample))
+        detector.model_hash = None
+        detector.is_trained = True
+        detector._log(f"Modèle fusionné: {model.n_estimators} arbres de {n_shards} shards, "
+                      f"seuil calculé sur {len(sample)} lignes")
+        return detector.publish_model(self.manifest['source'], preprocess['n_rows'])
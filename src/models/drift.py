@@ -0,0 +1,212 @@
+"""
+Esquisses de distribution à mémoire constante pour la surveillance de dérive.
+
+Une DriftSketch résume un flux de scores et de compteurs d'événements:
+histogramme des scores à pas fixe (ScoreHistogram, le pas double si le
+nombre de classes dépasse max_bins) et, par événement, le nombre de lignes où il apparaît et
+son total. Sa taille ne dépend pas du nombre de lignes, et deux esquisses se
+fusionnent en additionnant leurs compteurs.
+
+Une esquisse de référence est calculée à l'entraînement et sauvegardée avec
+le modèle; chaque détection construit la sienne et les compare (distance de
+Kolmogorov-Smirnov, PSI) sans jamais conserver les scores bruts.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .score_histogram import DEFAULT_BIN_WIDTH, ScoreHistogram
+
+# Nombre maximal de classes de l'histogramme des scores
+DEFAULT_MAX_BINS = 2048
+
+# Seuils au-delà desquels un réentraînement est recommandé (model_config.yaml, section drift)
+DEFAULT_DRIFT_SETTINGS = {'ks_threshold': 0.1, 'psi_threshold': 0.2, 'psi_buckets': 10,
+                          'max_bins': DEFAULT_MAX_BINS, 'top_events': 10}
+
+# Proportion plancher des classes vides dans le calcul du PSI
+_PSI_EPSILON = 1e-4
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """
+    Population Stability Index entre deux distributions discrètes.
+
+    Args:
+        expected: Effectifs de référence par classe
+        actual: Effectifs observés par classe
+
+    Returns:
+        Somme de (p - q) · ln(p / q) sur les classes (0 = distributions identiques)
+    """
+    p = np.asarray(actual, dtype=np.float64)
+    q = np.asarray(expected, dtype=np.float64)
+    if p.sum() == 0 or q.sum() == 0:
+        return float('nan')
+    p = np.maximum(p / p.sum(), _PSI_EPSILON)
+    q = np.maximum(q / q.sum(), _PSI_EPSILON)
+    return float(np.sum((p - q) * np.log(p / q)))
+
+
+class DriftSketch:
+    """
+    Histogramme des scores et fréquences des événements, fusionnable, à mémoire constante.
+
+    Les classes des scores sont [k·pas, (k+1)·pas[; quand le pas double, les
+    classes 2k et 2k+1 fusionnent. Deux esquisses de pas différents (même pas
+    initial) sont ramenées au plus grand avant d'être comparées ou fusionnées.
+    """
+
+    def __init__(self, feature_names: Optional[Sequence[str]] = None,
+                 bin_width: float = DEFAULT_BIN_WIDTH, max_bins: int = DEFAULT_MAX_BINS):
+        """
+        Initialise une esquisse vide.
+
+        Args:
+            feature_names: Événements suivis (None = scores seulement)
+            bin_width: Pas initial de l'histogramme des scores
+            max_bins: Nombre maximal de classes avant de doubler le pas
+        """
+        self.scores = ScoreHistogram(bin_width, max_bins)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        n_features = len(self.feature_names) if self.feature_names is not None else 0
+        self.event_rows = np.zeros(n_features, dtype=np.int64)
+        self.event_sums = np.zeros(n_features, dtype=np.float64)
+
+    @property
+    def n_rows(self) -> int:
+        return self.scores.n_rows
+
+    def update(self, scores: np.ndarray, features: Optional[pd.DataFrame] = None):
+        """
+        Ajoute les scores d'un bloc et, si fournis, ses compteurs d'événements.
+
+        Args:
+            scores: Scores du bloc
+            features: Compteurs d'événements du bloc (colonnes associées par nom à
+                feature_names; les colonnes inconnues sont ignorées)
+        """
+        self.scores.update(scores)
+
+        if features is not None and self.feature_names is not None and len(features):
+            values = features.to_numpy()
+            rows = pd.Series(np.count_nonzero(values, axis=0), index=features.columns)
+            sums = pd.Series(values.sum(axis=0, dtype=np.float64), index=features.columns)
+            self.event_rows += rows.reindex(self.feature_names, fill_value=0).to_numpy(dtype=np.int64)
+            self.event_sums += sums.reindex(self.feature_names, fill_value=0).to_numpy(dtype=np.float64)
+
+    def merge(self, other: "DriftSketch") -> "DriftSketch":
+        """
+        Fusionne une autre esquisse (autre bloc, shard ou fichier).
+
+        Args:
+            other: Esquisse de mêmes événements
+
+        Returns:
+            L'esquisse fusionnée
+        """
+        if self.feature_names != other.feature_names:
+            raise ValueError("Esquisses incompatibles: événements différents")
+        self.scores.merge(other.scores)
+        self.event_rows += other.event_rows
+        self.event_sums += other.event_sums
+        return self
+
+    def support(self) -> np.ndarray:
+        """Proportion des lignes où chaque événement apparaît."""
+        return self.event_rows / self.n_rows if self.n_rows else np.zeros(len(self.event_rows))
+
+    def compare(self, reference: "DriftSketch", psi_buckets: int = 10,
+                top_events: int = 10) -> Dict[str, Any]:
+        """
+        Mesure la dérive par rapport à une esquisse de référence.
+
+        Args:
+            reference: Esquisse calculée à l'entraînement
+            psi_buckets: Nombre de classes du PSI (quantiles de la référence)
+            top_events: Nombre d'événements les plus déplacés à lister
+
+        Returns:
+            Dictionnaire sérialisable: ks, psi des scores, psi des événements,
+            quantiles comparés et événements dont la fréquence a le plus changé
+        """
+        if not self.n_rows or not reference.n_rows:
+            return {'n_rows': self.n_rows, 'reference_rows': reference.n_rows, 'ks': None, 'score_psi': None}
+
+        width = max(self.scores.bin_width, reference.scores.bin_width)
+        current, ref = self.scores.coarsened(width), reference.scores.coarsened(width)
+
+        # KS: écart maximal des fonctions de répartition, évalué aux bornes des classes
+        keys = np.array(sorted(set(current.bins) | set(ref.bins)), dtype=np.int64)
+        edges = np.unique(np.concatenate([keys, keys + 1])) * width
+        ks = float(np.max(np.abs(current.cdf(edges) - ref.cdf(edges))))
+
+        # PSI sur des classes d'effectifs égaux dans la référence
+        levels = np.linspace(0, 1, psi_buckets + 1)[1:-1]
+        cuts = np.unique(ref.quantiles(levels))
+        expected = np.diff(np.concatenate([[0.0], ref.cdf(cuts), [1.0]]))
+        actual = np.diff(np.concatenate([[0.0], current.cdf(cuts), [1.0]]))
+
+        quantile_levels = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+        drift = {
+            'n_rows': self.n_rows,
+            'reference_rows': reference.n_rows,
+            'ks': ks,
+            'score_psi': psi(expected, actual),
+            'quantiles': {str(level): {'current': float(c), 'reference': float(r)}
+                          for level, c, r in zip(quantile_levels, current.quantiles(quantile_levels),
+                                                 ref.quantiles(quantile_levels))},
+        }
+
+        if self.feature_names is not None and self.feature_names == reference.feature_names:
+            # Répartition de la masse des événements, et support de chacun
+            drift['event_psi'] = psi(reference.event_sums, self.event_sums)
+            shift = self.support() - reference.support()
+            order = np.argsort(-np.abs(shift), kind='stable')[:top_events]
+            drift['event_shifts'] = [
+                {'event': self.feature_names[i], 'support': float(self.support()[i]),
+                 'reference_support': float(reference.support()[i]), 'shift': float(shift[i])}
+                for i in order if shift[i] != 0
+            ]
+        return drift
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Représentation sérialisable en JSON."""
+        return {
+            **self.scores.to_dict(),
+            'feature_names': self.feature_names,
+            'event_rows': self.event_rows.tolist(),
+            'event_sums': self.event_sums.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DriftSketch":
+        """Reconstruit une esquisse depuis to_dict()."""
+        sketch = cls(data.get('feature_names'))
+        sketch.scores = ScoreHistogram.from_dict(data, DEFAULT_MAX_BINS)
+        sketch.event_rows = np.asarray(data['event_rows'], dtype=np.int64)
+        sketch.event_sums = np.asarray(data['event_sums'], dtype=np.float64)
+        return sketch
+
+
+def drift_alerts(drift: Dict[str, Any], settings: Dict[str, Any]) -> List[str]:
+    """
+    Liste les seuils de dérive dépassés.
+
+    Args:
+        drift: Résultat de DriftSketch.compare
+        settings: Seuils (ks_threshold, psi_threshold)
+
+    Returns:
+        Messages des dépassements (liste vide si le modèle reste adapté)
+    """
+    alerts = []
+    if drift.get('ks') is not None and drift['ks'] > settings['ks_threshold']:
+        alerts.append(f"KS {drift['ks']:.3f} > {settings['ks_threshold']}")
+    if drift.get('score_psi') is not None and drift['score_psi'] > settings['psi_threshold']:
+        alerts.append(f"PSI des scores {drift['score_psi']:.3f} > {settings['psi_threshold']}")
+    if drift.get('event_psi') is not None and drift['event_psi'] > settings['psi_threshold']:
+        alerts.append(f"PSI des événements {drift['event_psi']:.3f} > {settings['psi_threshold']}")
+    return alerts
@@ -0,0 +1,240 @@
+"""
+Profil des fréquences d'événements d'une trace, calculé en une seule passe.
+
+Un EventProfile accumule, bloc par bloc, le total, le support (nombre de
+lignes où l'événement apparaît), la moyenne, la variance et le maximum de
+chaque événement. Deux profils se fusionnent sans relire les données (blocs,
+shards ou fichiers d'une même population), et les profils de deux traces se
+comparent pour classer les événements qui divergent le plus.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .distributed import FeatureMoments
+
+# Lignes par bloc lorsque ni --chunksize ni csv.chunksize ne sont fixés
+DEFAULT_PROFILE_CHUNKSIZE = 50000
+
+# Critères de classement de compare_profiles
+RANKING_METRICS = ('js', 'log2_ratio', 'support_diff')
+
+
+class EventProfile:
+    """
+    Total, support, moyenne, variance et maximum par événement, fusionnables.
+    """
+
+    def __init__(self, feature_names: Sequence[str], source: Optional[str] = None):
+        """
+        Initialise un profil vide.
+
+        Args:
+            feature_names: Événements suivis
+            source: Trace profilée (affichage)
+        """
+        self.feature_names = list(feature_names)
+        self.source = source
+        n_features = len(self.feature_names)
+        self.moments = FeatureMoments(n_features)
+        self.totals = np.zeros(n_features, dtype=np.float64)
+        self.support = np.zeros(n_features, dtype=np.int64)
+        self.maxima = np.zeros(n_features, dtype=np.float64)
+
+    @property
+    def n_rows(self) -> int:
+        """Nombre de lignes profilées."""
+        return self.moments.n
+
+    def update(self, features: pd.DataFrame):
+        """
+        Ajoute un bloc de lignes.
+
+        Args:
+            features: Compteurs d'événements du bloc (colonnes associées par nom à
+                feature_names; les colonnes inconnues sont ignorées)
+        """
+        if not len(features):
+            return
+        if list(features.columns) != self.feature_names:
+            features = features.reindex(columns=self.feature_names, fill_value=0)
+        X = features.to_numpy(dtype=np.float64)
+        self.moments.update(X)
+        self.totals += X.sum(axis=0)
+        self.support += np.count_nonzero(X, axis=0)
+        np.maximum(self.maxima, X.max(axis=0), out=self.maxima)
+
+    def aligned(self, feature_names: Sequence[str]) -> "EventProfile":
+        """
+        Copie du profil sur une autre liste d'événements.
+
+        Un événement absent du profil vaut 0 sur toutes ses lignes.
+
+        Args:
+            feature_names: Événements du profil retourné
+
+        Returns:
+            Nouveau profil
+        """
+        profile = EventProfile(feature_names, self.source)
+        index = pd.Index(self.feature_names).get_indexer(profile.feature_names)
+        known = index >= 0
+        profile.moments.n = self.moments.n
+        profile.moments.mean[known] = self.moments.mean[index[known]]
+        profile.moments.m2[known] = self.moments.m2[index[known]]
+        profile.totals[known] = self.totals[index[known]]
+        profile.support[known] = self.support[index[known]]
+        profile.maxima[known] = self.maxima[index[known]]
+        return profile
+
+    def merge(self, other: "EventProfile") -> "EventProfile":
+        """
+        Fusionne un autre profil (autre bloc, shard ou fichier).
+
+        Les événements des deux profils sont réunis, dans l'ordre de self puis
+        ceux propres à other.
+
+        Args:
+            other: Profil à ajouter
+
+        Returns:
+            Le profil fusionné
+        """
+        if other.feature_names != self.feature_names:
+            names = self.feature_names + [name for name in other.feature_names
+                                          if name not in set(self.feature_names)]
+            if names != self.feature_names:
+                extended = self.aligned(names)
+                self.feature_names, self.moments = extended.feature_names, extended.moments
+                self.totals, self.support, self.maxima = extended.totals, extended.support, extended.maxima
+            other = other.aligned(names)
+        self.moments.merge(other.moments)
+        self.totals += other.totals
+        self.support += other.support
+        np.maximum(self.maxima, other.maxima, out=self.maxima)
+        return self
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Statistiques par événement.
+
+        Returns:
+            DataFrame indexé par événement (count, support, support_rate, mean, var, max)
+        """
+        n_rows = max(self.n_rows, 1)
+        return pd.DataFrame({
+            'count': self.totals,
+            'support': self.support,
+            'support_rate': self.support / n_rows,
+            'mean': self.moments.mean,
+            'var': self.moments.var,
+            'max': self.maxima,
+        }, index=pd.Index(self.feature_names, name='event'))
+
+
+def profile_file(detector, file_path, chunksize: int = DEFAULT_PROFILE_CHUNKSIZE) -> EventProfile:
+    """
+    Profile une trace en une passe, lue par blocs comme en détection.
+
+    Les colonnes (TaskID, conversion numérique, encodages, fichiers compressés)
+    sont traitées par HDFSDetector._read_csv, comme pour load_data.
+
+    Args:
+        detector: Détecteur HDFS (lecture des traces)
+        file_path: Chemin de la trace
+        chunksize: Lignes par bloc
+
+    Returns:
+        Profil de la trace
+    """
+    profile = None
+    for chunk in detector.iter_chunks(file_path, chunksize):
+        if profile is None:
+            profile = EventProfile(chunk.columns, source=str(file_path))
+        profile.update(chunk)
+    if profile is None:
+        raise ValueError(f"Trace vide: {file_path}")
+    return profile
+
+
+def _js_terms(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Contribution de chaque classe à la divergence de Jensen-Shannon (en bits)."""
+    m = (p + q) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = (np.where(p > 0, p * np.log2(p / m), 0.0)
+                 + np.where(q > 0, q * np.log2(q / m), 0.0))
+    return terms / 2
+
+
+def compare_profiles(reference: EventProfile, other: EventProfile, smoothing: float = 0.5,
+                     sort_by: str = 'js') -> pd.DataFrame:
+    """
+    Classe les événements selon leur divergence entre deux traces.
+
+    - js: contribution de l'événement à la divergence de Jensen-Shannon entre les
+      répartitions des occurrences d'événements des deux traces (la somme de la
+      colonne est la divergence totale, entre 0 et 1)
+    - log2_ratio: log2 du rapport des fréquences par ligne, lissées de smoothing
+      occurrence pour qu'un événement absent d'une trace reste comparable
+    - support_diff: écart des proportions de lignes contenant l'événement
+
+    Args:
+        reference: Profil de référence (ex: trace normale)
+        other: Profil comparé (ex: trace en échec)
+        smoothing: Occurrences ajoutées à chaque événement pour le rapport
+        sort_by: Critère de classement (voir RANKING_METRICS), en valeur absolue
+
+    Returns:
+        DataFrame indexé par événement, trié par divergence décroissante
+    """
+    if sort_by not in RANKING_METRICS:
+        raise ValueError(f"Critère de classement inconnu: {sort_by} (choix: {', '.join(RANKING_METRICS)})")
+    names = reference.feature_names + [name for name in other.feature_names
+                                       if name not in set(reference.feature_names)]
+    ref, oth = reference.aligned(names), other.aligned(names)
+    ref_rows, oth_rows = max(ref.n_rows, 1), max(oth.n_rows, 1)
+
+    p = ref.totals / ref.totals.sum() if ref.totals.sum() else np.zeros(len(names))
+    q = oth.totals / oth.totals.sum() if oth.totals.sum() else np.zeros(len(names))
+    ref_rate = (ref.totals + smoothing) / ref_rows
+    oth_rate = (oth.totals + smoothing) / oth_rows
+
+    frame = pd.DataFrame({
+        'ref_mean': ref.moments.mean,
+        'mean': oth.moments.mean,
+        'ref_support_rate': ref.support / ref_rows,
+        'support_rate': oth.support / oth_rows,
+        'ref_max': ref.maxima,
+        'max': oth.maxima,
+        'log2_ratio': np.log2(oth_rate / ref_rate),
+        'support_diff': oth.support / oth_rows - ref.support / ref_rows,
+        'js': _js_terms(p, q),
+    }, index=pd.Index(names, name='event'))
+    order = np.argsort(-frame[sort_by].abs().to_numpy(), kind='stable')
+    return frame.iloc[order]
+
+
+def divergence_summary(comparison: pd.DataFrame, top: int = 5) -> Dict[str, object]:
+    """
+    Résumé d'une comparaison (voir compare_profiles).
+
+    Args:
+        comparison: Résultat de compare_profiles
+        top: Nombre d'événements cités
+
+    Returns:
+        Dictionnaire (divergence de Jensen-Shannon totale, événements apparus,
+        disparus, événements les plus divergents)
+    """
+    appeared: List[str] = comparison.index[(comparison['ref_support_rate'] == 0)
+                                           & (comparison['support_rate'] > 0)].tolist()
+    vanished: List[str] = comparison.index[(comparison['ref_support_rate'] > 0)
+                                           & (comparison['support_rate'] == 0)].tolist()
+    return {
+        'js_divergence': float(comparison['js'].sum()),
+        'appeared': appeared,
+        'vanished': vanished,
+        'top_events': comparison.index[:top].tolist(),
+    }
@@ -0,0 +1,105 @@
+"""
+Élagage des colonnes d'événements inutiles avant l'entraînement.
+
+Une colonne constante, quasi constante ou identique à une autre (à une
+transformation affine près) n'apporte rien à la normalisation, à la PCA ni
+aux arbres, mais coûte à chaque normalisation et à chaque parcours d'arbre.
+Les colonnes retenues forment l'entrée du modèle; les autres restent lues
+et figurent dans les résultats (features des anomalies, esquisse de dérive).
+"""
+
+import hashlib
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Valeurs utilisées si la section feature_pruning de model_config.yaml est absente
+DEFAULT_PRUNING_SETTINGS = {
+    'enabled': True,
+    'min_variance': 0.0,
+    'max_dominant_fraction': 1.0,
+    'drop_duplicates': True,
+}
+
+
+def _column_signatures(Z: np.ndarray) -> List[bytes]:
+    """
+    Empreinte de chaque colonne standardisée, au signe près.
+
+    Deux colonnes parfaitement corrélées (positivement ou négativement) ont
+    la même empreinte.
+    """
+    signatures = []
+    for j in range(Z.shape[1]):
+        column = np.round(Z[:, j], 9)
+        nonzero = np.flatnonzero(column)
+        if len(nonzero) and column[nonzero[0]] < 0:
+            column = -column
+        column = column + 0.0  # -0.0 -> 0.0
+        signatures.append(hashlib.blake2b(column.tobytes(), digest_size=16).digest())
+    return signatures
+
+
+def prune_features(data: pd.DataFrame, min_variance: float = 0.0, max_dominant_fraction: float = 1.0,
+                   drop_duplicates: bool = True) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    Choisit les colonnes d'événements à garder.
+
+    Args:
+        data: Données d'entraînement préprocessées
+        min_variance: Une colonne de variance inférieure ou égale est constante
+        max_dominant_fraction: Une colonne dont une même valeur couvre au moins cette
+            fraction des lignes est quasi constante (1.0 = désactivé)
+        drop_duplicates: Retirer les colonnes parfaitement corrélées à une colonne
+            précédente (seule la première est gardée)
+
+    Returns:
+        Tuple contenant (colonnes gardées dans l'ordre d'origine, rapport d'élagage)
+
+    Raises:
+        ValueError: Si aucune colonne n'est gardée
+    """
+    columns = list(data.columns)
+    X = data.to_numpy(dtype=np.float64)
+    n_rows = len(X)
+
+    variance = X.var(axis=0) if n_rows else np.zeros(len(columns))
+    constant = variance <= min_variance
+
+    near_constant = np.zeros(len(columns), dtype=bool)
+    if max_dominant_fraction < 1.0 and n_rows:
+        for j in np.flatnonzero(~constant):
+            _, counts = np.unique(X[:, j], return_counts=True)
+            near_constant[j] = counts.max() >= max_dominant_fraction * n_rows
+
+    keep = ~(constant | near_constant)
+    duplicates: Dict[str, str] = {}
+    if drop_duplicates and keep.any():
+        candidates = np.flatnonzero(keep)
+        Z = (X[:, candidates] - X[:, candidates].mean(axis=0)) / np.sqrt(variance[candidates])
+        first_seen: Dict[bytes, int] = {}
+        for j, signature in zip(candidates, _column_signatures(Z)):
+            if signature in first_seen:
+                duplicates[columns[j]] = columns[first_seen[signature]]
+                keep[j] = False
+            else:
+                first_seen[signature] = j
+
+    kept = [column for column, k in zip(columns, keep) if k]
+    if columns and not kept:
+        raise ValueError(f"Élagage des features: les {len(columns)} colonnes sont constantes ou quasi "
+                         f"constantes sur les données d'entraînement (ajustez feature_pruning "
+                         f"ou désactivez-le dans model_config.yaml)")
+    report = {
+        'n_input': len(columns),
+        'n_kept': len(kept),
+        'n_removed': len(columns) - len(kept),
+        'removed_pct': 100.0 * (len(columns) - len(kept)) / len(columns) if columns else 0.0,
+        'constant': [columns[j] for j in np.flatnonzero(constant)],
+        'near_constant': [columns[j] for j in np.flatnonzero(near_constant)],
+        'duplicates': duplicates,
+        'settings': {'min_variance': min_variance, 'max_dominant_fraction': max_dominant_fraction,
+                     'drop_duplicates': drop_duplicates},
+    }
+    return kept, report
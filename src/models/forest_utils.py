@@ -0,0 +1,118 @@
+"""
+Manipulation des arbres d'un IsolationForest entraîné.
+
+Le score d'un IsolationForest est la moyenne des profondeurs d'isolement
+sur ses arbres: des arbres entraînés séparément (sur le même espace de
+features et avec le même max_samples) peuvent donc être réunis dans une
+seule forêt. Ces fonctions s'appuient sur les attributs internes de
+scikit-learn (présents à partir de la version 1.3), qui sont tous copiés de
+façon cohérente.
+"""
+
+import copy
+from typing import List, Sequence
+
+import numpy as np
+import sklearn
+from sklearn.ensemble import IsolationForest
+
+# Attributs contenant une entrée par arbre
+_PER_TREE_ATTRIBUTES = ('estimators_', 'estimators_features_', '_average_path_length_per_tree',
+                        '_decision_path_lengths')
+
+
+def _check_forest(forest: IsolationForest):
+    """Vérifie que la forêt expose les attributs internes utilisés (scikit-learn >= 1.3)."""
+    missing = [name for name in _PER_TREE_ATTRIBUTES + ('_seeds',) if not hasattr(forest, name)]
+    if missing:
+        raise RuntimeError(f"scikit-learn {sklearn.__version__} ne fournit pas {', '.join(missing)}: "
+                           "la fusion, la compaction et le calcul des profondeurs demandent scikit-learn >= 1.3")
+
+
+def merge_forests(forests: List[IsolationForest]) -> IsolationForest:
+    """
+    Réunit les arbres de plusieurs forêts en une seule.
+
+    Le seuil (offset_) de la forêt produite est celui de la première forêt:
+    il doit être recalculé sur un échantillon avec la forêt fusionnée.
+
+    Args:
+        forests: Forêts entraînées sur le même espace de features
+
+    Returns:
+        Nouvelle forêt contenant tous les arbres
+    """
+    if not forests:
+        raise ValueError("Aucune forêt à fusionner")
+
+    reference = forests[0]
+    for forest in forests:
+        _check_forest(forest)
+    for forest in forests[1:]:
+        if forest.n_features_in_ != reference.n_features_in_:
+            raise ValueError("Forêts incompatibles: nombres de features différents")
+        if forest._max_samples != reference._max_samples:
+            raise ValueError("Forêts incompatibles: max_samples différents "
+                             f"({forest._max_samples} != {reference._max_samples})")
+
+    merged = copy.deepcopy(reference)
+    for attribute in _PER_TREE_ATTRIBUTES:
+        values = [value for forest in forests for value in getattr(forest, attribute)]
+        setattr(merged, attribute, tuple(values) if isinstance(getattr(reference, attribute), tuple) else values)
+    merged._seeds = np.concatenate([forest._seeds for forest in forests])
+    merged.n_estimators = len(merged.estimators_)
+    return merged
+
+
+def subset_forest(forest: IsolationForest, indices: Sequence[int]) -> IsolationForest:
+    """
+    Forêt réduite à une partie de ses arbres.
+
+    Le seuil (offset_) est celui de la forêt d'origine: il doit être
+    recalculé sur un échantillon avec la forêt réduite.
+
+    Args:
+        forest: Forêt entraînée
+        indices: Numéros des arbres gardés, dans l'ordre voulu
+
+    Returns:
+        Nouvelle forêt contenant ces arbres
+    """
+    indices = [int(i) for i in indices]
+    if not indices:
+        raise ValueError("Aucun arbre sélectionné")
+    _check_forest(forest)
+
+    subset = copy.copy(forest)
+    for attribute in _PER_TREE_ATTRIBUTES:
+        values = getattr(forest, attribute)
+        selected = [copy.deepcopy(values[i]) for i in indices]
+        setattr(subset, attribute, tuple(selected) if isinstance(values, tuple) else selected)
+    subset._seeds = forest._seeds[indices]
+    subset.n_estimators = len(indices)
+    return subset
+
+
+def tree_path_lengths(forest: IsolationForest, X: np.ndarray) -> np.ndarray:
+    """
+    Profondeur d'isolement de chaque ligne dans chaque arbre.
+
+    Le score d'une forêt est une fonction décroissante de la moyenne de ces
+    profondeurs sur ses arbres (même calcul que scikit-learn).
+
+    Args:
+        forest: Forêt entraînée
+        X: Matrice transformée (normalisée et réduite comme à l'entraînement)
+
+    Returns:
+        Matrice (arbres × lignes)
+    """
+    _check_forest(forest)
+    X = np.asarray(X, dtype=np.float32)
+    depths = np.empty((len(forest.estimators_), len(X)))
+    for i, (tree, features) in enumerate(zip(forest.estimators_, forest.estimators_features_)):
+        X_subset = X if len(features) == X.shape[1] else X[:, features]
+        leaves = tree.apply(X_subset)
+        depths[i] = (forest._decision_path_lengths[i][leaves]
+                     + forest._average_path_length_per_tree[i][leaves] - 1.0)
+    return depths
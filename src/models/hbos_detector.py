@@ -0,0 +1,287 @@
+"""
+Détecteur HBOS (Histogram-Based Outlier Score) pour le format HDFS vectorisé.
+
+Chaque colonne d'événement est résumée par un histogramme à bornes fixes
+(échelle logarithmique des compteurs). Les bornes ne dépendent pas des
+données: les histogrammes de plusieurs blocs ou processus s'additionnent.
+Le score d'une ligne est la moyenne des log-densités de ses valeurs, ce
+qui donne un entraînement et un scoring en O(n·d) avec une mémoire en O(d).
+"""
+
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .hdfs_detector import HDFSDetector, DEFAULT_HDFS_PARAMS
+from utils.sampling import BottomKSample
+from utils.vectors import unique_rows, weighted_percentile
+
+# Paramètres HBOS ajoutés aux paramètres communs
+DEFAULT_HBOS_PARAMS = dict(DEFAULT_HDFS_PARAMS, n_bins=16, alpha=1.0, fit_chunksize=100000)
+
+# Nombre de lignes traitées à la fois lors du scoring (borne la mémoire temporaire)
+_SCORE_BLOCK_ROWS = 65536
+
+
+class HistogramModel:
+    """
+    Modèle HBOS: un histogramme par feature et un seuil de contamination.
+
+    L'interface (score_samples, decision_function, predict, offset_) suit
+    celle d'IsolationForest pour que le détecteur puisse l'utiliser tel quel.
+    """
+
+    def __init__(self, n_features: int, n_bins: int = 16, alpha: float = 1.0,
+                 contamination: float = 0.01):
+        """
+        Initialise des histogrammes vides.
+
+        Args:
+            n_features: Nombre de features
+            n_bins: Nombre de classes par histogramme (la dernière regroupe les grandes valeurs)
+            alpha: Lissage additif des densités (évite log(0))
+            contamination: Proportion d'anomalies attendues
+        """
+        self.n_bins = int(n_bins)
+        self.alpha = float(alpha)
+        self.contamination = contamination
+        self.counts = np.zeros((n_features, self.n_bins))
+        self.n_samples = 0.0
+        self.offset_ = 0.0
+        self._log_density = None
+
+    @property
+    def n_features(self) -> int:
+        return self.counts.shape[0]
+
+    def bin_indices(self, X: np.ndarray) -> np.ndarray:
+        """
+        Classe de chaque valeur: floor(log2(1 + compteur)), bornée à n_bins - 1.
+
+        Args:
+            X: Matrice de compteurs
+
+        Returns:
+            Matrice d'indices de classe (int16)
+        """
+        bins = np.floor(np.log2(1.0 + np.maximum(X, 0)))
+        return np.minimum(bins, self.n_bins - 1).astype(np.int16)
+
+    def partial_fit(self, X: np.ndarray, sample_weight: Optional[np.ndarray] = None) -> "HistogramModel":
+        """
+        Ajoute un bloc de lignes aux histogrammes.
+
+        Args:
+            X: Matrice (lignes × features)
+            sample_weight: Poids des lignes (ex: nombre d'occurrences de lignes uniques)
+
+        Returns:
+            Le modèle mis à jour
+        """
+        n_rows, n_features = X.shape
+        flat = (self.bin_indices(X) + np.arange(n_features) * self.n_bins).ravel()
+        weights = None if sample_weight is None else np.repeat(np.asarray(sample_weight, dtype=float), n_features)
+        self.counts += np.bincount(flat, weights=weights, minlength=n_features * self.n_bins).reshape(
+            n_features, self.n_bins)
+        self.n_samples += n_rows if sample_weight is None else float(np.sum(sample_weight))
+        self._log_density = None
+        return self
+
+    def merge(self, other: "HistogramModel") -> "HistogramModel":
+        """
+        Fusionne les histogrammes d'un autre modèle (autre bloc ou autre processus).
+
+        Args:
+            other: Modèle de même dimension et mêmes classes
+
+        Returns:
+            Le modèle fusionné
+        """
+        if other.counts.shape != self.counts.shape:
+            raise ValueError("Histogrammes incompatibles: dimensions différentes")
+        self.counts += other.counts
+        self.n_samples += other.n_samples
+        self._log_density = None
+        return self
+
+    @property
+    def log_density(self) -> np.ndarray:
+        """Table des log-densités lissées (features × classes)."""
+        if self._log_density is None:
+            density = (self.counts + self.alpha) / (self.n_samples + self.alpha * self.n_bins)
+            self._log_density = np.log(density).ravel()
+        return self._log_density
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        """
+        Moyenne des log-densités de chaque ligne (plus élevé = plus normal).
+
+        Args:
+            X: Matrice (lignes × features)
+
+        Returns:
+            Scores bruts
+        """
+        log_density = self.log_density
+        feature_offsets = np.arange(self.n_features) * self.n_bins
+        scores = np.empty(len(X))
+        for start in range(0, len(X), _SCORE_BLOCK_ROWS):
+            block = X[start:start + _SCORE_BLOCK_ROWS]
+            scores[start:start + len(block)] = log_density[self.bin_indices(block) + feature_offsets].mean(axis=1)
+        return scores
+
+    def set_threshold(self, X: np.ndarray, sample_weight: Optional[np.ndarray] = None):
+        """
+        Place le seuil au quantile de contamination des scores d'un échantillon.
+
+        Args:
+            X: Échantillon de lignes représentatif de l'entraînement
+            sample_weight: Poids des lignes
+        """
+        scores = self.score_samples(X)
+        if sample_weight is None:
+            self.offset_ = float(np.percentile(scores, 100.0 * self.contamination))
+        else:
+            self.offset_ = weighted_percentile(scores, sample_weight, 100.0 * self.contamination)
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        """Scores décalés du seuil (négatif = anormal), comme IsolationForest."""
+        return self.score_samples(X) - self.offset_
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Prédictions (-1 = anomalie, 1 = normal)."""
+        return np.where(self.decision_function(X) < 0, -1, 1)
+
+
+class HBOSDetector(HDFSDetector):
+    """
+    Détecteur HBOS rapide pour le tri initial de grandes traces HDFS.
+
+    Il partage avec HDFSDetector la lecture des fichiers, l'alignement des
+    colonnes, la déduplication et l'API de détection; seuls l'entraînement
+    et le modèle de scoring diffèrent. Pas de normalisation ni de PCA: les
+    histogrammes travaillent directement sur les compteurs.
+    """
+
+    config_section = "hbos"
+    default_params = DEFAULT_HBOS_PARAMS
+    model_filename = "hbos_anomaly_model.pkl"
+
+    def fit_pipeline(self, data: pd.DataFrame, params: Dict[str, Any],
+                     verbose: bool = True) -> Tuple[None, None, HistogramModel]:
+        """
+        Construit les histogrammes sur des données en mémoire.
+
+        Args:
+            data: Données d'entraînement préprocessées
+            params: Hyperparamètres (voir DEFAULT_HBOS_PARAMS)
+            verbose: Si True, affiche les étapes
+
+        Returns:
+            Tuple contenant (None, None, modèle HBOS)
+        """
+        X = data.to_numpy(dtype=np.dtype(params['precision']))
+        counts = None
+        if params.get('train_on_unique_rows'):
+            first_indices, _, counts = unique_rows(X)
+            if verbose:
+                self._log(f"Lignes uniques pour l'entraînement: {len(first_indices)}/{len(X)}")
+            X = X[first_indices]
+
+        if verbose:
+            self._log(f"Construction des histogrammes ({params['n_bins']} classes par événement)...")
+        model = HistogramModel(X.shape[1], params['n_bins'], params['alpha'], self.contamination)
+        model.partial_fit(X, counts)
+        model.set_threshold(X, counts)
+        return None, None, model
+
+    def train_from_chunks(self, chunks: Iterable[pd.DataFrame], total: Optional[int] = None) -> bool:
+        """
+        Entraîne le modèle en un seul passage sur un flux de blocs.
+
+        Les histogrammes sont cumulés bloc par bloc; le seuil est placé sur un
+        échantillon uniforme borné (max_training_samples lignes).
+
+        Args:
+            chunks: Blocs de features (même schéma de colonnes)
+            total: Nombre de lignes estimé (progression, None si inconnu)
+
+        Returns:
+            True si l'entraînement s'est bien passé, False sinon
+        """
+        try:
+            model = None
+            sample = BottomKSample(self.params['max_training_samples'], self.params['random_state'])
+            progress = self.progress("Histogrammes", total)
+            for chunk in chunks:
+                if model is None:
+                    self.feature_names = list(chunk.columns)
+                    self.model_features = None
+                    model = HistogramModel(len(self.feature_names), self.params['n_bins'],
+                                           self.params['alpha'], self.contamination)
+                X = self.align_features(chunk)
+                model.partial_fit(X)
+                sample.add(X)
+                progress.update(len(X))
+
+            if model is None:
+                self._log("Erreur: aucune donnée d'entraînement")
+                return False
+
+            model.set_threshold(sample.values)
+            self.scaler, self.pca, self.model = None, None, model
+            self.set_training_reference(pd.DataFrame(sample.values, columns=self.feature_names),
+                                      model.decision_function(sample.values))
+            self.model_hash = None
+            self.is_trained = True
+            self._log(f"Histogrammes construits sur {int(model.n_samples)} lignes "
+                      f"(seuil calculé sur {len(sample)} lignes)")
+            return True
+
+        except Exception as e:
+            self._log(f"Erreur lors de l'entraînement: {e}")
+            return False
+
+    def create_model_from_file(self, csv_filename: str, auto_tune: bool = False,
+                               target_latency_ms: Optional[float] = None,
+                               train_budget_s: Optional[float] = None) -> bool:
+        """
+        Crée un modèle HBOS à partir d'un fichier CSV lu par blocs.
+
+        Args:
+            csv_filename: Nom du fichier CSV d'entraînement
+            auto_tune: Non applicable à HBOS (ignoré)
+            target_latency_ms: Non applicable à HBOS (ignoré)
+            train_budget_s: Non applicable à HBOS (ignoré)
+
+        Returns:
+            True si la création s'est bien passée, False sinon
+        """
+        self._log("CRÉATION DU MODÈLE HBOS")
+        self._log("=" * 40)
+
+        if auto_tune:
+            self._log("L'auto-tuning ne concerne que l'Isolation Forest: option ignorée")
+
+        file_path = self.resolve_file(csv_filename)
+        if not file_path:
+            self._log(f"Erreur: Fichier '{csv_filename}' non trouvé")
+            return False
+
+        plan = self.plan_memory(file_path, 'train')
+        chunksize = self.params['fit_chunksize']
+        if plan.mode == 'chunked':
+            chunksize = min(chunksize, plan.chunksize)
+        self._log(f"Lecture par blocs de {chunksize} lignes: {file_path}")
+        self.feature_names = None
+        start = time.perf_counter()
+        success = self.train_from_chunks(self.iter_chunks(file_path, chunksize), plan.estimated_rows)
+
+        if success:
+            success = self.publish_model(file_path, int(self.model.n_samples), time.perf_counter() - start)
+            if success:
+                self._log("CRÉATION DU MODÈLE TERMINÉE!")
+
+        return success
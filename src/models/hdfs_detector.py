@@ -12,13 +12,54 @@ from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 from pathlib import Path
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, Iterator
+import json
+import time
 import warnings
+from contextlib import nullcontext
 
 from .base_detector import BaseAnomalyDetector
+from .score_cache import ScoreCache
+from .detection_result import DetectionResult
+from .report_summary import DEFAULT_BIN_WIDTH, ReportSummary
+from .result_store import DEFAULT_RESULT_STORE_SETTINGS, ResultStore
+from .result_writer import AnomalyStreamWriter, write_json_summary
+from .checkpoint import DetectionCheckpoint, source_signature
+from .distillation import DEFAULT_DISTILLATION_SETTINGS, ForestDistiller
+from .drift import DEFAULT_DRIFT_SETTINGS, DriftSketch, drift_alerts
+from .feature_pruning import DEFAULT_PRUNING_SETTINGS, prune_features
+from .memory_planner import MemoryPlan, MemoryPlanner
+from .schema import SchemaRegistry
+from .registry import DEFAULT_ALIAS, ModelRegistry, get_model_cache
+from utils.compression import CSV_PATTERNS, compression_of, open_compressed, strip_csv_suffix
+from utils.config import get_section, load_config
+from utils.file_utils import get_file_size_mb
+from utils.parallel_csv import open_at, read_csv_parallel, skip_lines
+from utils.progress import ProgressReporter
+from utils.sampling import BottomKSample
+from utils.vectors import hash_rows, unique_rows, weighted_percentile
 
 warnings.filterwarnings('ignore')
 
+# Proportion d'anomalies attendues si ni l'appelant ni model_config.yaml ne la fixent
+DEFAULT_CONTAMINATION = 0.01
+
+# Valeurs utilisées si config/model_config.yaml est absent ou incomplet
+DEFAULT_HDFS_PARAMS = {
+    'n_estimators': 200,
+    'max_samples': 'auto',
+    'random_state': 42,
+    'max_training_samples': 50000,
+    'pca_threshold': 100,
+    'pca_components': 100,
+    'train_on_unique_rows': False,
+    'precision': 'float64',
+}
+
+# Niveaux des quantiles de scores d'entraînement sauvegardés avec le modèle
+# (pas fin sur les petits taux d'anomalies, où se situent les seuils utiles)
+QUANTILE_LEVELS = np.unique(np.concatenate([np.geomspace(1e-5, 0.5, 400), np.linspace(0.0, 1.0, 101)]))
+
 
 class HDFSDetector(BaseAnomalyDetector):
     """
@@ -30,25 +71,110 @@ class HDFSDetector(BaseAnomalyDetector):
     - Les valeurs sont des compteurs d'occurrences (0, 1, 2, ...)
     """
 
-    def __init__(self, project_root: Optional[str] = None, contamination: float = 0.01):
+    # Section de config/model_config.yaml, paramètres par défaut et fichier de modèle
+    config_section = "hdfs"
+    default_params = DEFAULT_HDFS_PARAMS
+    model_filename = "hdfs_anomaly_model.pkl"
+
+    def __init__(self, project_root: Optional[str] = None, contamination: Optional[float] = None,
+                 verbose: bool = True, model_name: Optional[str] = None,
+                 model_version: Optional[str] = None):
         """
         Initialise le détecteur HDFS.
 
         Args:
             project_root: Chemin racine du projet
-            contamination: Proportion d'anomalies attendues (0.01 = 1%)
+            contamination: Proportion d'anomalies attendues (défaut: contamination de la
+                section du détecteur dans model_config.yaml, sinon 0.01)
+            verbose: Si False, le détecteur n'écrit rien sur la sortie standard
+            model_name: Nom du modèle dans le registre (défaut: type de détecteur, ex: 'hdfs')
+            model_version: Version ou alias à charger (défaut: 'current')
         """
-        super().__init__(project_root)
-        self.contamination = contamination
+        super().__init__(project_root, verbose)
         self.pca = None
-        self.model_path = self.project_root / "models" / "hdfs_anomaly_model.pkl"
+        self.config = get_section("model_config", self.config_section, self.project_root, self.default_params)
+        if contamination is None:
+            contamination = self.config.get('contamination', DEFAULT_CONTAMINATION)
+        self.contamination = float(contamination)
+        self.params = {key: self.config[key] for key in self.default_params}
+        self.tuning_report = None
+        # Rapport de compaction (modèle compact produit par distill_model seulement)
+        self.distillation_report = None
+        self.schema = None
+        # Esquisse des scores et événements d'entraînement, comparée à chaque détection
+        self.reference_sketch = None
+        # Rapport de l'élagage des colonnes à l'entraînement (None = aucune colonne élaguée)
+        self.pruning_report = None
+        # Colonnes en entrée du modèle, parmi feature_names (None = toutes)
+        self.model_features = None
+        # Quantiles des scores d'entraînement: conversion taux d'anomalies <-> seuil sans réentraînement
+        self.score_quantiles = None
+        # Seuil appliqué aux scores en détection (0 = seuil fixé par la contamination d'entraînement)
+        self.threshold = 0.0
+        self.drift_settings = get_section("model_config", "drift", self.project_root, DEFAULT_DRIFT_SETTINGS)
+
+        # Scoring d'un seul vecteur par ligne identique (data_config.yaml)
+        self.data_config = load_config("data_config", self.project_root)
+        preprocessing = self.data_config.get('preprocessing') or {}
+        self.remove_duplicates = preprocessing.get('remove_duplicates', True)
+        # Lecture par blocs pour la détection (None = fichier entier)
+        csv_config = self.data_config.get('csv') or {}
+        self.chunksize = csv_config.get('chunksize')
+        # Décompression des traces compressées (None = nombre de CPU)
+        self.decompress_threads = csv_config.get('decompress_threads')
+        self.external_decompressors = csv_config.get('external_decompressors', True)
+        # Analyse multi-thread des gros fichiers lus en entier (None = nombre de CPU)
+        self.parse_workers = csv_config.get('parse_workers')
+        self.parallel_parse_min_mb = csv_config.get('parallel_parse_min_mb', 64)
+        # Budget mémoire: lecture entière ou par blocs, taille des blocs et parallélisme
+        self.memory_planner = MemoryPlanner(self.data_config.get('memory'),
+                                            (self.data_config.get('validation') or {}).get('max_file_size_mb'))
+        # Pas de l'histogramme des scores du résumé de rapport
+        reporting = self.data_config.get('reporting') or {}
+        self.report_bin_width = reporting.get('score_bin_width', DEFAULT_BIN_WIDTH)
+        self.progress_interval = reporting.get('progress_interval', 5.0)
+        # Intervalle des points de reprise de la détection par blocs (None = désactivés)
+        self.checkpoint_interval = (self.data_config.get('checkpoint') or {}).get('interval_s', 60.0)
+
+        # Cache persistant des scores, partagé entre exécutions
+        self.score_cache = None
+        cache_config = self.config.get('score_cache') or {}
+        if cache_config.get('enabled'):
+            cache_path = Path(cache_config.get('path', 'data/cache/score_cache.sqlite'))
+            if not cache_path.is_absolute():
+                cache_path = self.project_root / cache_path
+            self.score_cache = ScoreCache(cache_path, cache_config.get('max_entries', 1000000))
+
+        # Base des résultats de détection, interrogée par main.py query
+        self.result_store = None
+        store_config = dict(DEFAULT_RESULT_STORE_SETTINGS)
+        store_config.update(self.data_config.get('result_store') or {})
+        if store_config['enabled']:
+            store_path = Path(store_config['path'])
+            if not store_path.is_absolute():
+                store_path = self.project_root / store_path
+            self.result_store = ResultStore(store_path, store_config['events_per_anomaly'],
+                                            store_config['batch_size'], store_config['cache_mb'])
+        self.model_path = self.project_root / "models" / self.model_filename
 
         # Créer le dossier models s'il n'existe pas
         self.model_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Registre versionné des modèles et cache des modèles chargés (model_config.yaml)
+        registry_config = get_section("model_config", "registry", self.project_root,
+                                      {'path': 'models/registry', 'cache_max_mb': 512})
+        registry_path = Path(registry_config['path'])
+        if not registry_path.is_absolute():
+            registry_path = self.project_root / registry_path
+        self.registry = ModelRegistry(registry_path)
+        self.model_cache = get_model_cache(int(registry_config['cache_max_mb'] * 1024 * 1024))
+        self.model_name = model_name or self.config_section
+        self.model_version = model_version or DEFAULT_ALIAS
+        self.loaded_version = None
+
     def find_csv_files(self) -> list:
         """
-        Recherche tous les fichiers CSV dans le projet.
+        Recherche tous les fichiers CSV dans le projet, compressés ou non (.csv.gz, .csv.zst...).
 
         Returns:
             Liste des chemins vers les fichiers CSV trouvés
@@ -62,62 +188,304 @@ class HDFSDetector(BaseAnomalyDetector):
 
         for search_dir in search_dirs:
             if search_dir.exists():
-                csv_files.extend(list(search_dir.glob("*.csv")))
+                for pattern in CSV_PATTERNS:
+                    csv_files.extend(search_dir.glob(pattern))
 
         return sorted(set(csv_files))
 
-    def load_data(self, file_path: str) -> Tuple[pd.DataFrame, list]:
+    @property
+    def dtype(self) -> np.dtype:
+        """Précision numérique du pipeline (float64 ou float32, voir model_config.yaml)."""
+        return np.dtype(self.params['precision'])
+
+    def _feature_columns(self, columns) -> list:
+        """
+        Détermine les colonnes d'événements d'un fichier à partir de son en-tête.
+
+        Args:
+            columns: Noms des colonnes du fichier
+
+        Returns:
+            Liste des colonnes de features (TaskID exclu)
+        """
+        columns = list(columns)
+        if 'TaskID' in columns or columns[0].lower().startswith('task'):
+            return columns[1:]
+        return columns
+
+    def _check_dtype(self, X: np.ndarray, stage: str) -> np.ndarray:
+        """
+        Vérifie qu'une étape du pipeline n'a pas changé la précision des données.
+
+        Args:
+            X: Matrice produite par l'étape
+            stage: Nom de l'étape (pour le message d'erreur)
+
+        Returns:
+            La matrice inchangée
+        """
+        if X.dtype != self.dtype:
+            raise TypeError(f"{stage}: précision {X.dtype} au lieu de {self.dtype}")
+        return X
+
+    def open_source(self, file_path: str):
+        """
+        Source à passer à pandas pour un fichier CSV.
+
+        Un fichier compressé est décompressé en flux (outil externe multi-thread
+        si disponible, voir utils.compression); un fichier simple est lu directement.
+
+        Args:
+            file_path: Chemin vers le fichier CSV
+
+        Returns:
+            Gestionnaire de contexte donnant le chemin ou le flux décompressé
+        """
+        if compression_of(file_path) is None:
+            return nullcontext(file_path)
+        return open_compressed(file_path, self.decompress_threads, self.external_decompressors)
+
+    def _parse_workers(self, file_path: str, n_features: int, skip_rows: int = 0) -> int:
+        """
+        Nombre de threads d'analyse d'un fichier lu en entier.
+
+        Args:
+            file_path: Chemin vers le fichier CSV
+            n_features: Colonnes de features lues
+            skip_rows: Lignes de données sautées (lecture reprise: analyse simple)
+
+        Returns:
+            Plus de 1 pour un fichier non compressé d'au moins parallel_parse_min_mb
+            lorsque plusieurs threads sont disponibles et que la copie d'assemblage
+            tient dans le budget mémoire, 1 sinon
+        """
+        if (skip_rows or compression_of(file_path) is not None
+                or get_file_size_mb(file_path) < self.parallel_parse_min_mb):
+            return 1
+        plan = self.memory_planner.plan(file_path, n_features, self.dtype.itemsize,
+                                        max_parse_workers=self.parse_workers)
+        return plan.parse_workers if plan.mode == 'memory' else 1
+
+    def _read_csv(self, file_path: str, chunksize: Optional[int] = None, skip_rows: int = 0,
+                  columns: Optional[list] = None,
+                  byte_offset: Optional[int] = None) -> Iterator[Tuple[pd.DataFrame, list]]:
+        """
+        Lit un fichier CSV HDFS, entier ou par blocs, en features numériques.
+
+        Les fichiers compressés (.gz, .bz2, .zst, .xz) sont décompressés en flux;
+        un gros fichier lu en entier est analysé par plages sur plusieurs threads.
+        Les encodages UTF-8, Latin-1 et CP1252 sont essayés dans cet ordre. Si
+        une erreur de décodage ou une valeur non numérique apparaît en cours de
+        lecture, la lecture reprend après les lignes déjà produites avec
+        l'encodage suivant ou en mode de conversion générique.
+
+        Args:
+            file_path: Chemin vers le fichier CSV
+            chunksize: Nombre de lignes par bloc (None = fichier entier)
+            skip_rows: Nombre de lignes de données à sauter (reprise d'une lecture)
+            columns: Colonnes d'événements à lire (None = toutes); les autres ne sont
+                pas analysées par le parseur
+            byte_offset: Position en octets de la ligne skip_rows + 1 (fichier non
+                compressé): la lecture y commence sans analyser les lignes sautées
+
+        Yields:
+            Tuples (features, noms_des_colonnes) dans l'ordre du fichier
+        """
+        encodings = ['utf-8', 'latin-1', 'cp1252']
+        typed = True
+        rows_done = skip_rows
+
+        while encodings:
+            encoding = encodings[0]
+            try:
+                with self.open_source(file_path) as source:
+                    header = pd.read_csv(source, encoding=encoding, nrows=0).columns
+                feature_cols = self._feature_columns(header)
+                options = {'encoding': encoding}
+                if columns is not None:
+                    wanted = set(columns)
+                    id_cols = list(header[:len(header) - len(feature_cols)])
+                    feature_cols = [col for col in feature_cols if col in wanted]
+                    options['usecols'] = id_cols + feature_cols
+                if typed:
+                    # Lecture directe dans la précision du modèle, sans passage par float64
+                    options['dtype'] = {col: self.dtype for col in feature_cols}
+                seek = (byte_offset if byte_offset is not None and rows_done == skip_rows
+                        and compression_of(file_path) is None else None)
+                if seek is not None:
+                    # Seul l'en-tête est relu; le corps est lu à partir de la position sauvegardée
+                    options.update(header=None, names=list(header))
+                elif rows_done:
+                    options['skiprows'] = range(1, rows_done + 1)
+
+                workers = 1 if chunksize else self._parse_workers(file_path, len(feature_cols), rows_done)
+                with (self.open_source(file_path) if seek is None else open_at(file_path, seek)) as source:
+                    if chunksize:
+                        chunks = pd.read_csv(source, chunksize=chunksize, **options)
+                    elif workers > 1:
+                        chunks = [read_csv_parallel(file_path, workers, **options)]
+                    else:
+                        chunks = [pd.read_csv(source, **options)]
+
+                    for df in chunks:
+                        X = self._prepare_features(df, feature_cols, rows_done)
+                        rows_done += len(df)
+                        yield X, feature_cols
+                return
+
+            except UnicodeDecodeError:
+                encodings.pop(0)
+            except ValueError:
+                if not typed:
+                    raise
+                # Valeurs non numériques: lecture générique puis conversion
+                typed = False
+
+        raise Exception("Impossible de décoder le fichier avec les encodages supportés")
+
+    def _prepare_features(self, df: pd.DataFrame, feature_cols: list, first_row: int = 0) -> pd.DataFrame:
+        """
+        Extrait les features numériques d'un bloc lu depuis un CSV.
+
+        Args:
+            df: Bloc brut (toutes les colonnes du fichier)
+            feature_cols: Colonnes d'événements
+            first_row: Numéro de la première ligne du bloc dans le fichier
+
+        Returns:
+            DataFrame de features indexé par TaskID (ou par numéro de ligne)
+        """
+        X = df[feature_cols]
+
+        # Conversion en numérique avec gestion des erreurs (colonnes non numériques seulement)
+        non_numeric = [col for col in feature_cols if not pd.api.types.is_numeric_dtype(X[col])]
+        if non_numeric:
+            X = X.copy()
+            for col in non_numeric:
+                X[col] = pd.to_numeric(X[col], errors='coerce')
+        X = X.fillna(0).astype(self.dtype, copy=False)
+
+        # Les TaskID servent d'index: ils suivent les lignes jusqu'aux résultats
+        if len(feature_cols) < len(df.columns):
+            X.index = pd.Index(df[df.columns[0]], name=df.columns[0])
+        else:
+            X.index = pd.RangeIndex(first_row, first_row + len(X))
+        return X
+
+    def iter_chunks(self, file_path: str, chunksize: int, skip_rows: int = 0,
+                    columns: Optional[list] = None, byte_offset: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Lit un fichier CSV HDFS par blocs de lignes.
+
+        Args:
+            file_path: Chemin vers le fichier CSV
+            chunksize: Nombre de lignes par bloc
+            skip_rows: Nombre de lignes de données à sauter au début du fichier
+            columns: Colonnes d'événements à lire (None = toutes)
+            byte_offset: Position en octets de la première ligne lue (voir _read_csv)
+
+        Yields:
+            DataFrames de features, dans l'ordre du fichier
+        """
+        for X, _ in self._read_csv(file_path, chunksize, skip_rows, columns, byte_offset):
+            yield X
+
+    def plan_memory(self, file_path: str, task: str = 'detect') -> MemoryPlan:
+        """
+        Choisit la lecture d'un fichier (entier ou par blocs) sous le budget mémoire et l'annonce.
+
+        Args:
+            file_path: Chemin vers le fichier CSV
+            task: 'train' (un échantillon de max_training_samples lignes reste en
+                mémoire pendant la lecture par blocs) ou 'detect'
+
+        Returns:
+            Plan retenu (voir MemoryPlanner.plan)
+        """
+        with self.open_source(file_path) as source:
+            # Seul le nombre de colonnes compte: latin-1 décode n'importe quel en-tête
+            columns = self._feature_columns(pd.read_csv(source, encoding='latin-1', nrows=0).columns)
+        resident_rows = self.params['max_training_samples'] if task == 'train' else 0
+        plan = self.memory_planner.plan(file_path, len(columns), self.dtype.itemsize, task,
+                                        self.parse_workers, resident_rows)
+        self._log(plan.describe())
+        return plan
+
+    def load_training_sample(self, file_path: str, chunksize: int,
+                             total: Optional[int] = None) -> Tuple[pd.DataFrame, list]:
+        """
+        Lit un fichier par blocs en gardant un échantillon uniforme de max_training_samples lignes.
+
+        Args:
+            file_path: Chemin vers le fichier CSV
+            chunksize: Nombre de lignes par bloc
+            total: Nombre de lignes estimé (progression, None si inconnu)
+
+        Returns:
+            Tuple contenant (échantillon de features, noms_des_colonnes)
+        """
+        sample = BottomKSample(self.params['max_training_samples'], self.params['random_state'])
+        feature_names = None
+        progress = self.progress("Échantillonnage", total)
+        for chunk in self.iter_chunks(file_path, chunksize):
+            if feature_names is None:
+                feature_names = list(chunk.columns)
+            sample.add(chunk.to_numpy())
+            progress.update(len(chunk))
+        progress.close()
+        if feature_names is None:
+            return None, None
+        self._log(f"Échantillon d'entraînement: {len(sample)} lignes sur {sample.n_seen}")
+        return pd.DataFrame(sample.values, columns=feature_names), feature_names
+
+    def progress(self, label: str, total: Optional[int] = None) -> ProgressReporter:
+        """
+        Compteur de progression dont les messages passent par _log.
+
+        Args:
+            label: Préfixe des messages (ex: "Analyse")
+            total: Nombre de lignes attendu (None si inconnu)
+
+        Returns:
+            ProgressReporter limité à un message par progress_interval secondes
+        """
+        return ProgressReporter(total, self.progress_interval, emit=self._log, label=label)
+
+    def load_data(self, file_path: str, columns: Optional[list] = None) -> Tuple[pd.DataFrame, list]:
         """
         Charge les données HDFS vectorisées depuis un fichier CSV.
 
         Args:
             file_path: Chemin vers le fichier CSV
+            columns: Colonnes d'événements à lire (None = toutes)
 
         Returns:
             Tuple contenant (données_features, noms_des_colonnes)
         """
-        print(f"Chargement des données: {file_path}")
+        self._log(f"Chargement des données: {file_path}")
 
         try:
-            # Essayer différents encodages pour la compatibilité
-            for encoding in ['utf-8', 'latin-1', 'cp1252']:
-                try:
-                    df = pd.read_csv(file_path, encoding=encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
-            else:
-                raise Exception("Impossible de décoder le fichier avec les encodages supportés")
+            X, feature_cols = next(self._read_csv(file_path, columns=columns))
 
-            print(f"Données chargées: {len(df)} lignes, {len(df.columns)} colonnes")
+            self._log(f"Données chargées: {len(X)} lignes, {len(feature_cols)} colonnes de features")
 
             # Identifier la colonne TaskID (généralement la première)
-            if 'TaskID' in df.columns or df.columns[0].lower().startswith('task'):
-                task_col = df.columns[0]
-                feature_cols = [col for col in df.columns if col != task_col]
-                print(f"Colonne TaskID détectée: {task_col}")
+            if not isinstance(X.index, pd.RangeIndex):
+                self._log(f"Colonne TaskID détectée: {X.index.name}")
             else:
                 # Pas de TaskID, toutes les colonnes sont des features
-                feature_cols = df.columns.tolist()
-                print("Aucune colonne TaskID détectée - toutes les colonnes sont des features")
-
-            # Extraire les features et les convertir en numérique
-            X = df[feature_cols].copy()
+                self._log("Aucune colonne TaskID détectée - toutes les colonnes sont des features")
 
-            # Conversion en numérique avec gestion des erreurs
-            for col in X.columns:
-                X[col] = pd.to_numeric(X[col], errors='coerce').fillna(0)
-
-            print(f"Features extraites: {len(feature_cols)} colonnes d'événements HDFS")
+            self._log(f"Features extraites: {len(feature_cols)} colonnes d'événements HDFS")
 
             # Afficher quelques exemples de colonnes pour information
             sample_cols = feature_cols[:3]
-            print(f"Exemples de colonnes: {', '.join(sample_cols)}...")
+            self._log(f"Exemples de colonnes: {', '.join(sample_cols)}...")
 
             return X, feature_cols
 
         except Exception as e:
-            print(f"Erreur lors du chargement des données: {e}")
+            self._log(f"Erreur lors du chargement des données: {e}")
             return None, None
 
     def preprocess_data(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -130,16 +498,193 @@ class HDFSDetector(BaseAnomalyDetector):
         Returns:
             DataFrame avec les données préprocessées et normalisées
         """
-        print("Préprocessing des données HDFS...")
+        self._log("Préprocessing des données HDFS...")
 
         # Les données HDFS sont déjà sous forme numérique
         # On s'assure juste qu'il n'y a pas de valeurs manquantes
         data_clean = data.fillna(0)
 
-        print(f"Données préprocessées: {data_clean.shape[0]} lignes × {data_clean.shape[1]} features")
+        self._log(f"Données préprocessées: {data_clean.shape[0]} lignes × {data_clean.shape[1]} features")
 
         return data_clean
 
+    def fit_pipeline(self, data: pd.DataFrame, params: Dict[str, Any],
+                     verbose: bool = True) -> Tuple[StandardScaler, Optional[PCA], IsolationForest]:
+        """
+        Ajuste la chaîne normalisation -> PCA -> Isolation Forest avec des paramètres donnés.
+
+        Ne modifie pas l'état du détecteur, ce qui permet de comparer plusieurs
+        configurations (voir AutoTuner).
+
+        Args:
+            data: Données d'entraînement préprocessées
+            params: Hyperparamètres (voir DEFAULT_HDFS_PARAMS)
+            verbose: Si True, affiche les étapes
+
+        Returns:
+            Tuple contenant (scaler, pca ou None, modèle)
+        """
+        # Échantillonnage si le dataset est trop volumineux
+        max_rows = params['max_training_samples']
+        if len(data) > max_rows:
+            if verbose:
+                self._log(f"Échantillonnage de {len(data)} à {max_rows} lignes pour l'entraînement...")
+            data = data.sample(n=max_rows, random_state=params['random_state'])
+
+        X = data.to_numpy(dtype=np.dtype(params['precision']))
+        counts = None
+        if params.get('train_on_unique_rows'):
+            # Les lignes identiques sont ajustées une seule fois, pondérées par leur nombre.
+            # Approximation pour l'Isolation Forest: les arbres tirent leurs échantillons
+            # parmi les lignes uniques (pondération par les poids, pas par le tirage)
+            first_indices, _, counts = unique_rows(X)
+            if verbose:
+                self._log(f"Lignes uniques pour l'entraînement: {len(first_indices)}/{len(X)}")
+            X = X[first_indices]
+
+        # Normalisation des données
+        if verbose:
+            self._log("Normalisation des features...")
+        scaler = StandardScaler()
+        X_scaled = scaler.fit(X, sample_weight=counts).transform(X)
+
+        # Réduction de dimensionnalité si nécessaire
+        pca = None
+        n_components = params['pca_components']
+        if n_components and X_scaled.shape[1] > params['pca_threshold'] and X_scaled.shape[1] > n_components:
+            if verbose:
+                self._log(f"Réduction de dimensionnalité: {X_scaled.shape[1]} -> {n_components} dimensions")
+            pca = PCA(n_components=n_components, random_state=params['random_state'])
+            if counts is None:
+                X_scaled = pca.fit_transform(X_scaled)
+            else:
+                # La PCA n'accepte pas de poids: on l'ajuste sur les lignes répétées
+                pca.fit(np.repeat(X_scaled, counts, axis=0))
+                X_scaled = pca.transform(X_scaled)
+
+        model = self.fit_forest(X_scaled, params, counts, verbose)
+        return scaler, pca, model
+
+    def fit_forest(self, X_scaled: np.ndarray, params: Dict[str, Any],
+                   sample_weight: Optional[np.ndarray] = None, verbose: bool = True) -> IsolationForest:
+        """
+        Entraîne l'Isolation Forest sur des données déjà normalisées (et réduites).
+
+        Args:
+            X_scaled: Matrice d'entraînement transformée
+            params: Hyperparamètres (n_estimators, max_samples, random_state)
+            sample_weight: Nombre d'occurrences de chaque ligne (lignes uniques)
+            verbose: Si True, affiche les étapes
+
+        Returns:
+            Modèle entraîné, seuil placé au quantile de contamination
+        """
+        # Configuration et entraînement du modèle Isolation Forest
+        if verbose:
+            self._log("Entraînement du modèle Isolation Forest...")
+        model = IsolationForest(
+            contamination=self.contamination,  # Proportion d'anomalies attendues
+            random_state=params['random_state'],
+            n_estimators=params['n_estimators'],
+            max_samples=params['max_samples']
+        )
+        model.fit(X_scaled, sample_weight=sample_weight)
+
+        if sample_weight is not None:
+            # Le seuil doit refléter la distribution des lignes, pas celle des vecteurs uniques
+            model.offset_ = weighted_percentile(model.score_samples(X_scaled), sample_weight,
+                                                100.0 * self.contamination)
+        return model
+
+    def transform_features(self, data: pd.DataFrame, scaler: Optional[StandardScaler] = None,
+                           pca: Optional[PCA] = None) -> np.ndarray:
+        """
+        Applique la normalisation et la PCA à des données déjà ordonnées.
+
+        Args:
+            data: Données dont les colonnes suivent l'ordre de l'entraînement
+            scaler: Scaler à utiliser (par défaut celui du détecteur)
+            pca: PCA à utiliser (par défaut celle du détecteur)
+
+        Returns:
+            Matrice prête pour le modèle
+        """
+        if scaler is None:
+            scaler, pca = self.scaler, self.pca
+
+        X_scaled = np.asarray(data, dtype=self.dtype)
+        if scaler is not None:
+            X_scaled = self._check_dtype(scaler.transform(X_scaled), "Normalisation")
+        if pca is not None:
+            X_scaled = self._check_dtype(pca.transform(X_scaled), "PCA")
+        return X_scaled
+
+    def model_input(self, X: np.ndarray) -> np.ndarray:
+        """
+        Colonnes d'une matrice alignée sur self.feature_names qui entrent dans le modèle.
+
+        Args:
+            X: Matrice dont les colonnes suivent self.feature_names
+
+        Returns:
+            X restreinte aux colonnes retenues par l'élagage (X elle-même sans élagage)
+        """
+        if self.model_features is None or self.model_features == self.feature_names:
+            return X
+        return X[:, pd.Index(self.feature_names).get_indexer(self.model_features)]
+
+    def score_matrix(self, X: np.ndarray, deduplicate: Optional[bool] = None) -> np.ndarray:
+        """
+        Calcule les scores d'anomalie d'une matrice déjà alignée sur les features du modèle.
+
+        Les lignes identiques sont regroupées par hash: chaque vecteur unique
+        n'est scoré qu'une fois et son score est recopié sur toutes ses
+        occurrences, dans l'ordre d'origine. Si le cache de scores est actif
+        et que le modèle a été sauvegardé, les vecteurs déjà scorés par ce
+        modèle ne sont pas recalculés.
+
+        Args:
+            X: Matrice dont les colonnes suivent self.feature_names
+            deduplicate: Regrouper les lignes identiques (défaut: data_config.yaml)
+
+        Returns:
+            Scores de decision_function (négatif = anormal), un par ligne
+        """
+        if deduplicate is None:
+            deduplicate = self.remove_duplicates
+        use_cache = self.score_cache is not None and self.model_hash is not None
+        X = self.model_input(X)
+
+        if not use_cache and not (deduplicate and len(X) > 1):
+            return self.model.decision_function(self.transform_features(X))
+
+        row_hashes = hash_rows(X)
+        if deduplicate:
+            first_indices, inverse, _ = unique_rows(X, row_hashes)
+            self._log(f"Vecteurs uniques scorés: {len(first_indices)}/{len(X)}")
+        else:
+            first_indices = inverse = np.arange(len(X))
+
+        keys = row_hashes[first_indices]
+        unique_scores = np.empty(len(first_indices))
+        to_score = np.ones(len(first_indices), dtype=bool)
+
+        if use_cache:
+            found, cached_scores = self.score_cache.get_many(self.model_hash, keys)
+            unique_scores[found] = cached_scores[found]
+            to_score = ~found
+            self._log(f"Cache de scores: {int(found.sum())}/{len(keys)} vecteurs trouvés "
+                      f"(taux de succès de la session: {self.score_cache.hit_rate*100:.1f}%)")
+
+        if to_score.any():
+            unique_scores[to_score] = self.model.decision_function(
+                self.transform_features(X[first_indices[to_score]])
+            )
+            if use_cache:
+                self.score_cache.put_many(self.model_hash, keys[to_score], unique_scores[to_score])
+
+        return unique_scores[inverse]
+
     def train_model(self, data: pd.DataFrame) -> bool:
         """
         Entraîne le modèle de détection d'anomalies sur les données HDFS.
@@ -151,229 +696,866 @@ class HDFSDetector(BaseAnomalyDetector):
             True si l'entraînement s'est bien passé, False sinon
         """
         try:
-            print("Début de l'entraînement du modèle HDFS...")
-
-            # Échantillonnage si le dataset est trop volumineux
-            if len(data) > 50000:
-                print(f"Échantillonnage de {len(data)} à 50000 lignes pour l'entraînement...")
-                data = data.sample(n=50000, random_state=42)
-
-            # Normalisation des données
-            print("Normalisation des features...")
-            self.scaler = StandardScaler()
-            X_scaled = self.scaler.fit_transform(data)
-
-            # Réduction de dimensionnalité si nécessaire
-            if X_scaled.shape[1] > 100:
-                print(f"Réduction de dimensionnalité: {X_scaled.shape[1]} -> 100 dimensions")
-                self.pca = PCA(n_components=100, random_state=42)
-                X_scaled = self.pca.fit_transform(X_scaled)
-
-            # Configuration et entraînement du modèle Isolation Forest
-            print("Entraînement du modèle Isolation Forest...")
-            self.model = IsolationForest(
-                contamination=self.contamination,  # Proportion d'anomalies attendues
-                random_state=42,
-                n_estimators=200,  # Nombre d'arbres pour plus de précision
-                max_samples='auto'
-            )
+            self._log("Début de l'entraînement du modèle HDFS...")
 
-            self.model.fit(X_scaled)
+            self.scaler, self.pca, self.model = self.fit_pipeline(self.prune_features(data), self.params)
+            # Nouveau modèle: il n'a pas encore de fichier, donc pas de hash pour le cache
+            self.model_hash = None
 
             # Test sur les données d'entraînement pour validation
-            predictions = self.model.predict(X_scaled)
-            anomalies_count = np.sum(predictions == -1)
-
-            print(f"Entraînement terminé!")
-            print(f"Anomalies détectées sur les données d'entraînement: {anomalies_count}/{len(X_scaled)}")
-            print(f"Taux d'anomalies: {anomalies_count/len(X_scaled)*100:.2f}%")
+            sample = data
+            if len(sample) > self.params['max_training_samples']:
+                sample = sample.sample(n=self.params['max_training_samples'],
+                                       random_state=self.params['random_state'])
+            sample_scores = self.score_matrix(sample.to_numpy(dtype=self.dtype))
+            anomalies_count = np.sum(sample_scores < 0)
+            self.set_training_reference(sample, sample_scores)
+
+            self._log(f"Entraînement terminé!")
+            self._log(f"Anomalies détectées sur les données d'entraînement: {anomalies_count}/{len(sample)}")
+            self._log(f"Taux d'anomalies: {anomalies_count/len(sample)*100:.2f}%")
 
             self.is_trained = True
             return True
 
         except Exception as e:
-            print(f"Erreur lors de l'entraînement: {e}")
+            self._log(f"Erreur lors de l'entraînement: {e}")
             return False
 
-    def predict_anomalies(self, data: pd.DataFrame) -> Tuple[list, list]:
+    def prune_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Retire les colonnes constantes, quasi constantes et en double de l'entrée du modèle.
+
+        self.feature_names garde toutes les colonnes (lecture, alignement, résultats);
+        les colonnes retenues deviennent self.model_features (normalisation, PCA,
+        forêt) et le rapport d'élagage est sauvegardé avec le modèle.
+
+        Args:
+            data: Données d'entraînement préprocessées
+
+        Returns:
+            Données restreintes aux colonnes retenues
+
+        Raises:
+            ValueError: Si l'élagage retire toutes les colonnes
+        """
+        settings = dict(DEFAULT_PRUNING_SETTINGS)
+        settings.update(self.config.get('feature_pruning') or {})
+        self.pruning_report = None
+        self.feature_names = list(data.columns)
+        self.model_features = None
+        if not settings['enabled']:
+            return data
+
+        kept, report = prune_features(data, settings['min_variance'], settings['max_dominant_fraction'],
+                                      settings['drop_duplicates'])
+        self.pruning_report = report
+        self.model_features = kept
+        self._log(f"Élagage des features: {report['n_removed']}/{report['n_input']} colonnes retirées "
+                  f"({report['removed_pct']:.1f}% de la largeur): {len(report['constant'])} constantes, "
+                  f"{len(report['near_constant'])} quasi constantes, {len(report['duplicates'])} en double")
+        return data[kept] if report['n_removed'] else data
+
+    def auto_tune(self, data: pd.DataFrame, target_latency_ms: Optional[float] = None,
+                  train_budget_s: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Choisit les hyperparamètres selon un budget de latence et de temps d'entraînement.
+
+        Les paramètres retenus remplacent self.params et le rapport est
+        sauvegardé avec le modèle.
+
+        Args:
+            data: Données d'entraînement préprocessées
+            target_latency_ms: Latence de scoring visée pour 1000 lignes
+            train_budget_s: Budget de temps total pour la recherche
+
+        Returns:
+            Rapport d'auto-tuning
+        """
+        from .auto_tuner import AutoTuner
+
+        tuning_config = dict(self.config.get('tuning') or {})
+        if target_latency_ms is not None:
+            tuning_config['target_latency_ms'] = target_latency_ms
+        if train_budget_s is not None:
+            tuning_config['train_budget_s'] = train_budget_s
+
+        tuner = AutoTuner(self, **tuning_config)
+        self.tuning_report = tuner.tune(data)
+        self.params.update(self.tuning_report['chosen_params'])
+        return self.tuning_report
+
+    def get_model_state(self) -> Dict[str, Any]:
+        """Ajoute la PCA et les hyperparamètres au fichier de modèle."""
+        return {
+            'pca': self.pca,
+            'contamination': self.contamination,
+            'params': self.params,
+            'tuning_report': self.tuning_report,
+            'reference_sketch': self.reference_sketch.to_dict() if self.reference_sketch else None,
+            'score_quantiles': self.score_quantiles,
+            'pruning_report': self.pruning_report,
+            'model_features': self.model_features,
+            'distillation_report': self.distillation_report,
+        }
+
+    def set_model_state(self, model_data: Dict[str, Any]):
+        """Restaure la PCA et les hyperparamètres depuis le fichier de modèle."""
+        self.pca = model_data.get('pca')
+        self.contamination = model_data.get('contamination', self.contamination)
+        self.params.update(model_data.get('params') or {})
+        self.tuning_report = model_data.get('tuning_report')
+        reference = model_data.get('reference_sketch')
+        self.reference_sketch = DriftSketch.from_dict(reference) if reference else None
+        self.score_quantiles = model_data.get('score_quantiles')
+        self.pruning_report = model_data.get('pruning_report')
+        self.model_features = model_data.get('model_features')
+        self.distillation_report = model_data.get('distillation_report')
+        self.threshold = 0.0
+
+    def new_sketch(self) -> DriftSketch:
+        """Esquisse vide sur les événements du modèle (voir models.drift)."""
+        return DriftSketch(self.feature_names, self.report_bin_width, self.drift_settings['max_bins'])
+
+    def set_training_reference(self, features: pd.DataFrame, scores: np.ndarray):
+        """
+        Calcule les références d'entraînement sauvegardées avec le modèle.
+
+        - esquisse des scores et des événements (surveillance de la dérive)
+        - quantiles des scores (conversion taux d'anomalies <-> seuil)
+
+        Args:
+            features: Lignes d'entraînement (ou échantillon uniforme de celles-ci)
+            scores: Scores du modèle entraîné sur ces lignes
+        """
+        if self.feature_names is None:
+            self.feature_names = list(features.columns)
+        sketch = self.new_sketch()
+        sketch.update(scores, features)
+        self.reference_sketch = sketch
+        self.score_quantiles = {
+            'levels': QUANTILE_LEVELS.tolist(),
+            'values': np.quantile(np.asarray(scores, dtype=np.float64), QUANTILE_LEVELS).tolist(),
+        }
+
+    def threshold_for_rate(self, rate: float) -> float:
+        """
+        Seuil de score donnant un taux d'anomalies voulu sur les données d'entraînement.
+
+        Args:
+            rate: Proportion d'anomalies voulue (ex: 0.02)
+
+        Returns:
+            Seuil à appliquer aux scores (score < seuil = anomalie)
+        """
+        if not 0 < rate < 1:
+            raise ValueError(f"Taux d'anomalies invalide: {rate}")
+        if self.score_quantiles is None:
+            raise ValueError("Le modèle ne contient pas les quantiles de scores d'entraînement "
+                             "(modèle antérieur: réentraînez-le)")
+        return float(np.interp(rate, self.score_quantiles['levels'], self.score_quantiles['values']))
+
+    def rate_for_threshold(self, threshold: float) -> Optional[float]:
+        """
+        Taux d'anomalies qu'un seuil produit sur les données d'entraînement.
+
+        Args:
+            threshold: Seuil de score
+
+        Returns:
+            Proportion des scores d'entraînement sous le seuil, None si inconnue
+        """
+        if self.score_quantiles is None:
+            return None
+        # Scores ex aequo (HBOS): on garde le plus petit niveau de chaque valeur, les
+        # lignes égales au seuil n'étant pas des anomalies
+        values, first = np.unique(self.score_quantiles['values'], return_index=True)
+        levels = np.asarray(self.score_quantiles['levels'])[first]
+        return float(np.interp(threshold, values, levels))
+
+    def compare_drift(self, sketch: DriftSketch) -> Optional[Dict[str, Any]]:
+        """
+        Compare l'esquisse d'une détection à celle de l'entraînement.
+
+        Args:
+            sketch: Esquisse construite pendant la détection
+
+        Returns:
+            Métriques de dérive (voir DriftSketch.compare) avec la liste 'alerts'
+            des seuils dépassés et 'retrain_recommended', ou None si le modèle
+            n'a pas d'esquisse de référence
+        """
+        if self.reference_sketch is None:
+            return None
+        drift = sketch.compare(self.reference_sketch, self.drift_settings['psi_buckets'],
+                               self.drift_settings['top_events'])
+        drift['alerts'] = drift_alerts(drift, self.drift_settings)
+        drift['retrain_recommended'] = bool(drift['alerts'])
+        return drift
+
+    def align_features(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Aligne les colonnes des données sur les features du modèle, sans modifier data.
+
+        Le plan d'alignement est calculé une fois par disposition de colonnes
+        puis réutilisé (voir SchemaRegistry): les blocs successifs d'une trace
+        ne refont pas ce travail.
+
+        Args:
+            data: Données à analyser
+
+        Returns:
+            Matrice (lignes × features du modèle) dans la précision du modèle
+        """
+        if self.schema is None or self.schema.feature_names is not self.feature_names:
+            self.schema = SchemaRegistry(self.feature_names)
+
+        n_plans = len(self.schema.plans)
+        plan = self.schema.plan(data.columns)
+        if len(self.schema.plans) > n_plans and plan.n_missing:
+            self._log(f"Ajout de {plan.n_missing} colonnes manquantes (remplies avec 0)")
+        return plan.apply(data, self.dtype)
+
+    def predict_anomalies(self, data: pd.DataFrame, deduplicate: Optional[bool] = None,
+                          threshold: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
         """
         Prédit les anomalies dans les données HDFS.
 
         Args:
             data: Données à analyser
+            deduplicate: Scorer une seule fois les lignes identiques (défaut: data_config.yaml)
+            threshold: Seuil des anomalies (défaut: self.threshold)
 
         Returns:
-            Tuple contenant (prédictions, scores_d_anomalie)
+            Tuple de tableaux NumPy contenant (prédictions, scores_d_anomalie)
         """
         if not self.is_trained:
             raise Exception("Le modèle n'est pas entraîné. Entraînez d'abord le modèle.")
 
-        print(f"Analyse de {len(data)} séquences HDFS...")
+        self._log(f"Analyse de {len(data)} séquences HDFS...")
+
+        # Scores calculés une seule fois; la prédiction en découle (seuil 0 comme IsolationForest.predict,
+        # sauf seuil choisi en détection, voir threshold_for_rate)
+        scores = self.score_matrix(self.align_features(data), deduplicate)
+        if threshold is None:
+            threshold = self.threshold
+        predictions = np.where(scores < threshold, -1, 1).astype(np.int8)
+
+        return predictions, scores
+
+    def resolve_file(self, csv_filename: str) -> Optional[Path]:
+        """
+        Recherche un fichier CSV du projet à partir de son nom (ou d'une partie de son nom).
+
+        Args:
+            csv_filename: Nom du fichier recherché
+
+        Returns:
+            Chemin du premier fichier correspondant, None si aucun
+        """
+        for f in self.find_csv_files():
+            if csv_filename.lower() in f.name.lower():
+                return f
+        return None
+
+    def ensure_model_loaded(self) -> bool:
+        """
+        Charge le modèle sauvegardé s'il n'est pas déjà en mémoire.
+
+        Le modèle est cherché dans le registre (self.model_name, self.model_version),
+        puis à l'emplacement historique models/<model_filename>.
+
+        Returns:
+            True si un modèle est disponible, False sinon
+        """
+        if self.is_trained:
+            return True
+
+        version = self.registry.resolve(self.model_name, self.model_version)
+        if version is not None:
+            model_path = self.registry.model_path(self.model_name, version)
+        elif self.model_path.exists():
+            model_path = self.model_path
+        else:
+            self._log("Erreur: Aucun modèle trouvé. Créez d'abord un modèle.")
+            return False
+
+        self._log("Chargement du modèle...")
+        if not self.load_model(model_path, cache=self.model_cache):
+            return False
+        self.loaded_version = version
+        return True
+
+    def use_model(self, model_name: str, model_version: str = DEFAULT_ALIAS) -> bool:
+        """
+        Bascule vers un autre modèle du registre.
+
+        Les modèles déjà chargés dans le processus sont repris du cache sans
+        relire leur fichier, ce qui permet d'alterner entre de nombreux modèles.
+
+        Args:
+            model_name: Nom du modèle
+            model_version: Version ou alias
+
+        Returns:
+            True si le modèle est disponible, False sinon
+        """
+        self.model_name, self.model_version = model_name, model_version
+        self.is_trained = False
+        self.loaded_version = None
+        return self.ensure_model_loaded()
+
+    def publish_model(self, training_file: Optional[str] = None, rows: Optional[int] = None,
+                      train_time_s: Optional[float] = None) -> bool:
+        """
+        Enregistre le modèle entraîné comme nouvelle version et y fait pointer l'alias.
+
+        Args:
+            training_file: Fichier d'entraînement
+            rows: Nombre de lignes d'entraînement
+            train_time_s: Durée de l'entraînement en secondes
+
+        Returns:
+            True si l'enregistrement s'est bien passé, False sinon
+        """
+        metadata = {
+            'training_file': str(training_file) if training_file else None,
+            'rows': rows,
+            'train_time_s': round(train_time_s, 3) if train_time_s is not None else None,
+            'contamination': self.contamination,
+            'params': self.params,
+        }
+        aliases = (DEFAULT_ALIAS,) if self.model_version == DEFAULT_ALIAS else (DEFAULT_ALIAS, self.model_version)
+        version = self.registry.register(self, self.model_name, metadata, aliases)
+        if version is None:
+            return False
+        self.loaded_version = version
+        self._log(f"Modèle enregistré: {self.model_name} {version} (alias: {', '.join(aliases)})")
+        return True
+
+    def distill_model(self, data: pd.DataFrame, training_file: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Publie une version compacte du modèle (sous-ensemble d'arbres) sous le nom <modèle>-compact.
+
+        Le modèle complet reste inchangé (audits); le modèle compact, dont le
+        classement des lignes reste dans les tolérances de hdfs.distillation,
+        sert au scoring de production (--model-name hdfs-compact).
+
+        Args:
+            data: Données d'entraînement préprocessées
+            training_file: Fichier des données de calibration (métadonnées)
+
+        Returns:
+            Rapport de compaction (accélération, concordance), None en cas d'échec
+        """
+        settings = dict(DEFAULT_DISTILLATION_SETTINGS)
+        settings.update(self.config.get('distillation') or {})
+        settings.pop('enabled', None)
+        try:
+            compact, report = ForestDistiller(self, **settings).distill(data)
+        except Exception as e:
+            self._log(f"Erreur lors de la compaction du modèle: {e}")
+            return None
+
+        # Le modèle compact hérite des données d'entraînement de la version d'origine
+        source = (self.registry.metadata(self.model_name, self.loaded_version)
+                  if self.loaded_version else None) or {}
+        metadata = {
+            'training_file': source.get('training_file') or (str(training_file) if training_file else None),
+            'rows': source.get('rows'),
+            'calibration_file': str(training_file) if training_file else None,
+            'contamination': self.contamination,
+            'params': compact.params,
+            'distilled_from': {'name': self.model_name, 'version': self.loaded_version,
+                               'model_hash': self.model_hash},
+            'distillation': {key: value for key, value in report.items() if key != 'kept_trees'},
+        }
+        version = self.registry.register(compact, compact.model_name, metadata)
+        if version is None:
+            self._log("Erreur lors de l'enregistrement du modèle compact")
+            return None
+
+        self._log(f"Modèle compact enregistré: {compact.model_name} {version} "
+                  f"({report['n_kept']}/{report['n_estimators']} arbres, scoring {report['speedup']:.1f}x plus rapide)")
+        self._log(f"  - Corrélation de rang: {report['rank_correlation']:.4f} "
+                  f"(minimum {report['min_rank_correlation']})")
+        self._log(f"  - Recouvrement des top {report['top_k']}: {report['topk_overlap']:.1%} "
+                  f"(minimum {report['min_topk_overlap']:.0%}), labels identiques: {report['label_agreement']:.2%}")
+        if not report['verified']:
+            self._log(f"  Concordance non vérifiée: {report['holdout_rows']} lignes tenues à l'écart "
+                      f"pour un top {report['top_k']} (augmentez distillation.eval_rows)")
+        elif not report['tolerances_met']:
+            self._log("  Tolérances non atteintes sur l'échantillon tenu à l'écart")
+        return report
+
+    def model_info(self) -> Dict[str, Any]:
+        """
+        Décrit le modèle utilisé pour une détection.
+
+        Returns:
+            Dictionnaire sérialisable en JSON
+        """
+        return {
+            'model_type': self.__class__.__name__,
+            'contamination': self.contamination,
+            'use_pca': self.pca is not None,
+            'n_features': len(self.feature_names) if self.feature_names else 0,
+            'n_pruned_features': self.pruning_report['n_removed'] if self.pruning_report else 0,
+            'n_estimators': self.params.get('n_estimators'),
+            'precision': self.params['precision'],
+            'model_hash': self.model_hash,
+            'model_name': self.model_name,
+            'model_version': self.loaded_version,
+        }
+
+    def detect(self, source, deduplicate: Optional[bool] = None,
+               chunksize: Optional[int] = None,
+               writer: Optional[AnomalyStreamWriter] = None,
+               checkpoint: Optional[DetectionCheckpoint] = None,
+               threshold: Optional[float] = None) -> DetectionResult:
+        """
+        Détecte les anomalies et retourne un résultat structuré.
+
+        Point d'entrée pour une utilisation en bibliothèque: avec verbose=False,
+        rien n'est écrit sur la sortie standard.
 
-        # S'assurer que les colonnes correspondent à celles de l'entraînement
-        missing_cols = set(self.feature_names) - set(data.columns)
-        if missing_cols:
-            print(f"Ajout de {len(missing_cols)} colonnes manquantes (remplies avec 0)")
-            for col in missing_cols:
-                data[col] = 0
+        Args:
+            source: Chemin d'un fichier CSV ou DataFrame de features
+            deduplicate: Scorer une seule fois les lignes identiques (défaut: data_config.yaml)
+            chunksize: Lire et scorer le fichier par blocs de lignes (défaut: data_config.yaml);
+                seules les lignes anormales sont alors gardées en mémoire
+            writer: Flux NDJSON alimenté avec les anomalies au fil de la détection (optionnel)
+            checkpoint: Points de reprise de la détection par blocs (optionnel); s'il a
+                été chargé (load()), la détection reprend après les lignes sauvegardées
+            threshold: Seuil des anomalies pour cette détection (défaut: celui du
+                modèle, voir threshold_for_rate); le détecteur n'est pas modifié
 
-        # Réorganiser les colonnes dans le même ordre que l'entraînement
-        data_ordered = data[self.feature_names]
+        Returns:
+            DetectionResult contenant labels, scores, identifiants et seuil
+        """
+        if not self.ensure_model_loaded():
+            raise Exception("Le modèle n'est pas entraîné. Entraînez d'abord le modèle.")
 
-        # Normalisation avec le même scaler que l'entraînement
-        X_scaled = self.scaler.transform(data_ordered)
+        if chunksize is None:
+            chunksize = self.chunksize
+        if threshold is None:
+            threshold = self.threshold
 
-        # Application de la PCA si elle a été utilisée
-        if self.pca:
-            X_scaled = self.pca.transform(X_scaled)
+        if isinstance(source, pd.DataFrame):
+            data, file_path = source, None
+        elif chunksize:
+            return self._detect_chunked(source, chunksize, deduplicate, writer, checkpoint, threshold)
+        else:
+            file_path = source
+            data, _ = self.load_data(file_path)
+            if data is None:
+                raise Exception(f"Impossible de charger les données: {file_path}")
 
-        # Prédiction des anomalies
-        predictions = self.model.predict(X_scaled)
-        scores = self.model.decision_function(X_scaled)
+        processed_data = self.preprocess_data(data)
+        known = processed_data.columns.isin(self.feature_names)
+        if not known.all():
+            # Colonnes hors schéma (ex: TaskID d'un DataFrame brut): ignorées, comme au scoring
+            processed_data = processed_data.loc[:, known]
+        predictions, scores = self.predict_anomalies(processed_data, deduplicate, threshold)
+        positions = np.flatnonzero(predictions == -1)
+        anomaly_rows = processed_data.iloc[positions]
+        report = ReportSummary(self.report_bin_width, threshold)
+        report.update(scores, anomaly_rows)
+        sketch = self.new_sketch()
+        sketch.update(scores, processed_data)
+        if writer is not None:
+            writer.write_block(positions, anomaly_rows.index.to_numpy(), scores[positions], anomaly_rows)
+
+        return DetectionResult(
+            labels=predictions,
+            scores=scores,
+            row_ids=processed_data.index.to_numpy(),
+            threshold=threshold,
+            features=processed_data,
+            source=file_path,
+            model_info=self.model_info(),
+            report=report,
+            sketch=sketch,
+            drift=self.compare_drift(sketch)
+        )
+
+    def _detect_chunked(self, file_path: str, chunksize: int, deduplicate: Optional[bool] = None,
+                        writer: Optional[AnomalyStreamWriter] = None,
+                        checkpoint: Optional[DetectionCheckpoint] = None,
+                        threshold: Optional[float] = None) -> DetectionResult:
+        """
+        Détecte les anomalies d'un fichier bloc par bloc.
 
-        return predictions.tolist(), scores.tolist()
+        Args:
+            file_path: Chemin du fichier CSV
+            chunksize: Nombre de lignes par bloc
+            deduplicate: Scorer une seule fois les lignes identiques d'un bloc
+            writer: Flux NDJSON alimenté avec les anomalies de chaque bloc (optionnel)
+            checkpoint: Points de reprise, sauvegardés tous les checkpoint.interval secondes
+            threshold: Seuil des anomalies (défaut: self.threshold)
 
-    def create_model_from_file(self, csv_filename: str) -> bool:
+        Returns:
+            DetectionResult dont features ne contient que les lignes anormales
+        """
+        if threshold is None:
+            threshold = self.threshold
+        self._log(f"Analyse par blocs de {chunksize} lignes: {file_path}")
+        labels, scores, row_ids, anomaly_rows, anomaly_positions = [], [], [], [], []
+        report = ReportSummary(self.report_bin_width, threshold)
+        sketch = self.new_sketch()
+        offset = 0
+        # Position en octets de la ligne position_rows + 1 (fichier non compressé, mise à jour aux sauvegardes)
+        position, position_rows = None, 0
+
+        if checkpoint is not None and checkpoint.rows_done:
+            # Reprise: blocs déjà scorés relus depuis le dossier de reprise
+            for block_labels, block_scores, block_ids, positions, block_anomalies in checkpoint.blocks():
+                labels.append(block_labels)
+                scores.append(block_scores)
+                row_ids.append(block_ids)
+                if len(positions):
+                    anomaly_rows.append(block_anomalies)
+                    anomaly_positions.append(positions)
+            report, sketch, offset = checkpoint.report, checkpoint.sketch, checkpoint.rows_done
+            if checkpoint.byte_offset is not None:
+                position, position_rows = checkpoint.byte_offset, offset
+            self._log(f"Reprise après {offset} lignes ({report.n_anomalies} anomalies)")
+
+        remaining = max(self.memory_planner.estimate_rows(file_path) - offset, 0)
+        progress = self.progress("Analyse", remaining)
+        for chunk in self.iter_chunks(file_path, chunksize, skip_rows=offset, byte_offset=position):
+            chunk_labels, chunk_scores = self.predict_anomalies(self.preprocess_data(chunk), deduplicate, threshold)
+            chunk_ids = chunk.index.to_numpy()
+            labels.append(chunk_labels)
+            scores.append(chunk_scores)
+            row_ids.append(chunk_ids)
+
+            positions = np.flatnonzero(chunk_labels == -1)
+            chunk_anomalies = chunk.iloc[positions]
+            if len(positions):
+                anomaly_rows.append(chunk_anomalies)
+                anomaly_positions.append(positions + offset)
+            report.update(chunk_scores, chunk_anomalies)
+            sketch.update(chunk_scores, chunk)
+            if writer is not None:
+                writer.write_block(positions + offset, chunk_anomalies.index.to_numpy(),
+                                   chunk_scores[positions], chunk_anomalies)
+            if checkpoint is not None:
+                checkpoint.add_block(chunk_labels, chunk_scores, chunk_ids, positions + offset, chunk_anomalies)
+            offset += len(chunk)
+            progress.update(len(chunk))
+
+            if checkpoint is not None:
+                if checkpoint.due():
+                    if compression_of(file_path) is None:
+                        if position is None:
+                            position, position_rows = skip_lines(file_path, 0, 1), 0
+                        position, position_rows = skip_lines(file_path, position, offset - position_rows), offset
+                    checkpoint.save(offset, report, sketch, writer.checkpoint() if writer is not None else None,
+                                    byte_offset=position)
+        progress.close()
+
+        return DetectionResult(
+            labels=np.concatenate(labels) if labels else np.empty(0, dtype=np.int8),
+            scores=np.concatenate(scores) if scores else np.empty(0),
+            row_ids=np.concatenate(row_ids) if row_ids else np.empty(0),
+            threshold=threshold,
+            features=pd.concat(anomaly_rows) if anomaly_rows else None,
+            feature_positions=np.concatenate(anomaly_positions) if anomaly_positions
+            else np.empty(0, dtype=np.intp),
+            source=file_path,
+            model_info=self.model_info(),
+            report=report,
+            sketch=sketch,
+            drift=self.compare_drift(sketch)
+        )
+
+    def create_model_from_file(self, csv_filename: str, auto_tune: bool = False,
+                               target_latency_ms: Optional[float] = None,
+                               train_budget_s: Optional[float] = None) -> bool:
         """
         Crée et entraîne un modèle à partir d'un fichier CSV.
 
         Args:
             csv_filename: Nom du fichier CSV d'entraînement
+            auto_tune: Si True, choisit les hyperparamètres avec AutoTuner
+            target_latency_ms: Latence de scoring visée pour 1000 lignes (auto-tuning)
+            train_budget_s: Budget de temps de la recherche en secondes (auto-tuning)
 
         Returns:
             True si la création s'est bien passée, False sinon
         """
-        print("CRÉATION DU MODÈLE HDFS")
-        print("=" * 40)
+        self._log("CRÉATION DU MODÈLE HDFS")
+        self._log("=" * 40)
 
         # Rechercher le fichier
-        csv_files = self.find_csv_files()
-        file_path = None
-
-        for f in csv_files:
-            if csv_filename.lower() in f.name.lower():
-                file_path = f
-                break
+        file_path = self.resolve_file(csv_filename)
 
         if not file_path:
-            print(f"Erreur: Fichier '{csv_filename}' non trouvé")
-            print("Fichiers CSV disponibles:")
-            for f in csv_files:
-                print(f"  - {f.name}")
+            self._log(f"Erreur: Fichier '{csv_filename}' non trouvé")
+            self._log("Fichiers CSV disponibles:")
+            for f in self.find_csv_files():
+                self._log(f"  - {f.name}")
             return False
 
-        # Charger et préprocesser les données
-        data, feature_names = self.load_data(file_path)
+        # Charger (entièrement ou par blocs selon le budget mémoire) et préprocesser les données
+        plan = self.plan_memory(file_path, 'train')
+        if plan.mode == 'chunked':
+            data, feature_names = self.load_training_sample(file_path, plan.chunksize, plan.estimated_rows)
+        else:
+            data, feature_names = self.load_data(file_path)
         if data is None:
             return False
 
         self.feature_names = feature_names
         processed_data = self.preprocess_data(data)
 
+        if auto_tune:
+            report = self.auto_tune(processed_data, target_latency_ms, train_budget_s)
+            self._log(f"Configuration retenue: {report['chosen_params']}")
+
         # Entraîner le modèle
+        start = time.perf_counter()
         success = self.train_model(processed_data)
 
         if success:
-            # Sauvegarder le modèle
-            self.save_model(self.model_path)
-            print("CRÉATION DU MODÈLE TERMINÉE!")
+            # Enregistrer une nouvelle version du modèle
+            success = self.publish_model(file_path, len(processed_data), time.perf_counter() - start)
+            if success:
+                settings = dict(DEFAULT_DISTILLATION_SETTINGS)
+                settings.update(self.config.get('distillation') or {})
+                if settings['enabled']:
+                    self.distill_model(processed_data, file_path)
+                self._log("CRÉATION DU MODÈLE TERMINÉE!")
 
         return success
 
-    def detect_anomalies_in_file(self, csv_filename: str) -> bool:
+    def detect_anomalies_in_file(self, csv_filename: str, chunksize: Optional[int] = None,
+                                 output_format: str = "default", resume: bool = False,
+                                 contamination: Optional[float] = None) -> bool:
         """
-        Détecte les anomalies dans un fichier CSV.
+        Détecte les anomalies dans un fichier CSV et affiche les résultats.
 
         Args:
             csv_filename: Nom du fichier CSV à analyser
+            chunksize: Nombre de lignes par bloc (défaut: data_config.yaml)
+            output_format: "default" (console), "detailed" (plus d'anomalies et
+                d'événements) ou "json" (résumé JSON sur la sortie standard).
+                Hors "default", les anomalies sont aussi écrites en NDJSON
+                (anomalies_<fichier>.ndjson) pendant la détection.
+            resume: Reprendre une détection par blocs interrompue à son dernier
+                point de reprise (anomalies_<fichier>.checkpoint/)
+            contamination: Taux d'anomalies voulu; le seuil correspondant est lu dans
+                les quantiles d'entraînement du modèle (défaut: celui de l'entraînement)
 
         Returns:
             True si l'analyse s'est bien passée, False sinon
         """
-        print("DÉTECTION D'ANOMALIES HDFS")
-        print("=" * 40)
+        self._log("DÉTECTION D'ANOMALIES HDFS")
+        self._log("=" * 40)
 
-        # Charger le modèle s'il n'est pas déjà chargé
-        if not self.is_trained:
-            if not self.model_path.exists():
-                print("Erreur: Aucun modèle trouvé. Créez d'abord un modèle.")
-                return False
+        if not self.ensure_model_loaded():
+            return False
 
-            print("Chargement du modèle...")
-            if not self.load_model(self.model_path):
+        threshold = self.threshold
+        if contamination is not None and contamination != self.contamination:
+            try:
+                threshold = self.threshold_for_rate(contamination)
+            except ValueError as e:
+                self._log(f"Erreur: {e}")
                 return False
+            self._log(f"Seuil pour {contamination:.2%} d'anomalies: {threshold:.4f} "
+                      f"(entraînement: {self.contamination:.2%})")
 
         # Rechercher le fichier à analyser
-        csv_files = self.find_csv_files()
-        file_path = None
-
-        for f in csv_files:
-            if csv_filename.lower() in f.name.lower():
-                file_path = f
-                break
-
+        file_path = self.resolve_file(csv_filename)
         if not file_path:
-            print(f"Erreur: Fichier '{csv_filename}' non trouvé")
+            self._log(f"Erreur: Fichier '{csv_filename}' non trouvé")
             return False
 
-        # Charger et analyser les données
-        data, _ = self.load_data(file_path)
-        if data is None:
+        if chunksize is None:
+            chunksize = self.chunksize
+        if chunksize is None:
+            # Ni --chunksize ni csv.chunksize: lecture choisie selon le budget mémoire
+            chunksize = self.plan_memory(file_path, 'detect').chunksize
+        stream = output_format != "default"
+
+        # Points de reprise (détection par blocs seulement)
+        checkpoint = None
+        if chunksize and self.checkpoint_interval is not None:
+            signature = source_signature(file_path, model_hash=self.model_hash, chunksize=chunksize,
+                                         deduplicate=self.remove_duplicates, stream=stream,
+                                         threshold=threshold)
+            checkpoint = DetectionCheckpoint(self.results_path(csv_filename, ".checkpoint"), signature,
+                                             self.checkpoint_interval)
+            if resume and not checkpoint.load():
+                self._log("Aucun point de reprise compatible: analyse depuis le début")
+            if (checkpoint.rows_done and stream and checkpoint.stream_offset is not None
+                    and not AnomalyStreamWriter.can_resume(self.results_path(csv_filename, ".ndjson"),
+                                                           checkpoint.stream_offset)):
+                self._log("Attention: flux NDJSON partiel absent ou tronqué, analyse depuis le début")
+                checkpoint.clear()
+            if not checkpoint.rows_done:
+                checkpoint.clear()
+        elif resume:
+            self._log("La reprise nécessite la détection par blocs (--chunksize): analyse depuis le début")
+
+        writer = None
+        if stream:
+            writer = AnomalyStreamWriter(self.results_path(csv_filename, ".ndjson"),
+                                         resumable=checkpoint is not None,
+                                         resume_offset=checkpoint.stream_offset if checkpoint else None)
+
+        try:
+            result = self.detect(file_path, chunksize=chunksize, writer=writer, checkpoint=checkpoint,
+                                 threshold=threshold)
+        except Exception as e:
+            if writer is not None:
+                writer.close(commit=False)
+            self._log(f"Erreur lors de la détection: {e}")
+            if checkpoint is not None and checkpoint.rows_done:
+                self._log(f"Relancez avec --resume pour reprendre après la ligne {checkpoint.rows_done}")
             return False
 
-        processed_data = self.preprocess_data(data)
-        predictions, scores = self.predict_anomalies(processed_data)
-
-        # Analyser les résultats
-        anomalies = np.array(predictions) == -1
-        n_anomalies = np.sum(anomalies)
-
-        print(f"\nRÉSULTATS DE L'ANALYSE:")
-        print(f"  - Total analysé: {len(data)} séquences HDFS")
-        print(f"  - Anomalies trouvées: {n_anomalies}")
-        print(f"  - Pourcentage d'anomalies: {n_anomalies/len(data)*100:.2f}%")
-
-        if n_anomalies > 0:
-            # Analyser les anomalies les plus sévères
-            anomaly_indices = np.where(anomalies)[0]
-            anomaly_scores = np.array(scores)[anomalies]
-
-            # Trier par score (plus négatif = plus anormal)
-            sorted_indices = np.argsort(anomaly_scores)
-            top_anomalies = anomaly_indices[sorted_indices[:min(5, len(sorted_indices))]]
-
-            print(f"\nTOP 5 ANOMALIES LES PLUS SÉVÈRES:")
-            for i, idx in enumerate(top_anomalies, 1):
-                score = scores[idx]
-                print(f"  {i}. Ligne {idx+1}: Score = {score:.3f}")
-
-                # Identifier les événements les plus actifs pour cette anomalie
-                row = processed_data.iloc[idx]
-                active_features = row[row > 0].sort_values(ascending=False)
-                if len(active_features) > 0:
-                    top_features = active_features.head(3)
-                    print(f"     Événements principaux: {dict(top_features)}")
+        stream_path = None
+        if writer is not None:
+            writer.close()
+            stream_path = writer.path
+            self._log(f"Flux NDJSON des anomalies: {stream_path} ({result.n_anomalies} lignes)")
+
+        if output_format == "json":
+            summary = self.save_result(result, csv_filename, stream_path=stream_path)
+            print(json.dumps(summary, indent=2, ensure_ascii=False, default=str))
+        elif output_format == "detailed":
+            self.render_result(result, csv_filename, top_k=20, n_events=5, stream_path=stream_path)
+        else:
+            self.render_result(result, csv_filename, stream_path=stream_path)
 
-            # Sauvegarder les anomalies détectées
-            results_path = self.project_root / "data" / "results" / f"anomalies_{csv_filename.replace('.csv', '')}.csv"
-            results_path.parent.mkdir(parents=True, exist_ok=True)
+        if checkpoint is not None:
+            checkpoint.clear()
+        return True
+
+    def results_path(self, csv_filename: str, suffix: str = ".csv") -> Path:
+        """
+        Chemin du fichier de résultats associé à un fichier analysé.
+
+        Args:
+            csv_filename: Nom du fichier analysé
+            suffix: Extension du fichier de résultats
 
-            anomaly_data = processed_data.iloc[anomaly_indices].copy()
-            anomaly_data['anomaly_score'] = anomaly_scores
-            anomaly_data.to_csv(results_path, index=False)
-            print(f"\nAnomalies sauvegardées dans: {results_path}")
+        Returns:
+            Chemin dans data/results/
+        """
+        name = strip_csv_suffix(csv_filename)
+        return self.project_root / "data" / "results" / f"anomalies_{name}{suffix}"
+
+    def render_result(self, result: DetectionResult, csv_filename: str, top_k: int = 5,
+                      n_events: int = 3, stream_path: Optional[Path] = None,
+                      save: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Affiche un résultat de détection et sauvegarde les fichiers de résultats.
+
+        Args:
+            result: Résultat retourné par detect()
+            csv_filename: Nom du fichier analysé (pour nommer le fichier de résultats)
+            top_k: Nombre d'anomalies les plus sévères à détailler
+            n_events: Nombre d'événements principaux par anomalie
+            stream_path: Flux NDJSON des anomalies écrit pendant la détection (optionnel)
+            save: Sauvegarder les fichiers et l'exécution (False pour un résultat déjà enregistré)
+
+        Returns:
+            Résumé JSON sauvegardé (voir save_result), None si save est False
+        """
+        self._log(f"\nRÉSULTATS DE L'ANALYSE:")
+        self._log(f"  - Total analysé: {len(result)} séquences HDFS")
+        self._log(f"  - Anomalies trouvées: {result.n_anomalies}")
+        self._log(f"  - Pourcentage d'anomalies: {result.anomaly_rate:.2f}%")
+
+        if result.n_anomalies > 0:
+            # Anomalies les plus sévères (plus négatif = plus anormal)
+            self._log(f"\nTOP {top_k} ANOMALIES LES PLUS SÉVÈRES:")
+            for i, anomaly in enumerate(result.top_anomalies(top_k, n_events), 1):
+                self._log(f"  {i}. Ligne {anomaly['index']+1}: Score = {anomaly['score']:.3f}")
+                if anomaly['top_events']:
+                    self._log(f"     Événements principaux: {anomaly['top_events']}")
         else:
-            print("\nAucune anomalie détectée avec le seuil actuel")
-            print("Le modèle peut être trop strict ou les données sont très similaires aux données d'entraînement")
+            self._log("\nAucune anomalie détectée avec le seuil actuel")
+            self._log("Le modèle peut être trop strict ou les données sont très similaires aux données d'entraînement")
+
+        if result.drift and result.drift.get('ks') is not None:
+            drift = result.drift
+            self._log(f"\nDÉRIVE PAR RAPPORT À L'ENTRAÎNEMENT:")
+            self._log(f"  - KS: {drift['ks']:.3f}  PSI des scores: {drift['score_psi']:.3f}"
+                      + (f"  PSI des événements: {drift['event_psi']:.3f}" if 'event_psi' in drift else ""))
+            for alert in drift['alerts']:
+                self._log(f"  - Seuil dépassé: {alert}")
+            if drift['retrain_recommended']:
+                self._log("  Réentraînement recommandé")
+
+        if not save:
+            return None
+        return self.save_result(result, csv_filename, top_k, n_events, stream_path)
+
+    def save_result(self, result: DetectionResult, csv_filename: str, top_k: int = 5,
+                    n_events: int = 3, stream_path: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Sauvegarde les fichiers de résultats d'une détection dans data/results/.
 
-        return True
+        - anomalies_<fichier>.csv: lignes anormales et leur score
+        - anomalies_<fichier>.json: résumé (totaux, taux, modèle, top anomalies)
+        - anomalies_<fichier>.report.json: résumé pré-agrégé pour les graphiques
+        - anomalies_<fichier>.sketch.json: esquisse des scores et des événements (dérive)
+        - anomalies_<fichier>.scores.npz: scores de toutes les lignes (re-seuillage, voir rethreshold.py)
+        - results.sqlite: exécution et anomalies indexées (voir ResultStore, main.py query)
+
+        Args:
+            result: Résultat retourné par detect()
+            csv_filename: Nom du fichier analysé
+            top_k: Nombre d'anomalies les plus sévères du résumé
+            n_events: Nombre d'événements principaux par anomalie
+            stream_path: Flux NDJSON des anomalies, référencé dans le résumé
+
+        Returns:
+            Résumé JSON sauvegardé
+        """
+        if result.n_anomalies > 0:
+            # Sauvegarder les anomalies détectées
+            results_path = self.results_path(csv_filename)
+            results_path.parent.mkdir(parents=True, exist_ok=True)
+            result.anomaly_frame().to_csv(results_path, index=False)
+            self._log(f"\nAnomalies sauvegardées dans: {results_path}")
+
+        if result.report is not None:
+            # Résumé compact utilisé par les graphiques du rapport
+            result.report.save(self.results_path(csv_filename, ".report.json"))
+
+        if result.sketch is not None:
+            # Esquisse à mémoire constante: fusionnable avec celles d'autres exécutions
+            write_json_summary(result.sketch.to_dict(), self.results_path(csv_filename, ".sketch.json"))
+
+        # Scores de toutes les lignes: un autre seuil s'applique ensuite sans rescorer
+        result.save_scores(self.results_path(csv_filename, ".scores.npz"))
+
+        summary = result.summary(top_k, n_events)
+        summary['anomalies_stream'] = str(stream_path) if stream_path else None
+        summary['run_id'] = None
+        if self.result_store is not None:
+            # Exécution et anomalies indexées pour main.py query
+            start = time.perf_counter()
+            summary['run_id'] = self.result_store.add_result(result, Path(csv_filename).name)
+            self._log(f"Exécution {summary['run_id']} enregistrée dans {self.result_store.db_path} "
+                      f"({result.n_anomalies} anomalies, {time.perf_counter() - start:.2f}s)")
+        summary_path = self.results_path(csv_filename, ".json")
+        write_json_summary(summary, summary_path)
+        self._log(f"Résumé JSON: {summary_path}")
+        return summary
 
     def list_available_files(self):
         """Affiche la liste des fichiers CSV disponibles."""
         csv_files = self.find_csv_files()
-        print("\nFichiers CSV disponibles:")
+        self._log("\nFichiers CSV disponibles:")
         if csv_files:
             for f in csv_files:
-                print(f"  - {f.name} (dans {f.parent.name}/)")
+                self._log(f"  - {f.name} (dans {f.parent.name}/)")
         else:
-            print("  Aucun fichier CSV trouvé")
+            self._log("  Aucun fichier CSV trouvé")
@@ -0,0 +1,258 @@
+"""
+Planification de la mémoire des lectures de traces.
+
+À partir de la taille du fichier, du nombre de colonnes, de la précision et
+de la mémoire disponible, le planificateur choisit entre la lecture du
+fichier entier et la lecture par blocs, la taille des blocs, le nombre de
+threads d'analyse CSV et le nombre de processus des traitements parallèles,
+de sorte que l'ensemble reste dans le budget mémoire configuré
+(section memory de data_config.yaml).
+"""
+
+import bz2
+import lzma
+import os
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from utils.compression import compression_of, open_compressed
+from utils.file_utils import get_file_size_mb
+
+# Valeurs utilisées si la section memory de data_config.yaml est absente
+DEFAULT_MEMORY_SETTINGS = {
+    'budget_mb': None,
+    'available_fraction': 0.5,
+    'working_set_factor': 3.0,
+    'compressed_expansion': 8.0,
+    'min_chunksize': 1000,
+}
+
+# Octets par ligne en plus des features (index TaskID, structures pandas)
+ROW_OVERHEAD_BYTES = 96
+# Texte lu pour estimer la longueur moyenne d'une ligne
+SAMPLE_BYTES = 1 << 20
+
+
+def available_memory_mb() -> Optional[float]:
+    """
+    Mémoire vive disponible.
+
+    Returns:
+        Mémoire disponible en MB (psutil, /proc/meminfo ou sysconf), None si inconnue
+    """
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+@dataclass
+class MemoryPlan:
+    """
+    Décision du planificateur pour un fichier.
+
+    Attributes:
+        task: Traitement planifié ('train' ou 'detect')
+        mode: 'memory' (fichier entier) ou 'chunked' (lecture par blocs)
+        chunksize: Lignes par bloc (None en mode 'memory')
+        parse_workers: Threads d'analyse CSV du fichier entier
+        estimated_rows: Nombre de lignes estimé
+        matrix_mb: Taille estimée de la matrice de features complète
+        peak_mb: Mémoire estimée du traitement selon le plan retenu
+        budget_mb: Budget mémoire appliqué
+        reason: Justification de la décision
+    """
+    task: str
+    mode: str
+    chunksize: Optional[int]
+    parse_workers: int
+    estimated_rows: int
+    matrix_mb: float
+    peak_mb: float
+    budget_mb: float
+    reason: str
+
+    def describe(self) -> str:
+        """Résumé d'une ligne de la décision."""
+        if self.mode == 'memory':
+            how = f"fichier entier, {self.parse_workers} thread(s) d'analyse"
+        else:
+            how = f"blocs de {self.chunksize} lignes"
+        return (f"Plan mémoire ({self.task}): {how} - ~{self.estimated_rows} lignes, "
+                f"matrice ~{self.matrix_mb:.0f} MB, pic ~{self.peak_mb:.0f} MB "
+                f"pour un budget de {self.budget_mb:.0f} MB ({self.reason})")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class MemoryPlanner:
+    """
+    Choisit le mode de lecture, la taille des blocs et le parallélisme sous un budget mémoire.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None, max_file_size_mb: Optional[float] = None):
+        """
+        Initialise le planificateur.
+
+        Args:
+            settings: Section memory de data_config.yaml (voir DEFAULT_MEMORY_SETTINGS)
+            max_file_size_mb: Taille au-delà de laquelle un fichier n'est jamais lu en entier
+        """
+        self.settings = dict(DEFAULT_MEMORY_SETTINGS)
+        self.settings.update(settings or {})
+        self.max_file_size_mb = max_file_size_mb
+        self.factor = float(self.settings['working_set_factor'])
+
+    def budget_mb(self) -> float:
+        """
+        Budget mémoire des traitements.
+
+        Returns:
+            budget_mb configuré, borné par la fraction autorisée de la RAM disponible
+        """
+        available = available_memory_mb()
+        share = available * self.settings['available_fraction'] if available else None
+        budget = self.settings['budget_mb']
+        if budget is None:
+            return share if share else 1024.0
+        return min(budget, share) if share else float(budget)
+
+    def estimate_rows(self, file_path: str) -> int:
+        """
+        Estime le nombre de lignes d'un fichier à partir de la longueur moyenne des premières lignes.
+
+        Args:
+            file_path: Chemin du fichier (compressé ou non)
+
+        Returns:
+            Nombre de lignes de données estimé
+        """
+        size = get_file_size_mb(file_path) * 1024 * 1024
+        if compression_of(file_path):
+            size *= self.expansion_ratio(file_path)
+        with open_compressed(file_path) as f:
+            header = f.readline()
+            sample = f.read(SAMPLE_BYTES)
+        lines = sample.count(b"\n")
+        if not sample:
+            return 0
+        if len(sample) < SAMPLE_BYTES:
+            # Fichier entièrement lu: nombre exact
+            return lines + (not sample.endswith(b"\n"))
+        return max(int((size - len(header)) / (len(sample) / max(lines, 1))), 1)
+
+    def expansion_ratio(self, file_path: str) -> float:
+        """
+        Rapport taille décompressée / taille compressée, mesuré sur le début du fichier.
+
+        Args:
+            file_path: Chemin du fichier compressé
+
+        Returns:
+            Rapport mesuré, ou compressed_expansion si le format ne peut pas être
+            décompressé dans ce processus (zstd sans le module zstandard)
+        """
+        codec = compression_of(file_path)
+        try:
+            if codec == 'gzip':
+                decompressor = zlib.decompressobj(wbits=31)
+            elif codec == 'bz2':
+                decompressor = bz2.BZ2Decompressor()
+            elif codec == 'xz':
+                decompressor = lzma.LZMADecompressor()
+            else:
+                import zstandard
+                decompressor = zstandard.ZstdDecompressor().decompressobj()
+            with open(file_path, "rb") as f:
+                head = f.read(SAMPLE_BYTES // 4)
+            output = decompressor.decompress(head)
+        except (ImportError, OSError, ValueError, EOFError, zlib.error):
+            return float(self.settings['compressed_expansion'])
+        return len(output) / len(head) if head and output else float(self.settings['compressed_expansion'])
+
+    def row_bytes(self, n_features: int, itemsize: int) -> int:
+        """Octets d'une ligne de la matrice de features en mémoire."""
+        return n_features * itemsize + ROW_OVERHEAD_BYTES
+
+    def plan(self, file_path: str, n_features: int, itemsize: int, task: str = 'detect',
+             max_parse_workers: Optional[int] = None, resident_rows: int = 0) -> MemoryPlan:
+        """
+        Planifie la lecture d'un fichier.
+
+        En mode 'memory', le pic est working_set_factor fois la matrice (lecture,
+        normalisation, scores); l'analyse multi-thread ajoute une copie (blocs puis
+        assemblage) et n'est retenue que si elle tient dans le budget. En mode
+        'chunked', les blocs sont dimensionnés pour que working_set_factor blocs,
+        plus les lignes gardées en mémoire (resident_rows), tiennent dans le budget.
+
+        Args:
+            file_path: Chemin du fichier
+            n_features: Colonnes de features lues
+            itemsize: Octets par valeur (précision du modèle)
+            task: 'train' ou 'detect'
+            max_parse_workers: Threads d'analyse CSV autorisés (None = nombre de CPU)
+            resident_rows: Lignes conservées pendant une lecture par blocs (ex: échantillon d'entraînement)
+
+        Returns:
+            Plan retenu
+        """
+        budget = self.budget_mb()
+        rows = self.estimate_rows(file_path)
+        row_mb = self.row_bytes(n_features, itemsize) / (1024 * 1024)
+        matrix_mb = rows * row_mb
+        size_mb = get_file_size_mb(file_path)
+        workers = max_parse_workers or os.cpu_count() or 1
+        if compression_of(file_path):
+            workers = 1
+
+        peak = matrix_mb * self.factor
+        if self.max_file_size_mb and size_mb > self.max_file_size_mb:
+            reason = f"fichier de {size_mb:.0f} MB au-delà de max_file_size_mb={self.max_file_size_mb}"
+        elif peak > budget:
+            reason = "le fichier entier dépasse le budget"
+        else:
+            # Une copie de plus pendant l'assemblage des plages analysées en parallèle
+            parallel = workers > 1 and peak + matrix_mb <= budget
+            return MemoryPlan(task, 'memory', None, workers if parallel else 1, rows, matrix_mb,
+                              peak + (matrix_mb if parallel else 0), budget,
+                              "tient dans le budget" if parallel or workers == 1
+                              else "analyse sur un seul thread pour tenir dans le budget")
+
+        resident_mb = min(resident_rows, rows) * row_mb * self.factor
+        chunk_budget = max(budget - resident_mb, 0)
+        if resident_mb >= budget:
+            reason += "; l'échantillon d'entraînement dépasse à lui seul le budget"
+        chunksize = int(chunk_budget / (self.factor * row_mb)) if row_mb else rows
+        chunksize = max(min(chunksize, max(rows, 1)), int(self.settings['min_chunksize']))
+        return MemoryPlan(task, 'chunked', chunksize, 1, rows, matrix_mb,
+                          resident_mb + chunksize * row_mb * self.factor, budget, reason)
+
+    def plan_workers(self, per_worker_mb: float, requested: Optional[int] = None) -> int:
+        """
+        Nombre de processus parallèles tenant ensemble dans le budget.
+
+        Args:
+            per_worker_mb: Mémoire estimée d'un processus
+            requested: Nombre demandé (None = nombre de CPU)
+
+        Returns:
+            Nombre de processus (au moins 1)
+        """
+        requested = requested or os.cpu_count() or 1
+        if per_worker_mb <= 0:
+            return requested
+        return max(1, min(requested, int(self.budget_mb() // per_worker_mb)))
@@ -0,0 +1,92 @@
+"""
+Validation du mode float32 par comparaison avec le pipeline float64.
+
+Deux détecteurs sont entraînés avec les mêmes paramètres et la même graine,
+l'un en float64 et l'autre en float32, puis comparés sur des traces de
+référence: écart des scores, corrélation de rang, accord des prédictions
+et recouvrement des anomalies les plus sévères.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .auto_tuner import rank_correlation
+from .hdfs_detector import HDFSDetector
+
+
+def _train(precision: str, train_file: str, project_root: Optional[str],
+           contamination: float) -> Dict[str, Any]:
+    """Entraîne un détecteur dans la précision demandée et mesure le coût."""
+    detector = HDFSDetector(project_root, contamination=contamination)
+    detector.params['precision'] = precision
+
+    data, feature_names = detector.load_data(train_file)
+    detector.feature_names = feature_names
+    start = time.perf_counter()
+    detector.train_model(detector.preprocess_data(data))
+    return {
+        'detector': detector,
+        'train_time_s': time.perf_counter() - start,
+        'train_matrix_mb': data.memory_usage(index=False).sum() / (1024 * 1024),
+    }
+
+
+def compare_precisions(train_file: str, reference_files: List[str], project_root: Optional[str] = None,
+                       contamination: float = 0.01, top_k: int = 100) -> Dict[str, Any]:
+    """
+    Compare les scores float32 et float64 sur des traces de référence.
+
+    Args:
+        train_file: Chemin du fichier CSV d'entraînement
+        reference_files: Chemins des fichiers CSV de référence à scorer
+        project_root: Chemin racine du projet
+        contamination: Proportion d'anomalies attendues
+        top_k: Nombre d'anomalies les plus sévères comparées
+
+    Returns:
+        Rapport de validation (un bloc par fichier de référence)
+    """
+    runs = {precision: _train(precision, train_file, project_root, contamination)
+            for precision in ('float64', 'float32')}
+
+    report = {
+        'train_file': str(train_file),
+        'train_time_s': {p: round(r['train_time_s'], 3) for p, r in runs.items()},
+        'train_matrix_mb': {p: round(r['train_matrix_mb'], 2) for p, r in runs.items()},
+        'references': [],
+    }
+
+    for reference_file in reference_files:
+        scores = {}
+        timings = {}
+        memory = {}
+        for precision, run in runs.items():
+            detector = run['detector']
+            data, _ = detector.load_data(reference_file)
+            memory[precision] = round(data.memory_usage(index=False).sum() / (1024 * 1024), 2)
+            start = time.perf_counter()
+            _, run_scores = detector.predict_anomalies(detector.preprocess_data(data))
+            timings[precision] = round(time.perf_counter() - start, 3)
+            scores[precision] = np.asarray(run_scores)
+
+        diff = np.abs(scores['float64'] - scores['float32'])
+        k = min(top_k, len(diff))
+        top64 = set(np.argsort(scores['float64'])[:k])
+        top32 = set(np.argsort(scores['float32'])[:k])
+
+        report['references'].append({
+            'file': str(reference_file),
+            'rows': len(diff),
+            'matrix_mb': memory,
+            'score_time_s': timings,
+            'max_abs_diff': float(diff.max()),
+            'mean_abs_diff': float(diff.mean()),
+            'rank_correlation': round(rank_correlation(scores['float64'], scores['float32']), 6),
+            'label_agreement': float(np.mean((scores['float64'] < 0) == (scores['float32'] < 0))),
+            'top_k': k,
+            'top_k_overlap': len(top64 & top32) / k if k else 1.0,
+        })
+
+    return report
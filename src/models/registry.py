@@ -0,0 +1,363 @@
+"""
+Registre versionné des modèles et cache LRU des modèles chargés.
+
+Chaque modèle nommé (par cluster, par groupe de datanodes...) possède des
+versions immuables et des alias (ex: "current") qui pointent vers une
+version:
+
+    models/registry/<nom>/v0001/model.pkl
+    models/registry/<nom>/v0001/metadata.json
+    models/registry/<nom>/aliases.json
+
+Le cache garde en mémoire les modèles déjà chargés dans le processus, dans
+la limite d'un budget mémoire, pour passer d'un modèle à l'autre sans
+relire ni désérialiser les fichiers.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .schema import schema_hash
+
+MODEL_FILENAME = "model.pkl"
+METADATA_FILENAME = "metadata.json"
+ALIASES_FILENAME = "aliases.json"
+ALIASES_LOCK_FILENAME = "aliases.lock"
+DEFAULT_ALIAS = "current"
+
+
+def read_model_file(model_path) -> Tuple[Dict[str, Any], str, int]:
+    """
+    Lit et désérialise un fichier de modèle.
+
+    Args:
+        model_path: Chemin du fichier de modèle
+
+    Returns:
+        Tuple contenant (contenu du modèle, hash SHA-256 du fichier, taille en octets)
+    """
+    with open(model_path, 'rb') as f:
+        payload = f.read()
+    return pickle.loads(payload), hashlib.sha256(payload).hexdigest(), len(payload)
+
+
+def _write_json(data: Dict[str, Any], path: Path):
+    """Écrit un fichier JSON de façon atomique."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Verrou exclusif entre processus, tenu pendant le bloc with."""
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class ModelCache:
+    """
+    Cache LRU en mémoire des modèles chargés, borné par un budget en octets.
+
+    La clé inclut la date de modification et la taille du fichier: un
+    fichier réécrit est relu automatiquement. La taille d'un modèle est
+    estimée par celle de son fichier sérialisé.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialise un cache vide.
+
+        Args:
+            max_bytes: Budget mémoire (le modèle le plus récent est toujours gardé)
+        """
+        self.max_bytes = int(max_bytes)
+        self.entries: "OrderedDict[tuple, Tuple[Dict[str, Any], str, int]]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, model_path) -> Tuple[Dict[str, Any], str]:
+        """
+        Retourne le contenu d'un fichier de modèle, depuis le cache si possible.
+
+        Args:
+            model_path: Chemin du fichier de modèle
+
+        Returns:
+            Tuple contenant (contenu du modèle, hash SHA-256 du fichier)
+        """
+        path = Path(model_path).resolve()
+        stat = path.stat()
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], entry[1]
+
+        model_data, model_hash, size = read_model_file(path)
+        with self._lock:
+            self.misses += 1
+            if key not in self.entries:
+                self.entries[key] = (model_data, model_hash, size)
+                self.total_bytes += size
+                self._evict()
+        return model_data, model_hash
+
+    def _evict(self):
+        """Retire les modèles les moins récemment utilisés au-delà du budget."""
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, _, size) = self.entries.popitem(last=False)
+            self.total_bytes -= size
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Statistiques du cache.
+
+        Returns:
+            Dictionnaire (modèles en mémoire, octets utilisés, budget, succès, échecs)
+        """
+        return {
+            'models': len(self.entries),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+# Cache partagé par tous les détecteurs du processus
+_MODEL_CACHE: Optional[ModelCache] = None
+
+
+def get_model_cache(max_bytes: int) -> ModelCache:
+    """
+    Retourne le cache de modèles du processus (créé au premier appel).
+
+    Args:
+        max_bytes: Budget mémoire; le plus grand budget demandé est conservé
+
+    Returns:
+        Cache partagé
+    """
+    global _MODEL_CACHE
+    if _MODEL_CACHE is None:
+        _MODEL_CACHE = ModelCache(max_bytes)
+    elif max_bytes > _MODEL_CACHE.max_bytes:
+        _MODEL_CACHE.max_bytes = int(max_bytes)
+    return _MODEL_CACHE
+
+
+class ModelRegistry:
+    """Registre de modèles nommés, versionnés et aliasés, stocké sur disque."""
+
+    def __init__(self, root):
+        """
+        Initialise le registre.
+
+        Args:
+            root: Dossier du registre (ex: models/registry)
+        """
+        self.root = Path(root)
+
+    def model_dir(self, name: str) -> Path:
+        """
+        Dossier d'un modèle du registre.
+
+        Args:
+            name: Nom du modèle
+
+        Returns:
+            Chemin du dossier
+
+        Raises:
+            ValueError: Si le nom sortirait du registre (séparateur de chemin, '.' ou '..')
+        """
+        if not name or name == "." or ".." in name or "/" in name or "\\" in name:
+            raise ValueError(f"Nom de modèle invalide: {name!r}")
+        return self.root / name
+
+    def names(self) -> List[str]:
+        """Noms des modèles enregistrés."""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    def versions(self, name: str) -> List[str]:
+        """
+        Versions d'un modèle, de la plus ancienne à la plus récente.
+
+        Args:
+            name: Nom du modèle
+
+        Returns:
+            Liste des versions (ex: ['v0001', 'v0002'])
+        """
+        model_dir = self.model_dir(name)
+        if not model_dir.exists():
+            return []
+        return sorted(p.name for p in model_dir.iterdir()
+                      if p.is_dir() and (p / MODEL_FILENAME).exists())
+
+    def aliases(self, name: str) -> Dict[str, str]:
+        """
+        Alias d'un modèle.
+
+        Args:
+            name: Nom du modèle
+
+        Returns:
+            Dictionnaire alias -> version
+        """
+        path = self.model_dir(name) / ALIASES_FILENAME
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def set_alias(self, name: str, alias: str, version: str):
+        """
+        Fait pointer un alias vers une version existante.
+
+        Args:
+            name: Nom du modèle
+            alias: Nom de l'alias (ex: 'current')
+            version: Version ciblée
+        """
+        if version not in self.versions(name):
+            raise ValueError(f"Version inconnue pour {name}: {version}")
+        model_dir = self.model_dir(name)
+        # Lecture-modification-écriture sous verrou: deux enregistrements concurrents ne perdent pas d'alias
+        with _file_lock(model_dir / ALIASES_LOCK_FILENAME):
+            aliases = self.aliases(name)
+            aliases[alias] = version
+            _write_json(aliases, model_dir / ALIASES_FILENAME)
+
+    def resolve(self, name: str, ref: str = DEFAULT_ALIAS) -> Optional[str]:
+        """
+        Résout un alias, une version ou 'latest' en numéro de version.
+
+        Args:
+            name: Nom du modèle
+            ref: Alias, version ou 'latest'
+
+        Returns:
+            Version, ou None si introuvable
+        """
+        versions = self.versions(name)
+        if ref in versions:
+            return ref
+        if ref == "latest":
+            return versions[-1] if versions else None
+        return self.aliases(name).get(ref)
+
+    def model_path(self, name: str, ref: str = DEFAULT_ALIAS) -> Optional[Path]:
+        """
+        Chemin du fichier de modèle d'une version.
+
+        Args:
+            name: Nom du modèle
+            ref: Alias, version ou 'latest'
+
+        Returns:
+            Chemin, ou None si introuvable
+        """
+        version = self.resolve(name, ref)
+        return self.model_dir(name) / version / MODEL_FILENAME if version else None
+
+    def metadata(self, name: str, ref: str = DEFAULT_ALIAS) -> Optional[Dict[str, Any]]:
+        """
+        Métadonnées d'une version.
+
+        Args:
+            name: Nom du modèle
+            ref: Alias, version ou 'latest'
+
+        Returns:
+            Dictionnaire de métadonnées, ou None si introuvable
+        """
+        version = self.resolve(name, ref)
+        if not version:
+            return None
+        with open(self.model_dir(name) / version / METADATA_FILENAME) as f:
+            return json.load(f)
+
+    def _new_version_dir(self, name: str) -> Path:
+        """Réserve le numéro de version suivant (mkdir atomique, sûr entre processus)."""
+        model_dir = self.model_dir(name)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        existing = [p.name for p in model_dir.iterdir() if p.is_dir() and p.name.startswith("v")]
+        number = max((int(v[1:]) for v in existing if v[1:].isdigit()), default=0) + 1
+        while True:
+            version_dir = model_dir / f"v{number:04d}"
+            try:
+                version_dir.mkdir()
+                return version_dir
+            except FileExistsError:
+                number += 1
+
+    def register(self, detector, name: str, metadata: Optional[Dict[str, Any]] = None,
+                 aliases: Tuple[str, ...] = (DEFAULT_ALIAS,)) -> Optional[str]:
+        """
+        Sauvegarde le modèle entraîné d'un détecteur comme nouvelle version.
+
+        Args:
+            detector: Détecteur entraîné
+            name: Nom du modèle
+            metadata: Métadonnées complémentaires (fichier d'entraînement, lignes, durée...)
+            aliases: Alias à faire pointer vers la nouvelle version
+
+        Returns:
+            Version créée, ou None si la sauvegarde a échoué
+        """
+        version_dir = self._new_version_dir(name)
+        try:
+            if not detector.save_model(version_dir / MODEL_FILENAME):
+                shutil.rmtree(version_dir, ignore_errors=True)
+                return None
+
+            feature_names = detector.feature_names or []
+            entry = {
+                'name': name,
+                'version': version_dir.name,
+                'model_type': detector.__class__.__name__,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'model_hash': detector.model_hash,
+                'n_features': len(feature_names),
+                'feature_schema_hash': schema_hash(feature_names),
+            }
+            entry.update(metadata or {})
+            _write_json(entry, version_dir / METADATA_FILENAME)
+        except BaseException:
+            # Pas de dossier de version vide ou incomplet en cas d'échec
+            shutil.rmtree(version_dir, ignore_errors=True)
+            raise
+
+        for alias in aliases:
+            self.set_alias(name, alias, version_dir.name)
+        return version_dir.name
@@ -0,0 +1,202 @@
+"""
+Résumé pré-agrégé d'une détection, construit bloc par bloc.
+
+Le résumé contient un histogramme des scores à pas fixe (ScoreHistogram),
+le minimum et le maximum, et les totaux par événement des lignes anormales. Sa taille ne
+dépend que du nombre de classes et d'événements: les graphiques du rapport
+sont tracés à partir de lui, quel que soit le nombre d'anomalies.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .score_histogram import DEFAULT_BIN_WIDTH, ScoreHistogram
+
+
+class ReportSummary:
+    """
+    Histogramme des scores et totaux par événement, mis à jour de façon incrémentale.
+
+    Les classes de l'histogramme sont [k·pas, (k+1)·pas[ pour k entier: elles
+    ne dépendent pas des données, et la classe k < 0 contient exactement les
+    scores négatifs (anormaux au seuil 0). Deux résumés se fusionnent en
+    additionnant leurs compteurs.
+    """
+
+    def __init__(self, bin_width: float = DEFAULT_BIN_WIDTH, threshold: float = 0.0):
+        """
+        Initialise un résumé vide.
+
+        Args:
+            bin_width: Largeur des classes de l'histogramme des scores
+            threshold: Seuil des anomalies (score < threshold)
+        """
+        self.scores = ScoreHistogram(bin_width)
+        self.threshold = float(threshold)
+        self.n_anomalies = 0
+        self.event_totals = pd.Series(dtype=np.float64)
+
+    @property
+    def bin_width(self) -> float:
+        return self.scores.bin_width
+
+    @property
+    def n_rows(self) -> int:
+        return self.scores.n_rows
+
+    @property
+    def score_min(self) -> float:
+        return self.scores.score_min
+
+    @property
+    def score_max(self) -> float:
+        return self.scores.score_max
+
+    def update(self, scores: np.ndarray, anomaly_features: Optional[pd.DataFrame] = None):
+        """
+        Ajoute les scores d'un bloc et les features de ses lignes anormales.
+
+        Args:
+            scores: Scores de toutes les lignes du bloc
+            anomaly_features: Compteurs d'événements des lignes anormales du bloc
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        self.scores.update(scores)
+        self.n_anomalies += int(np.count_nonzero(scores < self.threshold))
+
+        if anomaly_features is not None and len(anomaly_features):
+            totals = anomaly_features.select_dtypes(include="number").sum()
+            self.event_totals = self.event_totals.add(totals, fill_value=0)
+
+    def merge(self, other: "ReportSummary") -> "ReportSummary":
+        """
+        Fusionne un autre résumé (autre bloc ou autre fichier).
+
+        Args:
+            other: Résumé de même pas d'histogramme
+
+        Returns:
+            Le résumé fusionné
+        """
+        if other.bin_width != self.bin_width:
+            raise ValueError("Résumés incompatibles: pas d'histogramme différents")
+        self.scores.merge(other.scores)
+        self.n_anomalies += other.n_anomalies
+        self.event_totals = self.event_totals.add(other.event_totals, fill_value=0)
+        return self
+
+    def histogram(self, anomalies_only: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Histogramme des scores.
+
+        Args:
+            anomalies_only: Ne garder que les classes sous le seuil
+
+        Returns:
+            Tuple contenant (bornes gauches des classes, effectifs), classes triées
+        """
+        edges, counts = self.scores.histogram()
+        if anomalies_only:
+            keep = edges < self.threshold
+            edges, counts = edges[keep], counts[keep]
+        return edges, counts
+
+    def quantiles(self, q: Sequence[float]) -> np.ndarray:
+        """
+        Quantiles approchés des scores (erreur inférieure à la largeur d'une classe).
+
+        Args:
+            q: Quantiles demandés, entre 0 et 1
+
+        Returns:
+            Valeurs des quantiles (interpolation linéaire dans la classe)
+        """
+        return self.scores.quantiles(q)
+
+    def top_events(self, n: int = 10) -> pd.Series:
+        """
+        Événements les plus fréquents dans les anomalies.
+
+        Args:
+            n: Nombre d'événements
+
+        Returns:
+            Totaux triés par ordre décroissant
+        """
+        return self.event_totals.sort_values(ascending=False).head(n)
+
+    def to_dict(self) -> Dict:
+        """Représentation sérialisable en JSON."""
+        quantile_levels = [0.001, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+        return {
+            'bin_width': self.bin_width,
+            'threshold': self.threshold,
+            'n_rows': self.n_rows,
+            'n_anomalies': self.n_anomalies,
+            'score_min': self.score_min if self.n_rows else None,
+            'score_max': self.score_max if self.n_rows else None,
+            'quantiles': {str(level): float(value)
+                          for level, value in zip(quantile_levels, self.quantiles(quantile_levels))}
+            if self.n_rows else {},
+            'score_bins': self.scores.to_dict()['score_bins'],
+            'event_totals': {str(name): float(total) for name, total in self.event_totals.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ReportSummary":
+        """Reconstruit un résumé depuis to_dict()."""
+        summary = cls(data['bin_width'], data.get('threshold', 0.0))
+        summary.scores = ScoreHistogram.from_dict(data)
+        summary.n_anomalies = data['n_anomalies']
+        summary.event_totals = pd.Series(data['event_totals'], dtype=np.float64)
+        return summary
+
+    @classmethod
+    def from_frame(cls, anomaly_data: pd.DataFrame, bin_width: float = DEFAULT_BIN_WIDTH) -> "ReportSummary":
+        """
+        Construit un résumé à partir d'un fichier d'anomalies déjà chargé.
+
+        Args:
+            anomaly_data: Anomalies avec une colonne 'anomaly_score'
+            bin_width: Largeur des classes de l'histogramme
+
+        Returns:
+            Résumé des anomalies
+        """
+        summary = cls(bin_width)
+        features = anomaly_data.drop(columns=['anomaly_score'])
+        summary.update(anomaly_data['anomaly_score'].to_numpy(), features)
+        return summary
+
+    def save(self, path):
+        """
+        Sauvegarde le résumé en JSON (écriture atomique).
+
+        Args:
+            path: Chemin du fichier
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path) -> "ReportSummary":
+        """
+        Charge un résumé sauvegardé par save().
+
+        Args:
+            path: Chemin du fichier
+
+        Returns:
+            Résumé
+        """
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,317 @@
+"""
+Base locale des résultats de détection.
+
+Chaque détection enregistre une exécution (run) et ses anomalies dans une
+base SQLite (data/results/results.sqlite par défaut), en transactions par
+lots. Les anomalies sont indexées par TaskID, exécution, score et
+événement, ce qui permet de répondre sans relire les CSV de résultats à des
+questions comme « quelles exécutions ont signalé ce bloc ? » ou « les 100
+anomalies les plus sévères depuis une semaine ».
+
+    runs            une ligne par détection (fichier, modèle, seuil, totaux)
+    anomalies       (run_id, position) -> TaskID, score
+    events          noms des événements
+    anomaly_events  événements principaux de chaque anomalie
+"""
+
+import re
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Valeurs utilisées si la section result_store de data_config.yaml est absente
+DEFAULT_RESULT_STORE_SETTINGS = {
+    'enabled': True,
+    'path': 'data/results/results.sqlite',
+    'events_per_anomaly': 3,
+    'batch_size': 100000,
+    'cache_mb': 64,
+}
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS runs ("
+    " run_id INTEGER PRIMARY KEY,"
+    " started_at REAL NOT NULL,"
+    " source TEXT,"
+    " source_name TEXT,"
+    " model_type TEXT,"
+    " model_name TEXT,"
+    " model_version TEXT,"
+    " model_hash TEXT,"
+    " threshold REAL,"
+    " total_rows INTEGER,"
+    " n_anomalies INTEGER,"
+    " status TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_runs_source ON runs (source_name)",
+    "CREATE TABLE IF NOT EXISTS anomalies ("
+    " run_id INTEGER NOT NULL,"
+    " position INTEGER NOT NULL,"
+    " task_id TEXT,"
+    " score REAL NOT NULL,"
+    " PRIMARY KEY (run_id, position)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS idx_anomalies_task ON anomalies (task_id)",
+    "CREATE INDEX IF NOT EXISTS idx_anomalies_score ON anomalies (score)",
+    "CREATE TABLE IF NOT EXISTS events (event_id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)",
+    # Clé (événement, exécution, position): une seule structure sert à la fois
+    # l'index par événement et l'affichage (un accès par événement connu)
+    "CREATE TABLE IF NOT EXISTS anomaly_events ("
+    " event_id INTEGER NOT NULL,"
+    " run_id INTEGER NOT NULL,"
+    " position INTEGER NOT NULL,"
+    " count REAL NOT NULL,"
+    " PRIMARY KEY (event_id, run_id, position)) WITHOUT ROWID",
+]
+
+
+def parse_since(value: str) -> float:
+    """
+    Convertit une borne de temps en horodatage.
+
+    Args:
+        value: Durée relative ("7d", "12h", "30m") ou date ISO ("2024-05-01", "2024-05-01T08:00")
+
+    Returns:
+        Horodatage Unix
+    """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([dhm])", value.strip())
+    if match:
+        seconds = {'d': 86400, 'h': 3600, 'm': 60}[match.group(2)]
+        return time.time() - float(match.group(1)) * seconds
+    return datetime.fromisoformat(value.strip()).timestamp()
+
+
+def top_events_matrix(values: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Événements non nuls les plus fréquents de chaque ligne, sans boucle Python.
+
+    Args:
+        values: Matrice (lignes × événements)
+        k: Nombre d'événements gardés par ligne
+
+    Returns:
+        Tuple (numéros de ligne, numéros de colonne, valeurs) des couples gardés
+    """
+    if values.size == 0 or k <= 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0)
+    k = min(k, values.shape[1])
+    columns = np.argpartition(-values, k - 1, axis=1)[:, :k]
+    rows = np.repeat(np.arange(len(values)), k)
+    columns = columns.ravel()
+    kept = values[rows, columns]
+    nonzero = kept > 0
+    return rows[nonzero], columns[nonzero], kept[nonzero]
+
+
+class ResultStore:
+    """Base SQLite des exécutions de détection et de leurs anomalies, partagée entre processus."""
+
+    def __init__(self, db_path: str, events_per_anomaly: int = 3, batch_size: int = 100000,
+                 cache_mb: int = 64, timeout: float = 30.0):
+        """
+        Initialise la base (ouverte au premier accès).
+
+        Args:
+            db_path: Chemin du fichier SQLite
+            events_per_anomaly: Événements principaux enregistrés par anomalie
+            batch_size: Anomalies par transaction
+            cache_mb: Cache de pages SQLite de la connexion (mises à jour des index en insertion)
+            timeout: Attente maximale (secondes) sur un verrou tenu par un autre processus
+        """
+        self.db_path = Path(db_path)
+        self.events_per_anomaly = int(events_per_anomaly)
+        self.batch_size = int(batch_size)
+        self.cache_mb = int(cache_mb)
+        self.timeout = timeout
+        self._connection = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Une connexion SQLite ne se transmet pas entre processus
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        return state
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connexion SQLite, créée à la demande avec le schéma de la base."""
+        if self._connection is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.db_path), timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA cache_size={-1024 * self.cache_mb}")
+            with connection:
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+            self._connection = connection
+        return self._connection
+
+    def _event_ids(self, names: List[str]) -> np.ndarray:
+        """Identifiants des événements (créés au besoin), dans l'ordre de names."""
+        with self.connection:
+            self.connection.executemany("INSERT OR IGNORE INTO events (name) VALUES (?)",
+                                        [(name,) for name in names])
+        ids = dict(self.connection.execute("SELECT name, event_id FROM events").fetchall())
+        return np.array([ids[name] for name in names], dtype=np.int64)
+
+    def add_result(self, result, source_name: Optional[str] = None) -> int:
+        """
+        Enregistre une détection et toutes ses anomalies.
+
+        L'exécution est créée avec le statut 'running', les anomalies sont
+        insérées par transactions de batch_size lignes, puis l'exécution passe
+        au statut 'done': une exécution interrompue reste identifiable.
+
+        Args:
+            result: DetectionResult
+            source_name: Nom du fichier analysé (défaut: nom de result.source)
+
+        Returns:
+            Identifiant de l'exécution
+        """
+        info = result.model_info
+        source = str(result.source) if result.source else None
+        if source_name is None and source:
+            source_name = Path(source).name
+        with self.connection:
+            run_id = self.connection.execute(
+                "INSERT INTO runs (started_at, source, source_name, model_type, model_name, model_version,"
+                " model_hash, threshold, total_rows, n_anomalies, status)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'running')",
+                (time.time(), source, source_name, info.get('model_type'), info.get('model_name'),
+                 str(info.get('model_version')) if info.get('model_version') is not None else None,
+                 info.get('model_hash'), float(result.threshold), len(result), result.n_anomalies)
+            ).lastrowid
+
+        event_ids = None
+        if result.features is not None and self.events_per_anomaly > 0:
+            event_ids = self._event_ids([str(name) for name in result.features.columns])
+
+        row_ids = np.asarray(result.row_ids)
+        for positions in self._batches(result.anomaly_indices):
+            # Lignes triées par score: insertions groupées dans l'index des scores
+            positions = positions[np.argsort(result.scores[positions], kind='stable')]
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO anomalies (run_id, position, task_id, score) VALUES (?, ?, ?, ?)",
+                    zip([run_id] * len(positions), positions.tolist(),
+                        row_ids[positions].astype(str).tolist(),
+                        result.scores[positions].astype(float).tolist())
+                )
+                rows = result._feature_rows(positions) if event_ids is not None else None
+                if rows is not None:
+                    line, column, count = top_events_matrix(rows.to_numpy(dtype=np.float64),
+                                                            self.events_per_anomaly)
+                    # Triées par événement puis position: ajouts en fin de chaque partition
+                    order = np.lexsort((positions[line], column))
+                    self.connection.executemany(
+                        "INSERT INTO anomaly_events (event_id, run_id, position, count) VALUES (?, ?, ?, ?)",
+                        zip(event_ids[column[order]].tolist(), [run_id] * len(order),
+                            positions[line[order]].tolist(), count[order].tolist())
+                    )
+
+        with self.connection:
+            self.connection.execute("UPDATE runs SET status = 'done' WHERE run_id = ?", (run_id,))
+        return run_id
+
+    def _batches(self, positions: np.ndarray) -> Iterator[np.ndarray]:
+        for start in range(0, len(positions), self.batch_size):
+            yield positions[start:start + self.batch_size]
+
+    def runs(self, since: Optional[float] = None, source: Optional[str] = None,
+             limit: int = 50) -> pd.DataFrame:
+        """
+        Liste les exécutions, de la plus récente à la plus ancienne.
+
+        Args:
+            since: Horodatage minimum (voir parse_since)
+            source: Nom (ou partie du nom) du fichier analysé
+            limit: Nombre maximum d'exécutions
+
+        Returns:
+            DataFrame des exécutions
+        """
+        where, params = self._run_filters(since, source)
+        frame = pd.read_sql_query(
+            "SELECT run_id, started_at, source_name, model_name, model_version, threshold,"
+            " total_rows, n_anomalies, status FROM runs r"
+            f"{where} ORDER BY started_at DESC LIMIT ?", self.connection, params=params + [int(limit)]
+        )
+        frame['started_at'] = pd.to_datetime(frame['started_at'], unit='s').dt.floor('s')
+        return frame
+
+    def _run_filters(self, since: Optional[float], source: Optional[str],
+                     run_id: Optional[int] = None) -> Tuple[str, list]:
+        """Clause WHERE sur la table runs (alias r)."""
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("r.started_at >= ?")
+            params.append(since)
+        if source:
+            clauses.append("r.source_name LIKE ?")
+            params.append(f"%{source}%")
+        if run_id is not None:
+            clauses.append("r.run_id = ?")
+            params.append(int(run_id))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query_anomalies(self, task_id: Optional[str] = None, run_id: Optional[int] = None,
+                        since: Optional[float] = None, source: Optional[str] = None,
+                        event: Optional[str] = None, max_score: Optional[float] = None,
+                        limit: int = 100) -> pd.DataFrame:
+        """
+        Recherche des anomalies, de la plus sévère (score le plus bas) à la moins sévère.
+
+        Args:
+            task_id: TaskID exacte (toutes les exécutions qui l'ont signalée)
+            run_id: Exécution
+            since: Horodatage minimum de l'exécution (voir parse_since)
+            source: Nom (ou partie du nom) du fichier analysé
+            event: Nom exact d'un événement présent parmi les événements principaux
+            max_score: Score maximum
+            limit: Nombre maximum d'anomalies
+
+        Returns:
+            DataFrame (run_id, started_at, source_name, task_id, score, position, events)
+        """
+        where, params = self._run_filters(since, source, run_id)
+        clauses = [where[len(" WHERE "):]] if where else []
+        if task_id is not None:
+            clauses.append("a.task_id = ?")
+            params.append(str(task_id))
+        if max_score is not None:
+            clauses.append("a.score <= ?")
+            params.append(float(max_score))
+        if event is not None:
+            # Parcours par score croissant, présence de l'événement vérifiée par clé
+            clauses.append("EXISTS (SELECT 1 FROM anomaly_events e WHERE e.event_id ="
+                           " (SELECT event_id FROM events WHERE name = ?)"
+                           " AND e.run_id = a.run_id AND e.position = a.position)")
+            params.append(event)
+        condition = " WHERE " + " AND ".join(clauses) if clauses else ""
+
+        # Événements principaux de chaque anomalie, du plus au moins fréquent
+        events = ("(SELECT group_concat(name || '=' || printf('%g', count), ', ') FROM"
+                  " (SELECT ev.name, x.count FROM events ev CROSS JOIN anomaly_events x"
+                  "  ON x.event_id = ev.event_id AND x.run_id = a.run_id AND x.position = a.position"
+                  "  ORDER BY x.count DESC))")
+        frame = pd.read_sql_query(
+            f"SELECT a.run_id, r.started_at, r.source_name, a.task_id, a.score, a.position, {events} AS events"
+            f" FROM anomalies a JOIN runs r ON r.run_id = a.run_id{condition}"
+            " ORDER BY a.score LIMIT ?", self.connection, params=params + [int(limit)]
+        )
+        frame['started_at'] = pd.to_datetime(frame['started_at'], unit='s').dt.floor('s')
+        frame['events'] = frame['events'].fillna('')
+        return frame
+
+    def close(self):
+        """Ferme la connexion SQLite."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,164 @@
+"""
+Écriture des résultats de détection dans des formats lisibles par machine.
+
+Les anomalies sont écrites en NDJSON (un objet JSON par ligne) bloc par
+bloc pendant la détection: la liste complète n'est jamais construite en
+mémoire pour être sérialisée. Le résumé JSON est écrit à la fin.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .detection_result import _to_python
+
+
+def _json_default(value: Any) -> Any:
+    """Convertit les types NumPy et les chemins pour json.dump."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def write_json_summary(summary: Dict[str, Any], path):
+    """
+    Écrit le résumé JSON d'une détection (écriture atomique).
+
+    Args:
+        summary: Résumé (voir DetectionResult.summary)
+        path: Chemin du fichier
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False, default=_json_default)
+    os.replace(tmp_path, path)
+
+
+class AnomalyStreamWriter:
+    """
+    Flux NDJSON des anomalies, alimenté bloc par bloc pendant la détection.
+
+    Chaque ligne contient la position de la séquence, son TaskID, son score
+    et ses compteurs d'événements non nuls. Le fichier n'apparaît sous son
+    nom définitif qu'à la fermeture (pas de fichier partiel en cas d'erreur,
+    sauf en mode resumable où le fichier partiel est gardé pour la reprise).
+    """
+
+    def __init__(self, path, resumable: bool = False, resume_offset: Optional[int] = None):
+        """
+        Ouvre le flux.
+
+        Args:
+            path: Chemin du fichier NDJSON
+            resumable: Fichier partiel à nom fixe (<nom>.partial), repris par une
+                détection interrompue; sinon le nom contient le PID
+            resume_offset: Reprendre le fichier partiel existant, tronqué à cette
+                taille (valeur renvoyée par checkpoint())
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.resumable = resumable
+        if resumable:
+            self._tmp_path = self.partial_path(self.path)
+        else:
+            self._tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+
+        if resume_offset is not None:
+            # Les lignes écrites après le dernier point de reprise sont abandonnées
+            os.truncate(self._tmp_path, resume_offset)
+            self._file = open(self._tmp_path, "a", encoding="utf-8")
+        else:
+            self._file = open(self._tmp_path, "w", encoding="utf-8")
+        self.n_written = 0
+
+    @staticmethod
+    def partial_path(path) -> Path:
+        """Fichier partiel d'un flux resumable."""
+        path = Path(path)
+        return path.with_name(f"{path.name}.partial")
+
+    @classmethod
+    def can_resume(cls, path, resume_offset: int) -> bool:
+        """
+        Vérifie que le fichier partiel d'un flux peut être repris.
+
+        Args:
+            path: Chemin du fichier NDJSON
+            resume_offset: Taille valide sauvegardée au point de reprise
+
+        Returns:
+            True si le fichier partiel existe et contient au moins resume_offset octets
+        """
+        partial = cls.partial_path(path)
+        return partial.is_file() and partial.stat().st_size >= resume_offset
+
+    def __enter__(self) -> "AnomalyStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(commit=exc_type is None)
+
+    def write_block(self, positions: np.ndarray, row_ids: np.ndarray, scores: np.ndarray,
+                    features: Optional[pd.DataFrame] = None):
+        """
+        Écrit les anomalies d'un bloc.
+
+        Args:
+            positions: Positions des anomalies dans le fichier
+            row_ids: Identifiants (TaskID) des anomalies
+            scores: Scores des anomalies
+            features: Compteurs d'événements des anomalies (mêmes lignes, optionnel)
+        """
+        if not len(positions):
+            return
+        columns = np.asarray(features.columns) if features is not None else None
+        values = features.to_numpy() if features is not None else None
+
+        lines = []
+        for i in range(len(positions)):
+            record = {
+                'index': int(positions[i]),
+                'task_id': _to_python(row_ids[i]),
+                'score': float(scores[i]),
+            }
+            if values is not None:
+                nonzero = np.flatnonzero(values[i])
+                record['events'] = {str(columns[j]): _to_python(values[i, j]) for j in nonzero}
+            lines.append(json.dumps(record, ensure_ascii=False, default=_json_default))
+        self._file.write("\n".join(lines) + "\n")
+        self.n_written += len(lines)
+
+    def checkpoint(self) -> int:
+        """
+        Force l'écriture sur disque des lignes déjà produites.
+
+        Returns:
+            Taille du fichier partiel, à passer à resume_offset pour reprendre
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self, commit: bool = True):
+        """
+        Ferme le flux.
+
+        Args:
+            commit: Si True, publie le fichier sous son nom définitif; sinon le supprime
+                (un fichier partiel repris est gardé pour la prochaine reprise)
+        """
+        if self._file.closed:
+            return
+        self._file.close()
+        if commit:
+            os.replace(self._tmp_path, self.path)
+        elif not self.resumable:
+            self._tmp_path.unlink(missing_ok=True)
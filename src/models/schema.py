@@ -0,0 +1,132 @@
+"""
+Alignement des colonnes d'une trace sur le schéma de features du modèle.
+
+Le registre calcule une seule fois, pour chaque disposition de colonnes
+rencontrée (identifiée par un hash), le plan qui envoie les colonnes de
+l'entrée vers les colonnes du modèle. Les blocs suivants d'une même trace
+réutilisent le plan sans recalculer de différences d'ensembles.
+"""
+
+import hashlib
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def schema_hash(columns: Sequence[str]) -> str:
+    """
+    Calcule le hash d'une disposition de colonnes (noms et ordre).
+
+    Args:
+        columns: Noms des colonnes
+
+    Returns:
+        Hash hexadécimal
+    """
+    return hashlib.sha1("\x1f".join(map(str, columns)).encode("utf-8")).hexdigest()
+
+
+class AlignmentPlan:
+    """
+    Correspondance précalculée entre les colonnes d'une entrée et celles du modèle.
+
+    Attributes:
+        identity: True si l'entrée a exactement les colonnes du modèle, dans le même ordre
+        source_indices: Positions des colonnes utiles dans l'entrée
+        target_indices: Positions correspondantes dans la matrice du modèle
+        n_missing: Nombre de colonnes du modèle absentes de l'entrée (remplies avec 0)
+        n_extra: Nombre de colonnes de l'entrée ignorées
+    """
+
+    def __init__(self, input_columns: Sequence[str], feature_index: Dict[str, int]):
+        source, target = [], []
+        for position, column in enumerate(input_columns):
+            if column in feature_index:
+                source.append(position)
+                target.append(feature_index[column])
+
+        self.n_features = len(feature_index)
+        self.source_indices = np.asarray(source, dtype=np.intp)
+        self.target_indices = np.asarray(target, dtype=np.intp)
+        self.n_missing = self.n_features - len(set(target))
+        self.n_extra = len(input_columns) - len(source)
+        self.identity = (self.n_missing == 0 and self.n_extra == 0 and
+                         bool(np.all(self.target_indices == np.arange(self.n_features))))
+        # Sélection contiguë de colonnes déjà dans l'ordre du modèle (colonnes en trop seulement)
+        self.ordered_subset = self.n_missing == 0 and bool(np.all(np.diff(self.target_indices) > 0))
+
+    def apply(self, data: pd.DataFrame, dtype: np.dtype) -> np.ndarray:
+        """
+        Produit la matrice alignée sur les features du modèle.
+
+        L'entrée n'est jamais modifiée. Une entrée déjà alignée et homogène
+        dans la bonne précision est retournée sans copie.
+
+        Args:
+            data: Données d'entrée
+            dtype: Précision de la matrice produite
+
+        Returns:
+            Matrice (lignes × features du modèle)
+        """
+        if self.identity:
+            return data.to_numpy(dtype=dtype, copy=False)
+
+        if self.n_extra:
+            # Les colonnes ignorées (ex: TaskID) peuvent ne pas être numériques
+            values = data.iloc[:, self.source_indices].to_numpy(dtype=dtype, copy=False)
+        else:
+            values = data.to_numpy(dtype=dtype, copy=False)[:, self.source_indices]
+        if self.ordered_subset:
+            return values
+
+        # Une seule écriture vectorisée dans une matrice préallouée (colonnes manquantes à 0)
+        aligned = np.zeros((len(data), self.n_features), dtype=dtype)
+        aligned[:, self.target_indices] = values
+        return aligned
+
+
+class SchemaRegistry:
+    """Cache des plans d'alignement, indexé par le hash de la disposition des colonnes."""
+
+    def __init__(self, feature_names: List[str]):
+        """
+        Initialise le registre pour un schéma de modèle.
+
+        Args:
+            feature_names: Colonnes du modèle, dans l'ordre de l'entraînement
+        """
+        self.feature_names = feature_names
+        self.feature_index = {name: i for i, name in enumerate(feature_names)}
+        self.plans: Dict[str, AlignmentPlan] = {}
+
+    def plan(self, columns: Sequence[str]) -> AlignmentPlan:
+        """
+        Retourne le plan d'alignement d'une disposition de colonnes (calculé au premier appel).
+
+        Args:
+            columns: Colonnes de l'entrée
+
+        Returns:
+            Plan d'alignement
+        """
+        key = schema_hash(columns)
+        plan = self.plans.get(key)
+        if plan is None:
+            plan = AlignmentPlan(list(columns), self.feature_index)
+            self.plans[key] = plan
+        return plan
+
+    def align(self, data: pd.DataFrame, dtype: np.dtype) -> np.ndarray:
+        """
+        Aligne un DataFrame sur les features du modèle.
+
+        Args:
+            data: Données d'entrée
+            dtype: Précision de la matrice produite
+
+        Returns:
+            Matrice alignée
+        """
+        return self.plan(data.columns).apply(data, dtype)
@@ -0,0 +1,255 @@
+"""
+Cache persistant des scores d'anomalie.
+
+Les scores sont stockés dans une base SQLite indexée par
+(hash du fichier de modèle, hash du vecteur d'événements). Un changement
+de modèle change la clé: les anciens scores ne sont plus jamais relus et
+finissent évincés. La taille est bornée par une éviction LRU sur la date
+du dernier accès. Les lectures n'écrivent rien: les dates d'accès et les
+compteurs sont regroupés en mémoire et écrits par lots (LRU approché à
+_ACCESS_FLUSH_SECONDS près). SQLite (mode WAL + délai d'attente sur verrou) permet à
+plusieurs processus de détection de partager le même fichier.
+"""
+
+import atexit
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+import numpy as np
+
+# Nombre de paramètres par requête, sous la limite historique de SQLite (999)
+_BATCH_SIZE = 500
+
+# Les dates d'accès en attente sont écrites au-delà de ce nombre de vecteurs ou de cette durée
+_ACCESS_FLUSH_ROWS = 100000
+_ACCESS_FLUSH_SECONDS = 60.0
+
+# L'éviction ramène le cache à cette fraction de max_entries (un comptage exact par éviction)
+_EVICTION_TARGET = 0.9
+
+
+class ScoreCache:
+    """Cache de scores sur disque, borné en nombre d'entrées, partagé entre processus."""
+
+    def __init__(self, cache_path: str, max_entries: int = 1000000, timeout: float = 30.0):
+        """
+        Initialise le cache (la base est ouverte au premier accès).
+
+        Args:
+            cache_path: Chemin du fichier SQLite
+            max_entries: Nombre maximum de scores conservés
+            timeout: Attente maximale (secondes) sur un verrou tenu par un autre processus
+        """
+        self.cache_path = Path(cache_path)
+        self.max_entries = int(max_entries)
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        # Nombre d'entrées estimé par ce processus (None = pas encore compté)
+        self._entries: Optional[int] = None
+        # Accès et compteurs pas encore écrits dans la base
+        self._pending_access: Dict[str, Set[int]] = {}
+        self._pending_hits = 0
+        self._pending_misses = 0
+        self._last_flush = time.time()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Une connexion SQLite ne se transmet pas entre processus, ni les écritures en attente
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        state['_entries'] = None
+        state['_pending_access'] = {}
+        state['_pending_hits'] = state['_pending_misses'] = 0
+        return state
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connexion SQLite, créée à la demande avec le schéma du cache."""
+        if self._connection is None:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.cache_path), timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS scores ("
+                    " model_hash TEXT NOT NULL,"
+                    " row_hash INTEGER NOT NULL,"
+                    " score REAL NOT NULL,"
+                    " last_access REAL NOT NULL,"
+                    " PRIMARY KEY (model_hash, row_hash))"
+                )
+                connection.execute("CREATE INDEX IF NOT EXISTS idx_scores_access ON scores (last_access)")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+                )
+            self._connection = connection
+            # Les accès en attente sont écrits à la fin du processus
+            atexit.register(self.flush)
+        return self._connection
+
+    def get_many(self, model_hash: str, row_hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recherche les scores de plusieurs vecteurs pour un modèle.
+
+        Args:
+            model_hash: Hash du fichier de modèle
+            row_hashes: Hash des vecteurs (uint64)
+
+        Returns:
+            Tuple contenant (masque des vecteurs trouvés, scores; NaN si absent)
+        """
+        keys = np.asarray(row_hashes, dtype=np.uint64).view(np.int64)
+        scores = np.full(len(keys), np.nan)
+        found = {}
+
+        for start in range(0, len(keys), _BATCH_SIZE):
+            batch = [int(k) for k in keys[start:start + _BATCH_SIZE]]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                f"SELECT row_hash, score FROM scores WHERE model_hash = ? AND row_hash IN ({placeholders})",
+                [model_hash] + batch
+            ).fetchall()
+            found.update(rows)
+
+        if found:
+            scores = np.array([found.get(int(k), np.nan) for k in keys])
+            # Date d'accès pour l'éviction LRU, écrite au prochain lot
+            self._pending_access.setdefault(model_hash, set()).update(found)
+        mask = ~np.isnan(scores)
+
+        n_hits = int(mask.sum())
+        self._record(n_hits, len(keys) - n_hits)
+        if (sum(len(rows) for rows in self._pending_access.values()) >= _ACCESS_FLUSH_ROWS
+                or time.time() - self._last_flush >= _ACCESS_FLUSH_SECONDS):
+            self.flush()
+        return mask, scores
+
+    def put_many(self, model_hash: str, row_hashes: np.ndarray, scores: np.ndarray):
+        """
+        Enregistre les scores de plusieurs vecteurs puis applique l'éviction.
+
+        Args:
+            model_hash: Hash du fichier de modèle
+            row_hashes: Hash des vecteurs (uint64)
+            scores: Scores correspondants
+        """
+        keys = np.asarray(row_hashes, dtype=np.uint64).view(np.int64)
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO scores (model_hash, row_hash, score, last_access) VALUES (?, ?, ?, ?)",
+                zip([model_hash] * len(keys), keys.tolist(), np.asarray(scores, dtype=float).tolist(),
+                    [now] * len(keys))
+            )
+            self._write_pending(now)
+            if self._entries is None:
+                self._entries = self._count()
+            else:
+                # Majorant: une clé déjà présente est remplacée sans ajouter d'entrée
+                self._entries += len(keys)
+            if self._entries > self.max_entries:
+                self._evict()
+
+    def _count(self) -> int:
+        """Nombre exact d'entrées (toutes les sources)."""
+        return self.connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def _evict(self):
+        """
+        Supprime les entrées les moins récemment utilisées.
+
+        Appelée quand l'estimation dépasse max_entries: le nombre d'entrées est
+        recompté (les autres processus écrivent aussi) puis ramené à
+        _EVICTION_TARGET × max_entries, pour ne pas recompter à chaque écriture.
+        """
+        count = self._count()
+        if count > self.max_entries:
+            target = int(self.max_entries * _EVICTION_TARGET)
+            self.connection.execute(
+                "DELETE FROM scores WHERE rowid IN "
+                "(SELECT rowid FROM scores ORDER BY last_access LIMIT ?)",
+                (count - target,)
+            )
+            count = target
+        self._entries = count
+
+    def _record(self, hits: int, misses: int):
+        """Met à jour les compteurs de la session; les compteurs cumulés sont écrits par lots."""
+        self.hits += hits
+        self.misses += misses
+        self._pending_hits += hits
+        self._pending_misses += misses
+
+    def _write_pending(self, now: float):
+        """Écrit les dates d'accès et compteurs en attente (dans la transaction en cours)."""
+        for model_hash, row_hashes in self._pending_access.items():
+            self.connection.executemany(
+                "UPDATE scores SET last_access = ? WHERE model_hash = ? AND row_hash = ?",
+                [(now, model_hash, row_hash) for row_hash in row_hashes]
+            )
+        if self._pending_hits or self._pending_misses:
+            self.connection.executemany(
+                "INSERT INTO stats (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                [('hits', self._pending_hits), ('misses', self._pending_misses)]
+            )
+        self._pending_access = {}
+        self._pending_hits = self._pending_misses = 0
+        self._last_flush = now
+
+    def flush(self):
+        """Écrit les dates d'accès et compteurs en attente."""
+        if not (self._pending_access or self._pending_hits or self._pending_misses):
+            return
+        with self.connection:
+            self._write_pending(time.time())
+
+    @property
+    def hit_rate(self) -> float:
+        """Taux de succès du cache depuis la création de l'objet."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les statistiques du cache.
+
+        Returns:
+            Dictionnaire avec le nombre d'entrées, les succès/échecs de la
+            session et ceux cumulés sur tous les processus
+        """
+        self.flush()
+        totals = dict(self.connection.execute("SELECT name, value FROM stats").fetchall())
+        lifetime_total = totals.get('hits', 0) + totals.get('misses', 0)
+        return {
+            'entries': self._count(),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'lifetime_hits': totals.get('hits', 0),
+            'lifetime_misses': totals.get('misses', 0),
+            'lifetime_hit_rate': totals.get('hits', 0) / lifetime_total if lifetime_total else 0.0,
+        }
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro."""
+        with self.connection:
+            self.connection.execute("DELETE FROM scores")
+            self.connection.execute("DELETE FROM stats")
+        self.hits = 0
+        self.misses = 0
+        self._entries = 0
+        self._pending_access = {}
+        self._pending_hits = self._pending_misses = 0
+
+    def close(self):
+        """Ferme la connexion SQLite."""
+        if self._connection is not None:
+            self.flush()
+            self._connection.close()
+            self._connection = None
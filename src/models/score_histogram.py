@@ -0,0 +1,197 @@
+"""
+Histogramme des scores à pas fixe, fusionnable et à mémoire bornée.
+
+Les classes sont [k·pas, (k+1)·pas[ pour k entier: elles ne dépendent pas
+des données, et les classes k < 0 contiennent exactement les scores négatifs
+(anormaux au seuil 0). Si max_bins est fixé, le pas double (les classes 2k et
+2k+1 fusionnent) tant que le nombre de classes le dépasse. Deux histogrammes
+de même pas initial se fusionnent en additionnant leurs effectifs, après
+avoir été ramenés au plus grand des deux pas.
+
+Partagé par le résumé de rapport (ReportSummary) et l'esquisse de dérive
+(DriftSketch).
+"""
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Pas par défaut de l'histogramme des scores (decision_function)
+DEFAULT_BIN_WIDTH = 0.005
+
+
+class ScoreHistogram:
+    """
+    Effectifs des scores par classe de largeur fixe, avec minimum et maximum.
+    """
+
+    def __init__(self, bin_width: float = DEFAULT_BIN_WIDTH, max_bins: Optional[int] = None):
+        """
+        Initialise un histogramme vide.
+
+        Args:
+            bin_width: Pas initial des classes
+            max_bins: Nombre maximal de classes avant de doubler le pas (None = pas fixe)
+        """
+        self.bin_width = float(bin_width)
+        self.max_bins = int(max_bins) if max_bins else None
+        self.bins: Dict[int, int] = {}
+        self.n_rows = 0
+        self.score_min = np.inf
+        self.score_max = -np.inf
+
+    def update(self, scores: np.ndarray):
+        """
+        Ajoute des scores.
+
+        Args:
+            scores: Scores d'un bloc de lignes
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        if not len(scores):
+            return
+        keys, counts = np.unique(np.floor(scores / self.bin_width).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.n_rows += len(scores)
+        self.score_min = min(self.score_min, float(scores.min()))
+        self.score_max = max(self.score_max, float(scores.max()))
+        self._compact()
+
+    def _coarsen(self, bin_width: float):
+        """Ramène les classes au pas bin_width (multiple du pas courant par une puissance de 2)."""
+        while self.bin_width < bin_width * (1 - 1e-9):
+            merged: Dict[int, int] = {}
+            for key, count in self.bins.items():
+                merged[key >> 1] = merged.get(key >> 1, 0) + count
+            self.bins = merged
+            self.bin_width *= 2
+
+    def _compact(self):
+        """Double le pas tant que le nombre de classes dépasse max_bins."""
+        if self.max_bins is None:
+            return
+        while len(self.bins) > self.max_bins:
+            self._coarsen(self.bin_width * 2)
+
+    def coarsened(self, bin_width: float) -> "ScoreHistogram":
+        """
+        Copie de l'histogramme au pas bin_width (ou au pas courant s'il est plus grand).
+
+        Args:
+            bin_width: Pas voulu
+
+        Returns:
+            Nouvel histogramme
+        """
+        histogram = ScoreHistogram(self.bin_width, self.max_bins)
+        histogram.bins, histogram.n_rows = dict(self.bins), self.n_rows
+        histogram.score_min, histogram.score_max = self.score_min, self.score_max
+        histogram._coarsen(bin_width)
+        return histogram
+
+    def merge(self, other: "ScoreHistogram") -> "ScoreHistogram":
+        """
+        Fusionne un autre histogramme (autre bloc, shard ou fichier).
+
+        Args:
+            other: Histogramme de même pas initial
+
+        Returns:
+            L'histogramme fusionné
+        """
+        other_bins = other.coarsened(self.bin_width).bins
+        self._coarsen(other.bin_width)
+        for key, count in other_bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.n_rows += other.n_rows
+        self.score_min = min(self.score_min, other.score_min)
+        self.score_max = max(self.score_max, other.score_max)
+        self._compact()
+        return self
+
+    def histogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Classes non vides.
+
+        Returns:
+            Tuple contenant (bornes gauches des classes, effectifs), classes triées
+        """
+        keys = np.array(sorted(self.bins), dtype=np.int64)
+        counts = np.array([self.bins[k] for k in keys.tolist()], dtype=np.int64)
+        return keys * self.bin_width, counts
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        """
+        Fonction de répartition approchée des scores (linéaire dans chaque classe).
+
+        Args:
+            x: Points d'évaluation
+
+        Returns:
+            Proportion des scores inférieurs à chaque point
+        """
+        starts, counts = self.histogram()
+        # Les classes absentes entre deux classes présentes ont un effectif nul
+        cumulative = np.concatenate([[0.0], np.cumsum(counts)]) / counts.sum()
+        x = np.asarray(x, dtype=np.float64)
+        position = np.searchsorted(starts, x, side='right') - 1
+        result = np.where(position < 0, 0.0, 1.0)
+        inside = position >= 0
+        pos = position[inside]
+        fraction = np.clip((x[inside] - starts[pos]) / self.bin_width, 0.0, 1.0)
+        result[inside] = cumulative[pos] + fraction * (cumulative[pos + 1] - cumulative[pos])
+        return result
+
+    def quantiles(self, q: Sequence[float]) -> np.ndarray:
+        """
+        Quantiles approchés des scores (erreur inférieure au pas des classes).
+
+        Args:
+            q: Quantiles demandés, entre 0 et 1
+
+        Returns:
+            Valeurs des quantiles (interpolation linéaire dans la classe, bornée
+            par le minimum et le maximum observés)
+        """
+        starts, counts = self.histogram()
+        if not len(counts):
+            return np.full(len(q), np.nan)
+        # Bornes gauche/droite de chaque classe présente, effectifs cumulés
+        bounds = np.column_stack([starts, starts + self.bin_width]).ravel()
+        totals = np.cumsum(counts).astype(np.float64)
+        cumulative = np.column_stack([np.concatenate([[0.0], totals[:-1]]), totals]).ravel()
+        values = np.interp(np.asarray(q, dtype=np.float64) * totals[-1], cumulative, bounds)
+        if np.isfinite(self.score_min) and np.isfinite(self.score_max):
+            values = np.clip(values, self.score_min, self.score_max)
+        return values
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Représentation sérialisable en JSON."""
+        return {
+            'bin_width': self.bin_width,
+            'max_bins': self.max_bins,
+            'n_rows': self.n_rows,
+            'score_min': self.score_min if self.n_rows else None,
+            'score_max': self.score_max if self.n_rows else None,
+            'score_bins': {str(key): count for key, count in sorted(self.bins.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_bins: Optional[int] = None) -> "ScoreHistogram":
+        """
+        Reconstruit un histogramme depuis to_dict() (ou un résumé qui en reprend les clés).
+
+        Args:
+            data: Dictionnaire sauvegardé
+            max_bins: Nombre maximal de classes si data n'en précise pas
+
+        Returns:
+            Histogramme
+        """
+        histogram = cls(data['bin_width'], data.get('max_bins', max_bins))
+        histogram.n_rows = data['n_rows']
+        histogram.bins = {int(key): int(count) for key, count in data['score_bins'].items()}
+        if data.get('score_min') is not None:
+            histogram.score_min, histogram.score_max = data['score_min'], data['score_max']
+        return histogram
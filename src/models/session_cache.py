@@ -0,0 +1,165 @@
+"""
+Cache de session de l'interface interactive.
+
+Une session garde en mémoire les traces déjà lues et les résultats déjà
+scorés, dans la limite d'un budget mémoire (éviction LRU). Les clés
+incluent la date de modification et la taille des fichiers, et le hash du
+modèle pour les scores: un fichier réécrit ou un nouveau modèle ne
+réutilise jamais une entrée périmée.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .detection_result import DetectionResult
+
+
+def file_key(file_path) -> Tuple[str, int, int]:
+    """
+    Identité d'un fichier sur disque.
+
+    Args:
+        file_path: Chemin du fichier
+
+    Returns:
+        Tuple (chemin absolu, date de modification en ns, taille)
+    """
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+def estimate_nbytes(value: Any) -> int:
+    """
+    Taille mémoire estimée d'une entrée du cache.
+
+    Args:
+        value: DataFrame, DetectionResult, tableau NumPy ou liste
+
+    Returns:
+        Taille en octets (les features d'un résultat sont comptées même si
+        elles partagent la mémoire d'une trace en cache)
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, DetectionResult):
+        size = value.scores.nbytes + value.labels.nbytes + np.asarray(value.row_ids).nbytes
+        if np.asarray(value.row_ids).dtype == object:
+            size += 64 * len(value.row_ids)
+        if value.features is not None:
+            size += estimate_nbytes(value.features)
+        return int(size)
+    if isinstance(value, (list, tuple)):
+        return 64 * (len(value) + 1)
+    return 1024
+
+
+class SessionCache:
+    """
+    Cache LRU en mémoire des traces et résultats d'une session, borné par un budget en octets.
+    """
+
+    def __init__(self, max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Initialise un cache vide.
+
+        Args:
+            max_bytes: Budget mémoire (l'entrée la plus récente est toujours gardée)
+        """
+        self.max_bytes = int(max_bytes)
+        self.entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Retourne une entrée et la marque comme récemment utilisée.
+
+        Args:
+            key: Clé de l'entrée
+
+        Returns:
+            Valeur en cache, None si absente
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: Optional[int] = None):
+        """
+        Ajoute ou remplace une entrée puis évince les plus anciennes au-delà du budget.
+
+        Args:
+            key: Clé de l'entrée
+            value: Valeur à garder
+            nbytes: Taille en octets (défaut: estimate_nbytes)
+        """
+        if key in self.entries:
+            self.total_bytes -= self.entries.pop(key)[1]
+        size = estimate_nbytes(value) if nbytes is None else int(nbytes)
+        self.entries[key] = (value, size)
+        self.total_bytes += size
+        self._evict()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Retourne une entrée, en la calculant et la gardant si elle est absente.
+
+        Args:
+            key: Clé de l'entrée
+            compute: Fonction sans argument qui produit la valeur (None = non gardée)
+
+        Returns:
+            Tuple contenant (valeur, True si elle venait du cache)
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        value = compute()
+        if value is not None:
+            self.put(key, value)
+        return value, False
+
+    def _evict(self):
+        """Retire les entrées les moins récemment utilisées au-delà du budget."""
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.total_bytes -= size
+
+    def clear(self):
+        """Vide le cache."""
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Statistiques du cache.
+
+        Returns:
+            Dictionnaire (entrées par type, octets utilisés, budget, succès, échecs)
+        """
+        kinds: Dict[str, int] = {}
+        for key in self.entries:
+            kind = key[0] if isinstance(key, tuple) else 'autre'
+            kinds[kind] = kinds.get(kind, 0) + 1
+        return {
+            'entries': kinds,
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
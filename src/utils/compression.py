@@ -0,0 +1,146 @@
+"""
+Lecture transparente des traces CSV compressées (gzip, bz2, zstd, xz).
+
+Les traces archivées (trace.csv.gz, trace.csv.zst...) sont décompressées en
+flux, sans fichier temporaire. Lorsqu'un outil externe est disponible (pigz,
+lbzip2/pbzip2, zstd, xz), il tourne dans son propre processus, en parallèle
+du parseur CSV, et utilise plusieurs threads quand le format le permet.
+Sinon, les modules Python (gzip, bz2, lzma, zstandard) prennent le relais.
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional
+
+# Extension -> format de compression
+COMPRESSION_SUFFIXES = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.zst': 'zstd',
+    '.xz': 'xz',
+}
+
+# Motifs des fichiers de traces reconnus (CSV simples et compressés)
+CSV_PATTERNS = ["*.csv"] + [f"*.csv{suffix}" for suffix in COMPRESSION_SUFFIXES]
+
+# Outils externes par format, du plus parallèle au plus courant ({threads} = nombre de threads)
+DECOMPRESSORS = {
+    'gzip': [["pigz", "-dc", "-p", "{threads}"], ["gzip", "-dc"]],
+    'bz2': [["lbzip2", "-dc", "-n", "{threads}"], ["pbzip2", "-dc", "-p{threads}"], ["bzip2", "-dc"]],
+    'zstd': [["zstd", "-dcq", "-T{threads}"]],
+    'xz': [["xz", "-dc", "-T{threads}"]],
+}
+
+
+def compression_of(file_path) -> Optional[str]:
+    """
+    Format de compression d'un fichier, d'après son extension.
+
+    Args:
+        file_path: Chemin du fichier
+
+    Returns:
+        'gzip', 'bz2', 'zstd', 'xz' ou None pour un fichier non compressé
+    """
+    return COMPRESSION_SUFFIXES.get(Path(file_path).suffix.lower())
+
+
+def strip_csv_suffix(file_name: str) -> str:
+    """
+    Nom d'une trace sans ses extensions (.csv et compression).
+
+    Args:
+        file_name: Nom du fichier (ex: failure_trace.csv.gz)
+
+    Returns:
+        Nom sans extension (ex: failure_trace)
+    """
+    name = Path(file_name).name
+    if compression_of(name):
+        name = name[:-len(Path(name).suffix)]
+    return name[:-4] if name.lower().endswith('.csv') else name
+
+
+def decompress_command(codec: str, threads: Optional[int] = None) -> Optional[List[str]]:
+    """
+    Commande de décompression vers la sortie standard pour un format.
+
+    Args:
+        codec: Format de compression
+        threads: Threads de décompression (None = nombre de CPU)
+
+    Returns:
+        Commande du premier outil installé, None si aucun
+    """
+    threads = threads or os.cpu_count() or 1
+    for command in DECOMPRESSORS.get(codec, []):
+        if shutil.which(command[0]):
+            return [arg.format(threads=threads) for arg in command]
+    return None
+
+
+def _open_module(file_path, codec: str) -> BinaryIO:
+    """Ouvre un fichier compressé avec le module Python du format (décompression dans ce processus)."""
+    if codec == 'gzip':
+        return gzip.open(file_path, 'rb')
+    if codec == 'bz2':
+        return bz2.open(file_path, 'rb')
+    if codec == 'xz':
+        return lzma.open(file_path, 'rb')
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Lecture des fichiers .zst: installez l'outil zstd ou le module zstandard")
+    return zstandard.open(file_path, 'rb')
+
+
+@contextmanager
+def open_compressed(file_path, threads: Optional[int] = None, external: bool = True) -> Iterator[BinaryIO]:
+    """
+    Ouvre un fichier, compressé ou non, en flux binaire décompressé.
+
+    Avec un outil externe, la décompression tourne dans un processus séparé;
+    si la lecture s'arrête avant la fin du flux, ce processus est arrêté. Une
+    archive corrompue ou tronquée lève une OSError une fois le flux consommé.
+
+    Args:
+        file_path: Chemin du fichier
+        threads: Threads de décompression (None = nombre de CPU)
+        external: Utiliser un outil externe s'il est installé
+
+    Yields:
+        Flux binaire du contenu décompressé
+    """
+    codec = compression_of(file_path)
+    command = decompress_command(codec, threads) if codec and external else None
+
+    if command is None:
+        stream = _open_module(file_path, codec) if codec else open(file_path, 'rb')
+        with stream:
+            yield stream
+        return
+
+    with open(file_path, 'rb') as source, tempfile.TemporaryFile() as errors:
+        process = subprocess.Popen(command, stdin=source, stdout=subprocess.PIPE, stderr=errors)
+        finished = False
+        try:
+            yield process.stdout
+            finished = not process.stdout.read(1)
+        finally:
+            # Lecture interrompue avant la fin du flux: l'outil est arrêté, sans erreur
+            if not finished and process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            process.wait()
+
+        if finished and process.returncode != 0:
+            errors.seek(0)
+            message = errors.read().decode(errors='replace').strip()
+            raise OSError(f"Échec de la décompression de {file_path} ({command[0]}): {message}")
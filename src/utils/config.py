@@ -0,0 +1,60 @@
+"""
+Chargement des fichiers de configuration YAML du projet.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Dossier config/ livré avec le code, utilisé si le projet n'en fournit pas
+DEFAULT_CONFIG_DIR = Path(__file__).resolve().parent.parent.parent / "config"
+
+
+def load_config(name: str, project_root: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Charge un fichier de configuration YAML du dossier config/.
+
+    Le fichier est d'abord cherché dans le dossier config/ du projet,
+    puis dans celui livré avec le code.
+
+    Args:
+        name: Nom du fichier sans extension (ex: 'model_config')
+        project_root: Chemin racine du projet (optionnel)
+
+    Returns:
+        Dictionnaire de configuration, vide si le fichier est introuvable
+    """
+    candidates = []
+    if project_root:
+        candidates.append(Path(project_root) / "config" / f"{name}.yaml")
+    candidates.append(DEFAULT_CONFIG_DIR / f"{name}.yaml")
+
+    for config_path in candidates:
+        if config_path.exists():
+            try:
+                import yaml
+                with open(config_path, "r", encoding="utf-8") as f:
+                    return yaml.safe_load(f) or {}
+            except Exception as e:
+                print(f"Erreur lors de la lecture de {config_path}: {e}")
+                return {}
+
+    return {}
+
+
+def get_section(name: str, section: str, project_root: Optional[str] = None,
+                defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Retourne une section d'un fichier de configuration, complétée par des valeurs par défaut.
+
+    Args:
+        name: Nom du fichier sans extension
+        section: Nom de la section (ex: 'hdfs')
+        project_root: Chemin racine du projet (optionnel)
+        defaults: Valeurs utilisées pour les clés absentes du fichier
+
+    Returns:
+        Dictionnaire de paramètres
+    """
+    params = dict(defaults or {})
+    params.update(load_config(name, project_root).get(section) or {})
+    return params
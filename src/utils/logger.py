@@ -1,11 +1,85 @@
 """
 Configuration du système de logging pour le projet.
+
+Les handlers décrits dans config/logging_config.yaml (console, fichier)
+sont alimentés par une file d'attente: les loggers n'y déposent que les
+enregistrements (QueueHandler) et un thread QueueListener se charge des
+écritures. Une écriture lente (fichier sur NFS) ne bloque donc pas les
+boucles de calcul.
 """
 
+import atexit
+import copy
 import logging
+import logging.config
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+from utils.config import load_config
+
+# Nom du logger utilisé par les détecteurs pour leurs messages de progression
+DETECTOR_LOGGER = "gestionlogs.detector"
+
+# Configuration utilisée si config/logging_config.yaml est absent
+DEFAULT_LOGGING_CONFIG = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'standard': {'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                     'datefmt': '%Y-%m-%d %H:%M:%S'},
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'level': 'INFO', 'formatter': 'standard',
+                    'stream': 'ext://sys.stdout'},
+        'console_plain': {'class': 'logging.StreamHandler', 'level': 'INFO', 'formatter': 'message',
+                          'stream': 'ext://sys.stdout'},
+        'file': {'class': 'logging.FileHandler', 'level': 'INFO', 'formatter': 'standard',
+                 'filename': 'logs/gestionlogs.log', 'encoding': 'utf-8'},
+    },
+    'loggers': {
+        'gestionlogs': {'level': 'INFO', 'handlers': ['console', 'file'], 'propagate': False},
+        DETECTOR_LOGGER: {'level': 'INFO', 'handlers': ['console_plain', 'file'], 'propagate': False},
+    },
+}
+
+# File d'attente unique et listener actifs (None tant que le logging n'est pas configuré)
+_LISTENER: Optional["_RoutingQueueListener"] = None
+
+
+class _RoutingQueueHandler(QueueHandler):
+    """QueueHandler qui marque chaque enregistrement avec le logger configuré qui l'a reçu."""
+
+    def __init__(self, records: queue.SimpleQueue, route: str):
+        super().__init__(records)
+        self.route = route
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        record.route = self.route
+        return record
+
+
+class _RoutingQueueListener(QueueListener):
+    """
+    Listener unique servant tous les loggers configurés.
+
+    Une seule file et un seul thread conservent l'ordre des messages entre
+    loggers (par exemple messages du script et progression du détecteur).
+    """
+
+    def __init__(self, records: queue.SimpleQueue, routes: Dict[str, List[logging.Handler]]):
+        super().__init__(records)
+        self.routes = routes
+
+    def handle(self, record: logging.LogRecord):
+        record = self.prepare(record)
+        for handler in self.routes.get(getattr(record, 'route', None), []):
+            if record.levelno >= handler.level:
+                handler.handle(record)
 
 
 def setup_logger(name: str, log_file: Optional[str] = None, level: int = logging.INFO) -> logging.Logger:
@@ -53,18 +127,99 @@ def setup_logger(name: str, log_file: Optional[str] = None, level: int = logging
     return logger
 
 
-def get_project_logger(log_to_file: bool = True) -> logging.Logger:
+def _prepare_config(config: Dict[str, Any], project_root: Path, log_to_file: bool,
+                    log_to_stderr: bool = False) -> Dict[str, Any]:
+    """
+    Résout les chemins des fichiers de log, retire les handlers fichier si demandé
+    et redirige la console vers la sortie d'erreur si demandé.
+    """
+    config = copy.deepcopy(config)
+    handlers = config.get('handlers') or {}
+    if log_to_stderr:
+        for handler in handlers.values():
+            if handler.get('stream') == 'ext://sys.stdout':
+                handler['stream'] = 'ext://sys.stderr'
+    file_handlers = [name for name, handler in handlers.items() if 'filename' in handler]
+
+    for name in file_handlers:
+        if not log_to_file:
+            del handlers[name]
+            continue
+        log_path = Path(handlers[name]['filename'])
+        if not log_path.is_absolute():
+            log_path = project_root / log_path
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        handlers[name]['filename'] = str(log_path)
+
+    if not log_to_file:
+        for section in list((config.get('loggers') or {}).values()) + [config.get('root') or {}]:
+            if 'handlers' in section:
+                section['handlers'] = [h for h in section['handlers'] if h not in file_handlers]
+    return config
+
+
+def stop_logging():
+    """Vide la file d'attente et arrête le listener (appelé automatiquement à la sortie)."""
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER = None
+
+
+def configure_logging(project_root: Optional[str] = None, log_to_file: bool = True,
+                      log_to_stderr: bool = False) -> bool:
+    """
+    Configure le logging non bloquant à partir de config/logging_config.yaml.
+
+    Sans effet si le logging est déjà configuré.
+
+    Args:
+        project_root: Racine du projet (chemins des fichiers de log, défaut: répertoire courant)
+        log_to_file: Si False, les handlers écrivant dans un fichier sont ignorés
+        log_to_stderr: Si True, les handlers console écrivent sur la sortie d'erreur
+            (la sortie standard reste réservée au résultat, ex: --output-format json)
+
+    Returns:
+        True si la configuration vient d'être appliquée
+    """
+    global _LISTENER
+    if _LISTENER is not None:
+        return False
+
+    root = Path(project_root) if project_root else Path.cwd()
+    config = load_config("logging_config", root) or DEFAULT_LOGGING_CONFIG
+    config = _prepare_config(config, root, log_to_file, log_to_stderr)
+    logging.config.dictConfig(config)
+
+    # Les handlers configurés passent au listener; les loggers ne gardent qu'un QueueHandler
+    records = queue.SimpleQueue()
+    routes = {}
+    for name in list(config.get('loggers') or {}) + [None]:
+        logger = logging.getLogger(name)
+        routes[name] = list(logger.handlers)
+        for handler in routes[name]:
+            logger.removeHandler(handler)
+        if routes[name]:
+            logger.addHandler(_RoutingQueueHandler(records, name))
+
+    _LISTENER = _RoutingQueueListener(records, routes)
+    _LISTENER.start()
+    atexit.register(stop_logging)
+    return True
+
+
+def get_project_logger(log_to_file: bool = True, log_to_stderr: bool = False) -> logging.Logger:
     """
     Retourne le logger principal du projet.
 
+    Au premier appel, configure le logging non bloquant (voir configure_logging).
+
     Args:
         log_to_file: Si True, les logs sont aussi écrits dans un fichier
+        log_to_stderr: Si True, les logs console vont sur la sortie d'erreur
 
     Returns:
         Logger configuré pour le projet
     """
-    log_file = None
-    if log_to_file:
-        log_file = Path.cwd() / "logs" / "gestionlogs.log"
-
-    return setup_logger("gestionlogs", log_file)
+    configure_logging(log_to_file=log_to_file, log_to_stderr=log_to_stderr)
+    return logging.getLogger("gestionlogs")
@@ -0,0 +1,138 @@
+"""
+Analyse d'un fichier CSV sur plusieurs threads.
+
+Le corps du fichier est découpé en plages d'octets alignées sur les fins de
+ligne; chaque plage est analysée par le parseur C de pandas, qui relâche le
+GIL pendant la tokenisation, puis les blocs sont assemblés dans l'ordre des
+lignes du fichier. Le découpage suppose qu'aucun champ ne contient de saut de
+ligne entre guillemets, ce qui est le cas des traces HDFS vectorisées.
+La même hypothèse permet de retrouver la position en octets d'une ligne
+(reprise d'une lecture sans réanalyser les lignes déjà lues).
+"""
+
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+# Taille minimale d'une plage: en dessous, le découpage coûte plus qu'il ne rapporte
+DEFAULT_MIN_RANGE_MB = 16
+
+# Taille des lectures lors du comptage des fins de ligne
+_SCAN_BLOCK_BYTES = 1 << 20
+
+
+def split_byte_ranges(file_path: str, n_ranges: int) -> List[Tuple[int, int]]:
+    """
+    Découpe le corps d'un fichier CSV (après l'en-tête) en plages de lignes entières.
+
+    Args:
+        file_path: Chemin du fichier
+        n_ranges: Nombre de plages voulu
+
+    Returns:
+        Plages [début, fin) en octets, dans l'ordre du fichier, sans plage vide
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        f.readline()
+        start = f.tell()
+        bounds = [start]
+        for i in range(1, n_ranges):
+            target = start + (size - start) * i // n_ranges
+            # La plage suivante commence après la fin de la ligne en cours à target
+            f.seek(max(target - 1, bounds[-1]))
+            f.readline()
+            bounds.append(min(f.tell(), size))
+        bounds.append(size)
+    return [(begin, end) for begin, end in zip(bounds[:-1], bounds[1:]) if end > begin]
+
+
+def skip_lines(file_path: str, offset: int, n_lines: int) -> int:
+    """
+    Position en octets après n_lines lignes, à partir d'un début de ligne.
+
+    Args:
+        file_path: Chemin du fichier (non compressé)
+        offset: Position de départ en octets (début d'une ligne)
+        n_lines: Nombre de lignes à passer (1 depuis 0: fin de l'en-tête)
+
+    Returns:
+        Position du début de la ligne suivante (taille du fichier au-delà de la fin)
+    """
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        while n_lines > 0:
+            block = f.read(_SCAN_BLOCK_BYTES)
+            if not block:
+                break
+            count = block.count(b"\n")
+            if count < n_lines:
+                n_lines -= count
+                offset += len(block)
+                continue
+            position = -1
+            for _ in range(n_lines):
+                position = block.index(b"\n", position + 1)
+            return offset + position + 1
+    return offset
+
+
+@contextmanager
+def open_at(file_path: str, offset: int) -> Iterator[BinaryIO]:
+    """
+    Ouvre un fichier positionné à un octet donné (source pour pd.read_csv).
+
+    Args:
+        file_path: Chemin du fichier (non compressé)
+        offset: Position en octets (début d'une ligne)
+
+    Yields:
+        Fichier binaire ouvert à offset
+    """
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        yield f
+
+
+def _read_range(file_path: str, byte_range: Tuple[int, int], names: list, options: dict) -> pd.DataFrame:
+    """Analyse une plage d'octets du fichier (lignes sans en-tête)."""
+    begin, end = byte_range
+    with open(file_path, "rb") as f:
+        f.seek(begin)
+        data = f.read(end - begin)
+    return pd.read_csv(io.BytesIO(data), header=None, names=names, **options)
+
+
+def read_csv_parallel(file_path: str, workers: Optional[int] = None,
+                      min_range_mb: float = DEFAULT_MIN_RANGE_MB, **options) -> pd.DataFrame:
+    """
+    Lit un fichier CSV entier en analysant des plages d'octets en parallèle.
+
+    Le résultat est identique à pd.read_csv(file_path, **options), lignes dans
+    l'ordre du fichier et index 0..n-1.
+
+    Args:
+        file_path: Chemin du fichier CSV (non compressé)
+        workers: Nombre de threads d'analyse (None = nombre de CPU)
+        min_range_mb: Taille minimale d'une plage en MB
+        **options: Options de pd.read_csv (encoding, dtype, usecols...)
+
+    Returns:
+        DataFrame du fichier complet
+    """
+    workers = workers or os.cpu_count() or 1
+    size_mb = os.path.getsize(file_path) / (1024 * 1024)
+    n_ranges = int(min(workers, size_mb // max(min_range_mb, 1e-9)))
+    if n_ranges < 2:
+        return pd.read_csv(file_path, **options)
+
+    # Noms du fichier tels que pandas les produit (doublons renommés), sans relire les lignes
+    names = list(pd.read_csv(file_path, nrows=0, encoding=options.get('encoding')).columns)
+    ranges = split_byte_ranges(file_path, n_ranges)
+    with ThreadPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        parts = list(pool.map(lambda byte_range: _read_range(file_path, byte_range, names, options), ranges))
+    return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
@@ -0,0 +1,109 @@
+"""
+Affichage périodique de la progression des traitements longs.
+
+ProgressReporter.update() ne fait qu'une addition et une comparaison
+d'horloge: il peut être appelé à chaque bloc (ou à chaque ligne) sans coût
+notable. Un message (débit, ETA) n'est émis qu'une fois par intervalle.
+"""
+
+import time
+from typing import Callable, Optional
+
+
+def _format_duration(seconds: float) -> str:
+    """Formate une durée en h/min/s."""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m{seconds:02d}s"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
+
+
+class ProgressReporter:
+    """
+    Compteur de progression à émission limitée dans le temps.
+
+    Exemple:
+        progress = ProgressReporter(total=len(data), emit=detector._log)
+        for chunk in chunks:
+            ...
+            progress.update(len(chunk))
+        progress.close()
+    """
+
+    def __init__(self, total: Optional[int] = None, interval: float = 5.0, unit: str = "lignes",
+                 emit: Callable[[str], None] = print, label: str = "Progression"):
+        """
+        Initialise le compteur.
+
+        Args:
+            total: Nombre total d'éléments attendus (None si inconnu: pas d'ETA)
+            interval: Intervalle minimal entre deux messages, en secondes
+            unit: Unité affichée
+            emit: Fonction recevant les messages (print, logger.info, detector._log...)
+            label: Préfixe des messages
+        """
+        self.total = total
+        self.interval = float(interval)
+        self.unit = unit
+        self.emit = emit
+        self.label = label
+        self.count = 0
+        self.start = time.monotonic()
+        self._next_emit = self.start + self.interval
+        self._closed = False
+
+    def __enter__(self) -> "ProgressReporter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def update(self, n: int = 1):
+        """
+        Ajoute n éléments traités; émet un message si l'intervalle est écoulé.
+
+        Args:
+            n: Nombre d'éléments traités depuis le dernier appel
+        """
+        self.count += n
+        now = time.monotonic()
+        if now >= self._next_emit:
+            self._next_emit = now + self.interval
+            self.emit(self.message(now))
+
+    def message(self, now: Optional[float] = None) -> str:
+        """
+        Message de progression courant.
+
+        Args:
+            now: Instant de référence (time.monotonic(), défaut: maintenant)
+
+        Returns:
+            Texte avec le nombre traité, le débit et l'ETA si le total est connu
+        """
+        elapsed = (now if now is not None else time.monotonic()) - self.start
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        text = f"{self.label}: {self.count:,}"
+        if self.total:
+            text += f"/{self.total:,} {self.unit} ({self.count / self.total:.0%})"
+        else:
+            text += f" {self.unit}"
+        text += f" - {rate:,.0f} {self.unit}/s"
+        if self.total and rate > 0 and self.count < self.total:
+            text += f" - ETA {_format_duration((self.total - self.count) / rate)}"
+        return text.replace(",", " ")
+
+    def close(self):
+        """Émet le bilan final (nombre traité, durée, débit moyen)."""
+        if self._closed:
+            return
+        self._closed = True
+        elapsed = time.monotonic() - self.start
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        self.emit(f"{self.label}: {self.count:,} {self.unit} en {_format_duration(elapsed)} "
+                  f"({rate:,.0f} {self.unit}/s)".replace(",", " "))
@@ -0,0 +1,222 @@
+"""
+Rendu des figures de rapport: backend non interactif, pool de processus et cache.
+
+Chaque figure est décrite par une FigureJob (type de graphique, données
+sérialisables en JSON, fichier de sortie). Les figures sont dessinées avec
+l'API objet de matplotlib (Figure + canvas Agg), sans l'état global de
+pyplot: elles sont libérées dès que le fichier est écrit. Une figure dont
+les données n'ont pas changé est recopiée depuis le cache au lieu d'être
+redessinée.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import matplotlib
+
+# Backend sans affichage, forcé avant tout import de pyplot (scripts, serveurs, workers)
+matplotlib.use("Agg", force=True)
+
+import pandas as pd
+import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import LogNorm, Normalize
+from matplotlib.figure import Figure
+
+from utils.config import get_section
+
+# À incrémenter quand l'aspect d'un graphique change (invalide le cache)
+RENDER_VERSION = 1
+
+# Valeurs utilisées si la section reporting de data_config.yaml est absente
+DEFAULT_RENDER_SETTINGS = {'dpi': 150, 'render_workers': None, 'figure_cache': 'data/cache/figures'}
+
+
+@dataclass
+class FigureJob:
+    """
+    Description d'une figure à produire.
+
+    Attributes:
+        kind: Type de graphique (clé de RENDERERS)
+        data: Données du graphique, sérialisables en JSON
+        output_path: Fichier PNG produit
+        dpi: Résolution
+        figsize: Taille en pouces
+        options: Options propres au type de graphique (ex: log_scale)
+    """
+    kind: str
+    data: Dict[str, Any]
+    output_path: str
+    dpi: int = 100
+    figsize: Tuple[float, float] = (10, 6)
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    def cache_key(self) -> str:
+        """Hash des entrées de la figure (type, données, options, résolution)."""
+        payload = json.dumps([RENDER_VERSION, self.kind, self.data, self.options, self.dpi, list(self.figsize)],
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _render_heatmap(fig: Figure, data: Dict[str, Any], options: Dict[str, Any]):
+    """Heatmap catégorie × gravité (data: index, columns, values)."""
+    frame = pd.DataFrame(data['values'], index=data['index'], columns=data['columns'])
+    max_value = max(int(frame.values.max()), 1)
+    # Échelle logarithmique si les données ont une grande amplitude
+    if max_value > 1000 or options.get('log_scale'):
+        norm = LogNorm(vmin=1, vmax=max_value)
+    else:
+        norm = Normalize(vmin=0, vmax=max_value)
+
+    ax = fig.add_subplot()
+    sns.heatmap(frame, annot=True, fmt="d", cmap="YlOrRd", norm=norm,
+                linewidths=.5, cbar_kws={"shrink": 0.8}, ax=ax)
+    ax.set_title("Répartition des anomalies par catégorie et niveau de gravité", fontsize=16)
+    ax.set_xlabel("severity", fontsize=14)
+    ax.set_ylabel("category", fontsize=14)
+    ax.tick_params(axis='x', labelsize=12)
+    ax.tick_params(axis='y', labelsize=12, labelrotation=0)
+
+
+def _render_score_histogram(fig: Figure, data: Dict[str, Any], options: Dict[str, Any]):
+    """Histogramme pré-calculé des scores (data: edges, counts, bin_width)."""
+    ax = fig.add_subplot()
+    ax.bar(data['edges'], data['counts'], width=data['bin_width'], align='edge', edgecolor='white')
+    ax.set_title('Distribution des scores d anomalies')
+    ax.set_xlabel('Score d anomalie')
+    ax.set_ylabel('Fréquence')
+    ax.grid(True, alpha=0.3)
+
+
+def _render_top_events(fig: Figure, data: Dict[str, Any], options: Dict[str, Any]):
+    """Barres des événements les plus fréquents (data: events, totals)."""
+    ax = fig.add_subplot()
+    sns.barplot(x=data['events'], y=data['totals'], ax=ax)
+    ax.set_title('Top 10 des événements les plus fréquents dans les anomalies')
+    ax.set_xlabel('Type d événement')
+    ax.set_ylabel('Fréquence totale')
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+
+
+RENDERERS: Dict[str, Callable[[Figure, Dict[str, Any], Dict[str, Any]], None]] = {
+    'heatmap': _render_heatmap,
+    'score_histogram': _render_score_histogram,
+    'top_events': _render_top_events,
+}
+
+
+def render_settings(project_root: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Paramètres de rendu de data_config.yaml (section reporting).
+
+    Args:
+        project_root: Chemin racine du projet (défaut: répertoire courant)
+
+    Returns:
+        Dictionnaire (dpi, render_workers, figure_cache en chemin absolu ou None)
+    """
+    root = Path(project_root) if project_root else Path.cwd()
+    settings = get_section("data_config", "reporting", root, DEFAULT_RENDER_SETTINGS)
+    if settings.get('figure_cache'):
+        cache_dir = Path(settings['figure_cache'])
+        settings['figure_cache'] = str(cache_dir if cache_dir.is_absolute() else root / cache_dir)
+    return settings
+
+
+def report_figure_jobs(summary, output_dir, suffix: str, dpi: int = 100) -> List[FigureJob]:
+    """
+    Figures d'un rapport construites à partir d'un résumé pré-agrégé.
+
+    Args:
+        summary: ReportSummary de la détection
+        output_dir: Dossier des figures
+        suffix: Suffixe des noms de fichiers (ex: horodatage)
+        dpi: Résolution
+
+    Returns:
+        Liste de figures (distribution des scores, événements principaux)
+    """
+    output_dir = Path(output_dir)
+    edges, counts = summary.histogram(anomalies_only=True)
+    jobs = [FigureJob('score_histogram',
+                      {'edges': edges.tolist(), 'counts': counts.tolist(), 'bin_width': summary.bin_width},
+                      str(output_dir / f"anomaly_scores_dist_{suffix}.png"), dpi)]
+
+    top_events = summary.top_events(10)
+    if len(top_events):
+        jobs.append(FigureJob('top_events',
+                              {'events': [str(e) for e in top_events.index], 'totals': top_events.tolist()},
+                              str(output_dir / f"top_anomaly_events_{suffix}.png"), dpi, (12, 6)))
+    return jobs
+
+
+def render_figure(job: FigureJob, cache_dir: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Produit une figure, ou la recopie depuis le cache si ses entrées n'ont pas changé.
+
+    Args:
+        job: Figure à produire
+        cache_dir: Dossier du cache de figures (None = pas de cache)
+
+    Returns:
+        Tuple contenant (fichier produit, True si la figure venait du cache)
+    """
+    output_path = Path(job.output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    cached_path = None
+    if cache_dir:
+        cached_path = Path(cache_dir) / f"{job.cache_key()}.png"
+        if cached_path.exists():
+            shutil.copyfile(cached_path, output_path)
+            return str(output_path), True
+
+    fig = Figure(figsize=job.figsize)
+    try:
+        FigureCanvasAgg(fig)
+        RENDERERS[job.kind](fig, job.data, job.options)
+        fig.tight_layout()
+        fig.savefig(output_path, dpi=job.dpi, bbox_inches='tight')
+    finally:
+        # Libère les artistes immédiatement (pas de registre pyplot à vider)
+        fig.clear()
+
+    if cached_path is not None:
+        cached_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cached_path.with_name(f"{cached_path.name}.{os.getpid()}.tmp")
+        shutil.copyfile(output_path, tmp_path)
+        os.replace(tmp_path, cached_path)
+    return str(output_path), False
+
+
+def render_figures(jobs: List[FigureJob], workers: Optional[int] = None,
+                   cache_dir: Optional[str] = None) -> List[Tuple[str, bool]]:
+    """
+    Produit plusieurs figures indépendantes, en parallèle si possible.
+
+    Args:
+        jobs: Figures à produire
+        workers: Nombre de processus (None = nombre de CPU, 1 = dans le processus courant)
+        cache_dir: Dossier du cache de figures
+
+    Returns:
+        Liste de (fichier produit, venait du cache), dans l'ordre des jobs
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+    if workers <= 1:
+        return [render_figure(job, cache_dir) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render_figure, job, cache_dir) for job in jobs]
+        return [future.result() for future in futures]
@@ -0,0 +1,78 @@
+"""
+Échantillonnage uniforme en flux, fusionnable entre blocs et processus.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+class BottomKSample:
+    """
+    Échantillon uniforme de taille bornée d'un flux de lignes.
+
+    Chaque ligne reçoit une clé aléatoire uniforme; l'échantillon conserve
+    les k lignes de plus petites clés. Le résultat est un tirage uniforme
+    sans remise, indépendant du découpage en blocs, et deux échantillons
+    (de graines différentes) se fusionnent en gardant les k plus petites clés.
+    """
+
+    def __init__(self, k: int, seed: Optional[int] = None):
+        """
+        Initialise un échantillon vide.
+
+        Args:
+            k: Taille maximale de l'échantillon
+            seed: Graine du générateur de clés
+        """
+        self.k = int(k)
+        self.rng = np.random.default_rng(seed)
+        self.keys = np.empty(0)
+        self.rows = None
+        self.n_seen = 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _keep_smallest(self, keys: np.ndarray, rows: np.ndarray):
+        """Conserve les k lignes de plus petites clés."""
+        if len(keys) > self.k:
+            keep = np.argpartition(keys, self.k - 1)[:self.k]
+            keys, rows = keys[keep], rows[keep]
+        self.keys, self.rows = keys, rows
+
+    def add(self, rows: np.ndarray):
+        """
+        Ajoute un bloc de lignes au flux.
+
+        Args:
+            rows: Tableau dont la première dimension correspond aux lignes
+        """
+        rows = np.asarray(rows)
+        self.n_seen += len(rows)
+        keys = self.rng.random(len(rows))
+        if self.rows is None:
+            self._keep_smallest(keys, rows)
+        else:
+            self._keep_smallest(np.concatenate([self.keys, keys]), np.concatenate([self.rows, rows]))
+
+    def merge(self, other: "BottomKSample"):
+        """
+        Fusionne un autre échantillon (par exemple celui d'un autre processus).
+
+        Args:
+            other: Échantillon à fusionner
+        """
+        self.n_seen += other.n_seen
+        if other.rows is None:
+            return
+        if self.rows is None:
+            self._keep_smallest(other.keys, other.rows)
+        else:
+            self._keep_smallest(np.concatenate([self.keys, other.keys]),
+                                np.concatenate([self.rows, other.rows]))
+
+    @property
+    def values(self) -> np.ndarray:
+        """Lignes de l'échantillon (ordre arbitraire)."""
+        return self.rows if self.rows is not None else np.empty((0,))
@@ -0,0 +1,67 @@
+"""
+Utilitaires vectorisés pour les matrices de compteurs d'événements.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def hash_rows(X: np.ndarray) -> np.ndarray:
+    """
+    Calcule un hash 64 bits par ligne d'une matrice.
+
+    Args:
+        X: Matrice 2D (lignes = séquences, colonnes = événements)
+
+    Returns:
+        Tableau uint64 contenant le hash de chaque ligne
+    """
+    return pd.util.hash_pandas_object(pd.DataFrame(X), index=False).to_numpy()
+
+
+def unique_rows(X: np.ndarray, row_hashes: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Regroupe les lignes identiques d'une matrice à l'aide de leur hash.
+
+    Les lignes uniques sont données dans l'ordre de leur première apparition.
+
+    Args:
+        X: Matrice 2D
+        row_hashes: Hash des lignes s'ils sont déjà calculés (voir hash_rows)
+
+    Returns:
+        Tuple contenant (indices_des_lignes_uniques, inverse, comptages) où
+        X[indices][inverse] reconstitue X dans l'ordre d'origine
+    """
+    if row_hashes is None:
+        row_hashes = hash_rows(X)
+    inverse, _ = pd.factorize(row_hashes)
+    _, first_indices, counts = np.unique(inverse, return_index=True, return_counts=True)
+    return first_indices, inverse, counts
+
+
+def weighted_percentile(values: np.ndarray, weights: np.ndarray, percentile: float) -> float:
+    """
+    Calcule un percentile pondéré (équivalent à répéter chaque valeur weights[i] fois).
+
+    Args:
+        values: Valeurs
+        weights: Poids (comptages) de chaque valeur
+        percentile: Percentile entre 0 et 100
+
+    Returns:
+        Valeur du percentile, interpolée linéairement comme np.percentile
+    """
+    order = np.argsort(values)
+    values = np.asarray(values)[order]
+    cumulative = np.cumsum(np.asarray(weights)[order])
+    total = cumulative[-1]
+
+    # Position (0-indexée) dans la série répétée, comme np.percentile
+    position = percentile / 100.0 * (total - 1)
+    lower = np.searchsorted(cumulative, np.floor(position), side='right')
+    upper = np.searchsorted(cumulative, np.ceil(position), side='right')
+    fraction = position - np.floor(position)
+    return float(values[lower] + (values[min(upper, len(values) - 1)] - values[lower]) * fraction)